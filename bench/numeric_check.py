@@ -0,0 +1,72 @@
+"""산술 모드 처리량 점검
+
+사용법:
+	python bench/numeric_check.py [--scale 0.1] [--repeat 3] [--threshold 0.25]
+
+같은 워크로드를 exact(기본)와 float(예전 방식) 모드로 실행해 초당 문장 수를 비교하고,
+exact가 threshold 비율 이상 느리면 보고한다 (종료 코드 1).
+큰 수 정확도는 tests/test_numeric.py에서 확인한다.
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "code"))
+
+from numeric import Numeric
+from interpreter import Interpreter
+from script_cache import ScriptCache
+from store import LoopLimits
+from workloads import WORKLOADS
+
+THROUGHPUT_WORKLOADS = ("while_counter", "arithmetic", "big_ints")
+
+
+def _elapsed(source, mode):
+	Numeric.set_mode(mode)
+	Numeric.set_precision(28)
+	interpreter = Interpreter.to_memory(LoopLimits(max_iterations=0), quiet=True)
+	start = time.perf_counter()
+	interpreter.execute(source)
+	return time.perf_counter() - start
+
+
+def check_throughput(scale, repeat, threshold):
+	slower = 0
+	for name in THROUGHPUT_WORKLOADS:
+		generate, size = WORKLOADS[name]
+		source, statements = generate(max(int(size * scale), 1))
+		# 예열/잡음이 한쪽에만 쏠리지 않도록 두 모드를 번갈아 실행
+		best = {"exact": None, "float": None}
+		for _ in range(repeat):
+			for mode in best:
+				elapsed = _elapsed(source, mode)
+				best[mode] = elapsed if best[mode] is None else min(best[mode], elapsed)
+		exact, old = statements / best["exact"], statements / best["float"]
+		ratio = exact / old
+		ok = ratio >= 1 - threshold
+		slower += not ok
+		sys.stderr.write(f"{'ok  ' if ok else 'SLOW'} {name}: exact {exact:.0f} stmt/s, "
+			f"float {old:.0f} stmt/s ({ratio:.2f}x)\n")
+	return slower
+
+
+def main():
+	arg_parser = argparse.ArgumentParser(description="Nature Shell numeric mode throughput check")
+	arg_parser.add_argument("--scale", type=float, default=0.2,
+		help="multiply the throughput workload sizes by this factor")
+	arg_parser.add_argument("--repeat", type=int, default=3,
+		help="timed runs per mode (best is reported)")
+	arg_parser.add_argument("--threshold", type=float, default=0.25,
+		help="relative slowdown of exact against float reported as a failure (default 0.25)")
+	args = arg_parser.parse_args()
+
+	ScriptCache.enabled = False
+	slower = check_throughput(args.scale, max(args.repeat, 1), args.threshold)
+	return 1 if slower else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,290 @@
+"""Nature Shell 인터프리터 벤치마크
+
+사용법:
+	python bench/run_bench.py [--scale 0.1] [--repeat 3] [--workload NAME ...]
+	                          [--numeric exact|decimal|float] [--parallel-backend process|thread]
+	                          [--output result.json] [--compare baseline.json]
+
+각 워크로드를 Run.run_file(파일 로드 + 파싱 + 실행)과 Command.execute(미리 파싱한
+AST 실행) 두 경로로 실행하고, 초당 문장 수와 단계별(parse / to_ast / condition /
+calc / output) 시간을 JSON으로 출력한다. 컴파일할 수 있는 워크로드는 --compile로
+만든 파이썬 모듈의 main()도 실행해 compiled 항목으로 기록한다. --compare로 이전 결과와 비교하면
+threshold 이상 느려진 항목을 보고하고 종료 코드 1을 반환한다.
+
+--numeric으로 산술 모드를 고른다 (모드별 처리량 비교는 numeric_check.py, 정확도는 tests/test_numeric.py).
+each_items는 -each -parallel 0 (CPU 수만큼의 작업자)이므로 코어가 많을수록 빨라지고,
+--parallel-backend로 작업자 종류를 고른다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "code"))
+
+import shell
+import predicate
+from shell import Command, PreProcessing, Run
+from logic import Parser, FastParser
+from optimizer import Optimizer
+from numeric import Numeric
+from each import Each
+from loader import iter_statements
+from output import OutputSink
+from store import VariableStore, LoopLimits
+from script_cache import ScriptCache
+from expression import compile_expression
+from compiler import Compiler, CompileError
+from workloads import WORKLOADS
+
+STAGES = ("parse", "to_ast", "condition", "calc", "output")
+
+
+class StageTimer:
+	"""단계별 자기 시간(하위 단계 시간 제외) 측정"""
+
+	def __init__(self):
+		self.totals = defaultdict(float)
+		self._stack = []
+		self._patches = []
+
+	def _wrap(self, stage, func):
+		stack = self._stack
+		totals = self.totals
+		perf_counter = time.perf_counter
+
+		def timed(*args, **kwargs):
+			start = perf_counter()
+			stack.append(0.0)
+			try:
+				return func(*args, **kwargs)
+			finally:
+				child = stack.pop()
+				elapsed = perf_counter() - start
+				totals[stage] += elapsed - child
+				if stack:
+					stack[-1] += elapsed
+		return timed
+
+	def patch(self, owner, name, stage):
+		original = owner.__dict__[name]
+		if isinstance(original, staticmethod):
+			replacement = staticmethod(self._wrap(stage, original.__func__))
+		else:
+			replacement = self._wrap(stage, original)
+		self._patches.append((owner, name, original))
+		setattr(owner, name, replacement)
+
+	def __enter__(self):
+		self.patch(Parser, "parse", "parse")
+		self.patch(Parser, "parse_command", "parse")
+		self.patch(FastParser, "parse", "parse")
+		self.patch(Parser, "to_ast", "to_ast")
+		self.patch(Parser, "_command_ast", "to_ast")
+		self.patch(Parser, "_if_ast", "to_ast")
+		self.patch(Parser, "_while_ast", "to_ast")
+		for cls in (predicate.Constant, predicate.CompareVarConst,
+				predicate.CompareVarVar, predicate.And, predicate.Or):
+			self.patch(cls, "__call__", "condition")
+		self.patch(PreProcessing, "_calc", "calc")
+		for name in ("write", "message", "flush"):
+			self.patch(OutputSink, name, "output")
+		return self
+
+	def __exit__(self, *exc):
+		for owner, name, original in reversed(self._patches):
+			setattr(owner, name, original)
+		self._patches.clear()
+
+
+def _fresh_session(sink):
+	# 캐시를 비워 매번 처음 실행하는 것과 같은 조건으로 측정
+	Parser.cache.clear()
+	compile_expression.cache_clear()
+	shell.variable = VariableStore(out=sink, limits=LoopLimits(max_iterations=0))
+	return shell.variable
+
+
+def _run_file(path, sink, timer=None):
+	_fresh_session(sink)
+	start = time.perf_counter()
+	Run.run_file(path)
+	return time.perf_counter() - start
+
+
+def _run_execute(path, sink, timer=None):
+	variables = _fresh_session(sink)
+	with open(path, encoding="utf-8") as f:
+		asts = [Parser.parse(statement) for _, statement in iter_statements(f)]
+	# 미리 파싱한 시간은 단계별 측정에서 제외
+	if timer is not None:
+		timer.totals.clear()
+	start = time.perf_counter()
+	for ast in asts:
+		if Command.execute(ast, variables) == "exit":
+			break
+	variables.out.flush()
+	return time.perf_counter() - start
+
+
+def _measure(runner, path, statements, repeat):
+	sink = OutputSink(open(os.devnull, "w"))
+	try:
+		best = min(runner(path, sink) for _ in range(repeat))
+		with StageTimer() as timer:
+			instrumented = runner(path, sink, timer)
+	finally:
+		sink.close()
+
+	stages = {stage: round(timer.totals.get(stage, 0.0), 6) for stage in STAGES}
+	stages["other"] = round(max(instrumented - sum(stages.values()), 0.0), 6)
+	return {
+		"seconds": round(best, 6),
+		"statements": statements,
+		"statements_per_second": round(statements / best) if best else None,
+		"instrumented_seconds": round(instrumented, 6),
+		"stages": stages,
+	}
+
+
+def _measure_compiled(path, statements, repeat):
+	"""AOT 컴파일한 모듈의 실행 시간 (컴파일/import 시간 제외), 컴파일할 수 없으면 None"""
+	with open(path, encoding="utf-8") as f:
+		parsed = [(line_no, Parser.parse(statement)) for line_no, statement in iter_statements(f)]
+	try:
+		source = Compiler(path).compile(parsed)
+	except CompileError:
+		return None
+	namespace = {"__name__": "compiled_workload"}
+	exec(compile(source, path + ".py", "exec"), namespace)
+	best = None
+	with open(os.devnull, "w") as devnull:
+		for _ in range(repeat):
+			start = time.perf_counter()
+			namespace["main"](out=devnull, max_iterations=0)
+			elapsed = time.perf_counter() - start
+			best = elapsed if best is None else min(best, elapsed)
+	return {
+		"seconds": round(best, 6),
+		"statements": statements,
+		"statements_per_second": round(statements / best) if best else None,
+	}
+
+
+def _git_commit():
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+			capture_output=True, text=True, check=True
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def run(names, scale, repeat):
+	results = {}
+	with tempfile.TemporaryDirectory() as tmp:
+		for name in names:
+			generate, size = WORKLOADS[name]
+			n = max(int(size * scale), 1)
+			source, statements = generate(n)
+			path = os.path.join(tmp, f"{name}.nsc")
+			with open(path, "w", encoding="utf-8") as f:
+				f.write(source)
+
+			results[name] = {
+				"size": n,
+				"run_file": _measure(_run_file, path, statements, repeat),
+				"execute": _measure(_run_execute, path, statements, repeat),
+				"compiled": _measure_compiled(path, statements, repeat),
+			}
+			compiled = results[name]["compiled"]
+			sys.stderr.write(
+				f"{name}: {results[name]['run_file']['statements_per_second']} stmt/s (run_file), "
+				f"{results[name]['execute']['statements_per_second']} stmt/s (execute), "
+				f"{compiled['statements_per_second'] if compiled else '-'} stmt/s (compiled)\n"
+			)
+	return {
+		"commit": _git_commit(),
+		"python": platform.python_version(),
+		"parser": Parser.engine,
+		"optimize": Optimizer.level,
+		"numeric": Numeric.mode,
+		"parallel_backend": Each.backend,
+		"cpus": os.cpu_count(),
+		"scale": scale,
+		"repeat": repeat,
+		"workloads": results,
+	}
+
+
+def compare(result, baseline, threshold):
+	"""baseline보다 threshold 비율 이상 느려진 (워크로드, 경로) 목록"""
+	regressions = []
+	for name, current in result["workloads"].items():
+		previous = baseline.get("workloads", {}).get(name)
+		if not previous or previous.get("size") != current["size"]:
+			continue
+		for mode in ("run_file", "execute", "compiled"):
+			if not previous.get(mode) or not current.get(mode):
+				continue
+			old = previous[mode]["seconds"]
+			new = current[mode]["seconds"]
+			if old and new > old * (1 + threshold):
+				regressions.append(f"{name}/{mode}: {old:.4f}s -> {new:.4f}s (+{(new / old - 1) * 100:.1f}%)")
+	return regressions
+
+
+def main():
+	arg_parser = argparse.ArgumentParser(description="Nature Shell benchmarks")
+	arg_parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS),
+		help="workload to run (repeatable, default: all)")
+	arg_parser.add_argument("--scale", type=float, default=1.0,
+		help="multiply every workload size by this factor")
+	arg_parser.add_argument("--repeat", type=int, default=3,
+		help="timed runs per workload (best is reported)")
+	arg_parser.add_argument("--parser", choices=Parser.ENGINES, default=Parser.engine)
+	arg_parser.add_argument("-O", type=int, choices=Optimizer.LEVELS, default=Optimizer.level,
+		dest="optimize", help="AST optimization level")
+	arg_parser.add_argument("--numeric", choices=Numeric.MODES, default=Numeric.mode,
+		help="arithmetic mode (compare with a --numeric float run for the old float path)")
+	arg_parser.add_argument("--parallel-backend", choices=Each.BACKENDS, default=Each.backend,
+		help="workers of -each -parallel loops (each_items workload)")
+	arg_parser.add_argument("--output", metavar="FILE", help="write JSON here instead of stdout")
+	arg_parser.add_argument("--compare", metavar="BASELINE", help="previous JSON result to compare with")
+	arg_parser.add_argument("--threshold", type=float, default=0.10,
+		help="relative slowdown reported as a regression (default 0.10)")
+	args = arg_parser.parse_args()
+
+	Parser.set_engine(args.parser)
+	Optimizer.set_level(args.optimize)
+	Numeric.set_mode(args.numeric)
+	Each.set_backend(args.parallel_backend)
+	# 디스크 캐시가 파싱 단계를 건너뛰지 않도록 항상 처음부터 파싱
+	ScriptCache.enabled = False
+	result = run(args.workload or list(WORKLOADS), args.scale, max(args.repeat, 1))
+
+	text = json.dumps(result, indent=2)
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as f:
+			f.write(text + "\n")
+	else:
+		sys.stdout.write(text + "\n")
+
+	if args.compare:
+		with open(args.compare, encoding="utf-8") as f:
+			regressions = compare(result, json.load(f), args.threshold)
+		for line in regressions:
+			sys.stderr.write(f"REGRESSION {line}\n")
+		return 1 if regressions else 0
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,165 @@
+"""벤치마크용 .nsc 워크로드 생성기
+
+각 함수는 (스크립트 소스, 실행될 문장 수)를 반환한다.
+문장 수는 최상위 문장 + 반복/분기 안에서 실행되는 문장을 모두 센다.
+"""
+
+
+def while_counter(n):
+	"""조건 평가와 단순 증가만 있는 -while 카운터"""
+	source = (
+		"var:int crt i -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+	)
+	return source, 2 + n
+
+
+def arithmetic(n):
+	"""연산자 우선순위/괄호가 섞인 var chg 식"""
+	source = (
+		"var:int crt i -in 0\n"
+		"var:float crt x -in 1.5\n"
+		"var:int crt acc -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg x -in ($x * 3 + $i) % 97 - -2 ** 2\n"
+		"\tvar chg acc -in ($acc + $i * $i - 7) % 100003\n"
+		"\tvar chg x -in $x / 4 + ($acc - $i) * 0.5\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+	)
+	return source, 4 + n * 4
+
+
+def branches(n):
+	"""-if/-else 중첩 분기"""
+	source = (
+		"var:int crt i -in 0\n"
+		"var:int crt m -in 0\n"
+		"var:int crt hits -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg m -in $i % 3\n"
+		"\t$m == 0 -if {\n"
+		"\t\tvar chg hits -in $hits + 1\n"
+		"\t}\n"
+		"\t-else {\n"
+		"\t\t$m == 1 -and $hits > 0 -if { var chg hits -in $hits - 1 } -else { var chg hits -in $hits + 2 }\n"
+		"\t}\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+	)
+	statements = 4
+	for i in range(n):
+		# var chg m, 바깥 if, var chg i
+		statements += 3
+		# 안쪽 if 문장 자체 + 그 안의 var chg 하나 (m == 0이면 var chg 하나)
+		statements += 1 if i % 3 == 0 else 2
+	return source, statements
+
+
+def echo_heavy(n):
+	"""출력 위주"""
+	source = (
+		"var:int crt i -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\ttmp echo \"line\" $i\n"
+		"\ttmp echo $i $i $i\n"
+		"\ttmp echo \"done with\" $i\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+	)
+	return source, 2 + n * 4
+
+
+def flat_long(n):
+	"""반복문 없는 긴 스크립트 (로더/파서 비중이 큼)"""
+	lines = ["var:int crt x -in 0"]
+	for k in range(n):
+		if k % 4 == 3:
+			lines.append(f"$x > {k} -if {{ tmp echo big $x }} -else {{ tmp echo small {k} }}")
+		elif k % 2:
+			lines.append(f"tmp echo step {k} $x")
+		else:
+			lines.append(f"var chg x -in $x + {k % 97}")
+	# -if 문은 안쪽 echo 하나를 더 실행
+	statements = 1 + n + n // 4
+	return "\n".join(lines) + "\n", statements
+
+
+def list_bulk(n):
+	"""n개 원소 리스트의 벌크 연산 (문장 수는 적고 원소 처리량이 중요)"""
+	source = (
+		f"list rng xs -in 0 {n}\n"
+		"list map ys -in $xs * 3 - 1\n"
+		"list map zs -in $ys / 2 + $xs\n"
+		"list sum s -in $ys\n"
+		"list mean m -in $zs\n"
+		"list min lo -in $zs\n"
+		"list max hi -in $zs\n"
+		"tmp echo $s $m $lo $hi\n"
+	)
+	return source, 8
+
+
+def big_ints(n):
+	"""2**53을 넘는 정수 누적 (피보나치 수를 소수로 나눈 나머지, exact 모드에서 정확)"""
+	source = (
+		"var crt a -in 9007199254740993\n"
+		"var crt b -in 9007199254740997\n"
+		"var:int crt i -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg b -in ($a + $b) % 170141183460469231731687303715884105727\n"
+		"\tvar chg a -in $b * 3 / 3 - $a\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+		"tmp echo $a $b\n"
+	)
+	return source, 5 + n * 3
+
+
+def decimal_money(n):
+	"""decimal 변수의 금액 계산 (나누어떨어지지 않는 나눗셈 포함)"""
+	source = (
+		"var:decimal crt total -in 0\n"
+		"var:decimal crt price -in 19.99\n"
+		"var:int crt i -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg total -in $total + $price * 3 / 7\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+		"tmp echo $total\n"
+	)
+	return source, 5 + n * 2
+
+
+def each_items(n):
+	"""서로 독립인 항목 처리를 -each -parallel로 (CPU 수만큼의 작업자, -sum으로 합침)"""
+	source = (
+		"var crt total -in 0\n"
+		f"i -each {n} -parallel 0 -sum total {{\n"
+		"\tvar:int crt k -in 0\n"
+		"\tvar crt acc -in 0\n"
+		"\tvar chg acc -in $i\n"
+		"\t$k < 50 -while {\n"
+		"\t\tvar chg acc -in ($acc * 31 + $k) % 1000003\n"
+		"\t\tvar chg k -in $k + 1\n"
+		"\t}\n"
+		"\tvar chg total -in $acc\n"
+		"}\n"
+		"tmp echo $total\n"
+	)
+	return source, 3 + n * 105
+
+
+WORKLOADS = {
+	"while_counter": (while_counter, 200000),
+	"arithmetic": (arithmetic, 50000),
+	"branches": (branches, 50000),
+	"echo_heavy": (echo_heavy, 50000),
+	"flat_long": (flat_long, 100000),
+	"list_bulk": (list_bulk, 1000000),
+	"big_ints": (big_ints, 50000),
+	"decimal_money": (decimal_money, 50000),
+	"each_items": (each_items, 2000),
+}
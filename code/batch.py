@@ -0,0 +1,153 @@
+import os
+import sys
+import glob
+from concurrent.futures import ProcessPoolExecutor
+import shell
+from logic import Parser
+from optimizer import Optimizer
+from numeric import Numeric
+from each import Each
+from interpreter import Interpreter
+from diagnostics import Diagnostics
+from script_cache import ScriptCache
+from store import LoopLimits
+
+
+class BatchOptions:
+	"""작업 프로세스에 넘겨줄 설정 (피클 가능해야 함)"""
+
+	def __init__(self, engine="fast", quiet=False, limits=None, cache=True, cache_dir=None, optimize=1,
+			max_errors=100, fail_fast=False, diagnostics="text", numeric="exact", decimal_precision=28,
+			parallel_backend="process"):
+		self.engine = engine
+		self.optimize = optimize
+		self.quiet = quiet
+		self.limits = limits if limits is not None else LoopLimits()
+		self.cache = cache
+		self.cache_dir = cache_dir
+		self.max_errors = max_errors
+		self.fail_fast = fail_fast
+		self.diagnostics = diagnostics
+		self.numeric = numeric
+		self.decimal_precision = decimal_precision
+		self.parallel_backend = parallel_backend
+
+
+class ScriptResult:
+	"""스크립트 하나의 실행 결과"""
+
+	__slots__ = ("path", "status", "stdout", "stderr", "errors")
+
+	def __init__(self, path, status, stdout, stderr, errors=0):
+		self.path = path
+		self.status = status
+		self.stdout = stdout
+		self.stderr = stderr
+		self.errors = errors
+
+	@property
+	def ok(self):
+		# 경고나 JSON 진단 출력만 있는 스크립트는 성공으로 봄
+		return self.status == 0 and not self.errors
+
+
+def expand_paths(patterns):
+	"""경로/글롭 패턴 목록을 스크립트 경로 목록으로 (패턴 순서 유지, 패턴 안에서는 정렬)"""
+	paths = []
+	for pattern in patterns:
+		if glob.has_magic(pattern):
+			paths.extend(sorted(glob.glob(pattern, recursive=True)))
+		else:
+			paths.append(pattern)
+	return paths
+
+
+def _configure(options):
+	# 작업 프로세스 시작 시 한 번 (파서 엔진과 캐시 설정은 프로세스 전역)
+	Parser.set_engine(options.engine)
+	Optimizer.set_level(options.optimize)
+	Numeric.set_mode(options.numeric)
+	Numeric.set_precision(options.decimal_precision)
+	Each.set_backend(options.parallel_backend)
+	ScriptCache.enabled = options.cache
+	ScriptCache.directory = options.cache_dir
+
+
+_options = BatchOptions()
+
+
+def _initialize(options):
+	global _options
+	_options = options
+	_configure(options)
+
+
+def run_script(path):
+	"""새 Interpreter에서 스크립트를 실행하고 stdout/stderr를 모아 반환"""
+	diagnostics = Diagnostics(_options.max_errors, _options.fail_fast,
+		_options.diagnostics == "json", path)
+	interpreter = Interpreter.to_memory(_options.limits.copy(), _options.quiet, diagnostics)
+	status = interpreter.run_file(path)
+	interpreter.summarize()
+	return ScriptResult(path, status, interpreter.output(), interpreter.errors(), diagnostics.errors)
+
+
+def run_batch(paths, options, jobs=1):
+	"""스크립트들을 실행해 입력 순서대로 ScriptResult 생성
+
+	jobs > 1이면 프로세스 풀을 한 번만 띄워 여러 스크립트를 나눠 실행한다.
+	"""
+	if jobs <= 1 or len(paths) <= 1:
+		_initialize(options)
+		for path in paths:
+			yield run_script(path)
+		return
+
+	# 작은 스크립트가 많을 때 프로세스 간 왕복을 줄이도록 묶어서 전달
+	chunksize = max(1, min(64, len(paths) // (jobs * 4)))
+	with ProcessPoolExecutor(jobs, initializer=_initialize, initargs=(options,)) as pool:
+		yield from pool.map(run_script, paths, chunksize=chunksize)
+
+
+def write_result(result, out, tag=False):
+	"""결과 출력: 기본은 스크립트별 머리말 + 출력, tag면 줄마다 경로를 앞에 붙임"""
+	if tag:
+		for line in result.stdout.splitlines():
+			out.write(f"{result.path}: {line}\n")
+		for line in result.stderr.splitlines():
+			sys.stderr.write(f"{result.path}: {line}\n")
+		return
+	out.write(f"==> {result.path} <==\n")
+	out.write(result.stdout)
+	if result.stdout and not result.stdout.endswith("\n"):
+		out.write("\n")
+	if result.stderr:
+		out.flush()
+		sys.stderr.write(result.stderr)
+
+
+def summarize(results):
+	"""종료 상태 요약 문자열"""
+	failed = [result for result in results if not result.ok]
+	lines = [f"{len(results)} script(s): {len(results) - len(failed)} ok, {len(failed)} failed"]
+	for result in failed:
+		reason = f"exit status {result.status}" if result.status else f"{result.errors} error(s) reported"
+		lines.append(f"  FAILED {result.path} ({reason})")
+	return "\n".join(lines) + "\n"
+
+
+def main(patterns, options, jobs=1, tag=False, out=None):
+	out = out or shell.variable.out
+	paths = expand_paths(patterns)
+	if not paths:
+		sys.stderr.write("Error: No scripts matched\n")
+		return 1
+	jobs = jobs or os.cpu_count() or 1
+
+	results = []
+	for result in run_batch(paths, options, jobs):
+		write_result(result, out, tag)
+		results.append(result)
+	out.flush()
+	sys.stderr.write(summarize(results))
+	return 0 if all(result.ok for result in results) else 1
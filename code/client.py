@@ -0,0 +1,69 @@
+"""Nature Shell 서버 클라이언트 (main.py --serve로 띄운 서버에 스크립트 실행 요청)
+
+사용법:
+	python client.py [--socket PATH] [script.nsc | -]
+
+스크립트를 주지 않거나 '-'이면 표준 입력을 스크립트로 보낸다.
+인터프리터 모듈을 import하지 않으므로 시작이 빠르다.
+"""
+import os
+import sys
+import json
+import socket
+import argparse
+
+
+def default_socket():
+	return os.environ.get("NSH_SOCKET") or f"/tmp/nature-shell-{os.getuid()}.sock"
+
+
+def request(socket_path, payload, stdout=None, stderr=None):
+	"""요청 하나를 보내고 받은 출력을 그대로 쓴 뒤 종료 상태 반환
+
+	응답은 줄 단위 JSON: {"stdout": ...} / {"stderr": ...} 반복 후 {"status": N}
+	"""
+	stdout = stdout or sys.stdout
+	stderr = stderr or sys.stderr
+	with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+		conn.connect(socket_path)
+		conn.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+		with conn.makefile("r", encoding="utf-8") as responses:
+			for line in responses:
+				message = json.loads(line)
+				if "stdout" in message:
+					stdout.write(message["stdout"])
+				elif "stderr" in message:
+					stdout.flush()
+					stderr.write(message["stderr"])
+				elif "status" in message:
+					return message["status"]
+	stderr.write("Error: Connection closed before the script finished\n")
+	return 1
+
+
+def main():
+	arg_parser = argparse.ArgumentParser(description="Nature Shell client")
+	arg_parser.add_argument("script", nargs="?", default="-",
+		help="script file to run on the server ('-' = read from stdin)")
+	arg_parser.add_argument("--socket", default=default_socket(),
+		help="server socket path (default: $NSH_SOCKET or /tmp/nature-shell-<uid>.sock)")
+	arg_parser.add_argument("-q", "--quiet", action="store_true",
+		help="suppress 'Variable ... created/changed' messages")
+	args = arg_parser.parse_args()
+
+	if args.script == "-":
+		payload = {"source": sys.stdin.read()}
+	else:
+		# 서버의 작업 디렉터리가 다를 수 있으므로 절대 경로로 보냄
+		payload = {"path": os.path.abspath(args.script)}
+	payload["quiet"] = args.quiet
+
+	try:
+		return request(args.socket, payload)
+	except (FileNotFoundError, ConnectionRefusedError):
+		sys.stderr.write(f"Error: No server listening on '{args.socket}' (start one with main.py --serve)\n")
+		return 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,897 @@
+import os
+import math
+from logic import Parser
+from loader import iter_statements
+from constants import VERSION, ErrorCode
+from registry import REGISTRY
+from output import STDERR
+from store import ConversionError, convert, parse_literal, format_value
+from expression import Num, VarRef, Neg, ExpressionError
+from predicate import Constant, CompareVarConst, CompareVarVar, And, Or
+from shell import Command, PreProcessing, Var, Tmp, Sys
+from numeric import Numeric
+
+
+class CompileError(Exception):
+	pass
+
+
+# 생성된 모듈 앞부분에 그대로 들어가는 실행 지원 코드 (인터프리터 모듈을 import하지 않음)
+_IMPORTS = '''\
+import sys
+import time
+import operator
+'''
+
+_RUNTIME = '''\
+MAX_MESSAGES = 100
+_UNSET = object()
+_UNLIMITED = sys.maxsize
+_clock = time.perf_counter
+_COMPARISONS = {
+    "<": operator.lt, ">": operator.gt, "<=": operator.le,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+
+
+class _Error(Exception):
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class _Stop(Exception):
+    pass
+
+
+def _fmt(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
+
+
+def _num(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise _Error("Non-numeric value in expression.")
+
+
+def _div(left, right):
+    # 나누어떨어지는 정수 나눗셈은 int (인터프리터의 exact 모드)
+    if left.__class__ is int and right.__class__ is int and right and not left % right:
+        return left // right
+    return left / right
+
+
+def _idiv(left, right):
+    # int 변수에 대입하는 식의 나눗셈: 0 쪽으로 버림
+    if left.__class__ is int and right.__class__ is int:
+        if not right:
+            raise ZeroDivisionError("division by zero")
+        quotient = abs(left) // abs(right)
+        return -quotient if (left < 0) != (right < 0) else quotient
+    return _div(left, right)
+
+
+def _ipow(left, right):
+    if left.__class__ is int and right.__class__ is int and right < 0:
+        if not left:
+            raise ZeroDivisionError("division by zero")
+        if abs(left) != 1:
+            return 0
+        return left if right % 2 else 1
+    return left ** right
+
+
+def _undefined(name):
+    raise _Error(f"Variable '{name}' not found", "E001")
+
+
+def _zero(error):
+    return "Modulo by zero." if "modulo" in str(error) else "Division by zero."
+
+
+def _to_int(value):
+    if isinstance(value, (bool, int, float)):
+        return int(value)
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _to_bool(value):
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    word = value.strip().lower()
+    if word in ("true", "yes", "on", "1"):
+        return True
+    if word in ("false", "no", "off", "0"):
+        return False
+    raise ValueError(value)
+
+
+_CONVERTERS = {"int": _to_int, "float": float, "bool": _to_bool, "str": _fmt}
+
+
+def _convert(value, var_type):
+    converter = _CONVERTERS.get(var_type)
+    if converter is None:
+        return value
+    try:
+        return converter(value)
+    except (TypeError, ValueError, OverflowError):
+        raise _Error(f"Cannot convert '{_fmt(value)}' to {var_type}")
+
+
+def _compare(op, left, right):
+    func = _COMPARISONS[op]
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return func(left, right)
+    return func(_fmt(left), _fmt(right))
+
+
+def _unquote(text):
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1]
+    return text
+
+
+class _Session:
+    """출력 버퍼와 진단 (인터프리터의 파일 모드와 같은 형식)"""
+
+    def __init__(self, out, err, max_messages, fail_fast):
+        self.out = out
+        self.err = err
+        self.chunks = []
+        self.max_messages = max_messages
+        self.fail_fast = fail_fast
+        self.entries = {}
+        self.suppressed = 0
+        self.counts = {"error": 0, "warning": 0}
+        self.reported = set()
+
+    def flush(self):
+        if self.chunks:
+            self.out.write("".join(self.chunks))
+            self.chunks.clear()
+        self.out.flush()
+
+    def report(self, line, message, code=None, severity="error", label=None, detail=None):
+        if label is None:
+            label = "Warning" if severity == "warning" else "Error"
+        key = (severity, code, line, message)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.counts[severity] += 1
+            entry[3] += 1
+        else:
+            self.counts[severity] += 1
+            if self.max_messages and len(self.entries) >= self.max_messages:
+                self.suppressed += 1
+            else:
+                if detail:
+                    message = f"{message}; {detail}"
+                self.entries[key] = [line, label, code, 1, message]
+                self.flush()
+                self.err.write(f"{SOURCE}:{line}: {_label(label, code)}: {message}\\n")
+        if self.fail_fast and severity == "error":
+            raise _Stop()
+
+    def missing(self, line, name):
+        self.report(line, f"Variable '{name}' not found", "E001")
+        return False
+
+    def unresolved(self, line, name):
+        # 최상위 문장 실행 전에 아직 없는 변수를 읽는 곳 경고 (이름마다 한 번)
+        if name not in self.reported:
+            self.reported.add(name)
+            self.report(line, f"Variable '{name}' may be read before it is created", "W002", "warning")
+
+    def loop_stop(self, line, reason, limit, iterations, start):
+        elapsed = _clock() - start
+        self.report(line, f"Loop exceeded {reason} ({limit})", "W001", "warning",
+            detail=f"stopped after {iterations} iterations in {elapsed:.3f}s")
+
+    def finish(self, status):
+        self.flush()
+        lines = [f"  {SOURCE}:{line}: {_label(label, code)}: {message} (repeated {count} times)"
+            for line, label, code, count, message in self.entries.values() if count > 1]
+        if self.suppressed:
+            lines.append(f"  {self.suppressed} more diagnostic(s) not shown (limit {self.max_messages})")
+        if lines:
+            header = f"{self.counts['error']} error(s), {self.counts['warning']} warning(s):"
+            self.err.write("\\n".join([header] + lines) + "\\n")
+        return status
+
+
+def _label(label, code):
+    return f"{label} [{code}]" if code else label
+'''
+
+_MAIN_ENTRY = '''
+
+if __name__ == "__main__":
+    import argparse
+    arg_parser = argparse.ArgumentParser(description=f"Compiled Nature Shell script ({SOURCE})")
+    arg_parser.add_argument("-q", "--quiet", action="store_true",
+        help="suppress 'Variable ... created/changed' messages")
+    arg_parser.add_argument("--max-iterations", type=int, default=1000, metavar="N",
+        help="stop a -while loop after N iterations (0 = unlimited, default 1000)")
+    arg_parser.add_argument("--time-limit", type=float, default=0.0, metavar="SECONDS",
+        help="stop a -while loop after SECONDS of wall-clock time (0 = unlimited)")
+    arg_parser.add_argument("--max-errors", type=int, default=MAX_MESSAGES, metavar="N",
+        help="print at most N distinct diagnostics, then only count them (0 = unlimited)")
+    arg_parser.add_argument("--fail-fast", action="store_true", help="stop at the first error")
+    args = arg_parser.parse_args()
+    sys.exit(main(quiet=args.quiet, max_iterations=max(args.max_iterations, 0),
+        time_limit=max(args.time_limit, 0.0), max_errors=max(args.max_errors, 0),
+        fail_fast=args.fail_fast))
+'''
+
+# 실행 중에 예외가 날 수 있는 문장의 에러 보고 (인터프리터의 PreProcessing._calc와 같은 메시지)
+_HANDLERS = (
+	("_Error as e", "_report({line}, e.message, e.code)"),
+	("ZeroDivisionError as e", "_report({line}, _zero(e))"),
+	("OverflowError", "_report({line}, \"Numeric overflow in expression.\")"),
+)
+
+# 식 변형별로 네이티브 연산자와 결과가 다른 연산 (expression.py의 _VARIANT_OPS와 같은 동작)
+_HELPERS = {
+	("exact", "/"): "_div",
+	("int", "/"): "_idiv",
+	("int", "**"): "_ipow",
+}
+
+# 버퍼에 쌓인 출력 조각이 이만큼 넘으면 반복문 끝에서 내보냄
+_FLUSH_CHUNKS = 4096
+
+_NUMERIC = frozenset(("int", "float", "bool"))
+
+
+def _type_name(value):
+	if isinstance(value, bool):
+		return "bool"
+	if isinstance(value, int):
+		return "int"
+	if isinstance(value, float):
+		return "float"
+	if isinstance(value, str):
+		return "str"
+	raise CompileError(f"Values of type {type(value).__name__} are not supported")
+
+
+def _literal(value):
+	"""값을 파이썬 리터럴 소스로"""
+	if isinstance(value, float) and not math.isfinite(value):
+		return f"float({str(value)!r})"
+	return repr(value)
+
+
+class Compiler:
+	"""Nature Shell 스크립트를 같은 동작의 파이썬 모듈 소스로 변환 (AOT)
+
+	- 변수는 main() 안의 지역 변수 (v_이름), 값의 타입은 스크립트 전체에서 추론해
+	  숫자만 들어가는 변수는 변환/검사 없이 네이티브 연산과 비교를 그대로 쓴다
+	- 아직 만들어지지 않았을 수 있는 변수만 읽을 때 _UNSET 검사를 한다
+	- -while은 반복 한도/시간 한도를 포함한 while, -if는 if, tmp echo는 버퍼에 쓰기
+	- 에러/경고 메시지, 줄 번호, 중복 요약은 인터프리터의 파일 모드와 같다
+
+	식은 인터프리터의 exact 모드와 같은 연산 (int 변수 대입은 정수 연산, float 변수 대입은
+	float 연산), 리스트 값, decimal 변수, --numeric decimal/float와 sys profile은 지원하지
+	않는다 (CompileError).
+	"""
+
+	def __init__(self, source_name):
+		self.source_name = source_name
+		self.lines = []
+		self.depth = 0
+		self.loops = 0
+		self.temps = 0
+		# 스크립트 변수 → 파이썬 지역 변수 이름
+		self.locals = {}
+		# 변수 → var crt에 쓰인 선언 타입들 (None: 타입 없음)
+		self.declared = {}
+		# 변수 → 담길 수 있는 값의 타입 이름들
+		self.types = {}
+		self.assignments = []
+
+	@staticmethod
+	def compile_file(filename, output=None):
+		"""스크립트를 파이썬 모듈로 컴파일해 output(기본: 확장자를 .py로)에 저장, 종료 상태 반환"""
+		if output is None:
+			output = os.path.splitext(filename)[0] + ".py"
+		try:
+			with open(filename, 'r', encoding='utf-8') as f:
+				statements = [(line_no, Parser.parse(statement)) for line_no, statement in iter_statements(f)]
+		except FileNotFoundError:
+			STDERR.report(f"File '{filename}' not found")
+			return 1
+		failed = sum(1 for _, ast in statements if ast is None)
+		if failed:
+			STDERR.report(f"{failed} statement(s) could not be parsed; nothing was compiled")
+			return 1
+		try:
+			source = Compiler(filename).compile(statements)
+		except CompileError as e:
+			STDERR.report(f"Cannot compile '{filename}': {e}")
+			return 1
+		with open(output, 'w', encoding='utf-8') as f:
+			f.write(source)
+		return 0
+
+	def compile(self, statements):
+		"""(시작 줄 번호, AST) 목록을 모듈 소스 문자열로"""
+		if Numeric.mode != "exact":
+			raise CompileError(f"--numeric {Numeric.mode} is not supported by the compiler")
+		for _, ast in statements:
+			self._collect(ast)
+		self._infer_types()
+
+		self.depth = 1
+		self._emit("session = _Session(out or sys.stdout, err or sys.stderr, max_errors, fail_fast)")
+		self._emit("_out = session.chunks")
+		self._emit("_w = _out.append")
+		self._emit("_report = session.report")
+		self._emit("_missing = session.missing")
+		self._emit("_verbose = not quiet")
+		self._emit("_max_iterations = max_iterations or _UNLIMITED")
+		self._emit("_time_limit = time_limit")
+		for name in self.locals:
+			self._emit(f"{self._local(name)} = _UNSET")
+			if self._dynamic(name):
+				self._emit(f"{self._type_local(name)} = None")
+		self._emit("try:")
+		self.depth += 1
+		start = len(self.lines)
+		assigned = frozenset()
+		for line_no, ast in statements:
+			self._unresolved(ast, line_no, assigned)
+			assigned = self._statement(ast, line_no, assigned)
+		if len(self.lines) == start:
+			self._emit("pass")
+		self.depth -= 1
+		self._emit("except _Stop:")
+		self._emit("    return session.finish(1)")
+		self._emit("return session.finish(0)")
+
+		header = (
+			f"# Generated by Nature Shell {VERSION} from {self.source_name} (main.py --compile).\n"
+			"# Do not edit: recompile the script instead.\n"
+		)
+		signature = ("\n\ndef main(out=None, err=None, quiet=False, max_iterations=1000, time_limit=0.0,\n"
+			"        max_errors=MAX_MESSAGES, fail_fast=False):\n")
+		return (header + _IMPORTS + f"\nSOURCE = {self.source_name!r}\n" + _RUNTIME
+			+ signature + "\n".join(self.lines) + "\n" + _MAIN_ENTRY)
+
+	# 1단계: 변수와 대입 수집, 타입 추론
+
+	def _collect(self, ast):
+		kind = ast.get("type")
+		if kind == "condition":
+			for statement in ast["if_block"] + (ast.get("else_block") or []):
+				self._collect(statement)
+			return
+		if kind == "while":
+			for statement in ast["block"]:
+				self._collect(statement)
+			return
+		if kind == "each":
+			raise CompileError("-each loops are not supported by the compiler")
+		handler = Command.resolve(ast)
+		if handler is Var._crt:
+			declaration = self._declaration(ast)
+			if declaration is not None:
+				name, value, var_type = declaration
+				self._variable(name)
+				self.declared.setdefault(name, set()).add(var_type)
+				self.types[name].add(_type_name(value))
+		elif handler is Var._chg:
+			raw_args = ast.get("raw_args", [])
+			if len(raw_args) >= 3 and raw_args[1] == "-in":
+				expression = self._expression(ast)
+				if not isinstance(expression, str):
+					self.assignments.append((raw_args[0], expression))
+		elif handler is not None and handler not in _STATEMENTS:
+			raise CompileError(f"'{ast['noun']} {ast['verb']}' is not supported by the compiler")
+
+	def _variable(self, name):
+		if name not in self.locals:
+			local = f"v_{name}" if name.isidentifier() else f"v{len(self.locals)}_"
+			self.locals[name] = local
+			self.types[name] = set()
+		return self.locals[name]
+
+	@staticmethod
+	def _declaration(ast):
+		"""var crt 문장의 (이름, 값, 선언 타입), 실행할 때 항상 실패하면 None"""
+		raw_args = ast.get("raw_args", [])
+		if len(raw_args) < 3:
+			return None
+		adjectives = ast.get("adjectives", [])
+		var_type = adjectives[0] if adjectives else None
+		if var_type == "list":
+			raise CompileError("list variables are not supported by the compiler")
+		if var_type == "decimal":
+			raise CompileError("decimal variables are not supported by the compiler")
+		value = " ".join(str(v) for v in raw_args[2:]).strip('"')
+		try:
+			value = convert(value, var_type) if var_type is not None else parse_literal(value)
+		except ConversionError:
+			return None
+		return raw_args[0], value, var_type
+
+	@staticmethod
+	def _expression(ast, variant=None):
+		"""var chg의 컴파일된 식, 식이 잘못되었으면 에러 메시지 문자열"""
+		try:
+			return PreProcessing._compile(ast, variant)
+		except ExpressionError as e:
+			return str(e)
+
+	def _infer_types(self):
+		# 대입된 식의 결과 타입을 더 이상 바뀌지 않을 때까지 반영
+		changed = True
+		while changed:
+			changed = False
+			for name, expression in self.assignments:
+				if name not in self.types:
+					continue
+				types = set()
+				for var_type in self.declared[name]:
+					if var_type is None:
+						types |= self._normalized(self._result_types(expression))
+					else:
+						types.add(var_type)
+				if not types <= self.types[name]:
+					self.types[name] |= types
+					changed = True
+
+	def _result_types(self, node):
+		"""식 결과 타입들 (정수로 떨어지는 실수를 int로 바꾸기 전)"""
+		if isinstance(node, Num):
+			return {_type_name(node.value)}
+		if isinstance(node, VarRef):
+			types = set(self.types.get(node.name, ()))
+			if "str" in types:
+				types.discard("str")
+				types |= {"int", "float"}
+			return types
+		if isinstance(node, Neg):
+			return {"float" if t == "float" else "int" for t in self._result_types(node.operand)}
+		left = self._result_types(node.left)
+		right = self._result_types(node.right)
+		if node.variant == "float":
+			return {"float"}
+		types = set()
+		for a in left:
+			for b in right:
+				if "float" in (a, b):
+					types.add("float")
+				elif node.variant == "int" and node.op in ("/", "**"):
+					types.add("int")
+				elif node.op in ("/", "**"):
+					types |= {"int", "float"}
+				else:
+					types.add("float" if "float" in (a, b) else "int")
+		return types
+
+	@staticmethod
+	def _normalized(types):
+		return types | {"int"} if "float" in types else types
+
+	def _dynamic(self, name):
+		return len(self.declared.get(name, ())) > 1
+
+	# 2단계: 코드 생성
+
+	def _emit(self, line):
+		self.lines.append("    " * self.depth + line)
+
+	def _local(self, name):
+		return self.locals[name]
+
+	def _type_local(self, name):
+		return "t" + self.locals[name][1:]
+
+	def _temp(self):
+		self.temps += 1
+		return f"_v{self.temps}"
+
+	def _read(self, name, assigned, fallback=None):
+		"""변수 읽기 식 (만들어지지 않았을 수 있으면 검사 포함)
+
+		fallback이 없으면 없는 변수는 E001 에러, 있으면 그 식의 값을 사용
+		"""
+		if name not in self.locals:
+			return fallback if fallback is not None else f"_undefined({name!r})"
+		local = self._local(name)
+		if name in assigned:
+			return local
+		if fallback is None:
+			fallback = f"_undefined({name!r})"
+		return f"({local} if {local} is not _UNSET else {fallback})"
+
+	def _report(self, line, message, code=None):
+		self._emit(f"_report({line}, {message!r}" + (f", {code!r})" if code else ")"))
+
+	def _message(self, text):
+		self._emit(f"if _verbose: _w({text!r})")
+
+	def _block(self, statements, line_no, assigned):
+		start = len(self.lines)
+		for statement in statements:
+			assigned = self._statement(statement, line_no, assigned)
+		if len(self.lines) == start:
+			self._emit("pass")
+		return assigned
+
+	def _unresolved(self, ast, line_no, assigned):
+		"""최상위 문장 앞: 문장 안에서 만들지 않고 읽는 변수 검사 (인터프리터의 Resolver.check)"""
+		for symbol, line in ast.get("unresolved", ()):
+			name = symbol.name
+			if name in assigned:
+				continue
+			if name in self.locals:
+				self._emit(f"if {self._local(name)} is _UNSET: session.unresolved({line_no + line}, {name!r})")
+			else:
+				self._emit(f"session.unresolved({line_no + line}, {name!r})")
+
+	def _statement(self, ast, line_no, assigned):
+		"""문장 하나의 코드 생성, 실행 후 반드시 만들어져 있는 변수 집합 반환"""
+		line = line_no + ast.get("line", 0)
+		kind = ast.get("type")
+		if kind == "condition":
+			return self._condition(ast, line_no, line, assigned)
+		if kind == "while":
+			return self._while(ast, line_no, line, assigned)
+
+		handler = Command.resolve(ast)
+		if handler is None:
+			noun = ast["noun"]
+			name = noun if noun not in REGISTRY.nouns else f"{noun} {ast['verb']}"
+			self._report(line, ErrorCode.UNKNOWN_COMMAND.message.format(name), ErrorCode.UNKNOWN_COMMAND.code)
+			return assigned
+		return getattr(self, _STATEMENTS[handler])(ast, line, assigned)
+
+	def _condition(self, ast, line_no, line, assigned):
+		predicate = ast["predicate"]
+		else_block = ast.get("else_block")
+		if isinstance(predicate, Constant):
+			block = ast["if_block"] if predicate.value else (else_block or [])
+			for statement in block:
+				assigned = self._statement(statement, line_no, assigned)
+			return assigned
+		self._emit(f"if {self._predicate(predicate, line, assigned)}:")
+		self.depth += 1
+		after_if = self._block(ast["if_block"], line_no, assigned)
+		self.depth -= 1
+		if not else_block:
+			return assigned
+		self._emit("else:")
+		self.depth += 1
+		after_else = self._block(else_block, line_no, assigned)
+		self.depth -= 1
+		return after_if & after_else
+
+	def _while(self, ast, line_no, line, assigned):
+		self.loops += 1
+		count, limit, start, time_limit = (f"_{prefix}{self.loops}" for prefix in ("n", "m", "t", "l"))
+		self._emit(f"{count} = 0")
+		self._emit(f"{limit} = _max_iterations")
+		self._emit(f"{time_limit} = _time_limit")
+		self._emit(f"{start} = _clock()")
+		self._emit(f"while {count} < {limit}:")
+		self.depth += 1
+		self._emit(f"if not {self._predicate(ast['predicate'], line, assigned)}:")
+		self._emit("    break")
+		self._block(ast["block"], line_no, assigned)
+		self._emit(f"{count} += 1")
+		self._emit(f"if len(_out) > {_FLUSH_CHUNKS}:")
+		self._emit("    session.flush()")
+		self._emit(f"if {time_limit} and not {count} % 1024 and _clock() - {start} > {time_limit}:")
+		self._emit(f"    session.loop_stop({line}, 'time limit', f'{{{time_limit}}}s', {count}, {start})")
+		self._emit("    break")
+		self.depth -= 1
+		self._emit("else:")
+		self._emit(f"    session.loop_stop({line}, 'maximum iterations', {limit}, {count}, {start})")
+		# 본문이 한 번도 실행되지 않을 수 있음
+		return assigned
+
+	def _predicate(self, predicate, line, assigned):
+		if isinstance(predicate, Constant):
+			return repr(bool(predicate.value))
+		if isinstance(predicate, (And, Or)):
+			word = "and" if isinstance(predicate, And) else "or"
+			return (f"({self._predicate(predicate.left, line, assigned)} {word} "
+				f"{self._predicate(predicate.right, line, assigned)})")
+		if isinstance(predicate, CompareVarConst):
+			types = self.types.get(predicate.name, set())
+			local = self._local(predicate.name) if predicate.name in self.locals else None
+			value = predicate.value
+			if isinstance(value, (int, float)) and types <= _NUMERIC:
+				test = f"{local} {predicate.op} {_literal(value)}"
+			elif types <= {"str"}:
+				test = f"{local} {predicate.op} {predicate.text!r}"
+			elif not isinstance(value, (int, float)):
+				test = f"_fmt({local}) {predicate.op} {predicate.text!r}"
+			else:
+				test = f"_compare({predicate.op!r}, {local}, {_literal(value)})"
+			return self._guarded(test, [predicate.name], line, assigned)
+		if isinstance(predicate, CompareVarVar):
+			left, right = predicate.left, predicate.right
+			if self.types.get(left, set()) <= _NUMERIC and self.types.get(right, set()) <= _NUMERIC:
+				test = f"{self._local_or_none(left)} {predicate.op} {self._local_or_none(right)}"
+			else:
+				test = f"_compare({predicate.op!r}, {self._local_or_none(left)}, {self._local_or_none(right)})"
+			return self._guarded(test, [left, right], line, assigned)
+		raise CompileError(f"Unsupported condition {predicate!r}")
+
+	def _local_or_none(self, name):
+		return self.locals.get(name, "None")
+
+	def _guarded(self, test, names, line, assigned):
+		# 없는 변수는 E001을 보고하고 거짓 (왼쪽 변수부터 검사)
+		checks = []
+		for name in names:
+			if name not in self.locals:
+				return f"_missing({line}, {name!r})"
+			if name not in assigned:
+				checks.append(f"_missing({line}, {name!r}) if {self._local(name)} is _UNSET else ")
+		return "(" + "".join(checks) + f"({test}))" if checks else f"({test})"
+
+	def _arithmetic(self, node, assigned):
+		"""컴파일된 식 트리를 파이썬 식으로 (피연산자 평가 순서 유지)"""
+		if isinstance(node, Num):
+			return _literal(node.value)
+		if isinstance(node, VarRef):
+			source = self._read(node.name, assigned)
+			if "str" in self.types.get(node.name, ()):
+				return f"_num({source})"
+			return source
+		if isinstance(node, Neg):
+			return f"(-{self._arithmetic(node.operand, assigned)})"
+		left = self._arithmetic(node.left, assigned)
+		right = self._arithmetic(node.right, assigned)
+		if node.variant == "float":
+			# float 변수에 대입하는 식: 피연산자를 float로
+			return f"({self._as_float(node.left, left)} {node.op} {self._as_float(node.right, right)})"
+		helper = _HELPERS.get((node.variant, node.op))
+		if helper is not None and not (self._result_types(node.left) <= {"float"}
+				or self._result_types(node.right) <= {"float"}):
+			# 정수끼리일 수 있는 나눗셈/거듭제곱만 실행 지원 함수로
+			return f"{helper}({left}, {right})"
+		return f"({left} {node.op} {right})"
+
+	def _as_float(self, node, source):
+		if isinstance(node, Num) and abs(node.value) < 2 ** 53:
+			return _literal(float(node.value))
+		return source if self._result_types(node) <= {"float"} else f"float({source})"
+
+	def _try(self, line, emit_body):
+		self._emit("try:")
+		self.depth += 1
+		emit_body()
+		self.depth -= 1
+		for exception, report in _HANDLERS:
+			self._emit(f"except {exception}:")
+			self._emit("    " + report.format(line=line))
+
+	# 명령어별 코드 생성 (_STATEMENTS에 등록)
+
+	def _var_crt(self, ast, line, assigned):
+		raw_args = ast.get("raw_args", [])
+		if len(raw_args) < 3:
+			self._report(line, ErrorCode.MISSING_ARGUMENT.message.format("var crt"), ErrorCode.MISSING_ARGUMENT.code)
+			return assigned
+		declaration = self._declaration(ast)
+		if declaration is None:
+			adjectives = ast.get("adjectives", [])
+			value = " ".join(str(v) for v in raw_args[2:]).strip('"')
+			self._report(line, f"Cannot convert '{format_value(value)}' to {adjectives[0]}")
+			return assigned
+		name, value, var_type = declaration
+		self._emit(f"{self._local(name)} = {_literal(value)}")
+		if self._dynamic(name):
+			self._emit(f"{self._type_local(name)} = {var_type!r}")
+		self._message(f"Variable '{name}' created.\n")
+		return assigned | {name}
+
+	def _var_chg(self, ast, line, assigned):
+		raw_args = ast.get("raw_args", [])
+		if len(raw_args) < 3:
+			self._report(line, ErrorCode.MISSING_ARGUMENT.message.format("var chg: Expected 'name -in value'"),
+				ErrorCode.MISSING_ARGUMENT.code)
+			return assigned
+		name = raw_args[0]
+		if name not in self.locals:
+			self._report(line, ErrorCode.VARIABLE_NOT_FOUND.message.format(name), ErrorCode.VARIABLE_NOT_FOUND.code)
+			return assigned
+		guarded = name not in assigned
+		if guarded:
+			self._emit(f"if {self._local(name)} is _UNSET:")
+			self._emit(f"    _report({line}, {ErrorCode.VARIABLE_NOT_FOUND.message.format(name)!r}, "
+				f"{ErrorCode.VARIABLE_NOT_FOUND.code!r})")
+			self._emit("else:")
+			self.depth += 1
+		if raw_args[1] != "-in":
+			self._report(line, ErrorCode.MISSING_ARGUMENT.message.format(
+				"var chg: Missing or misplaced mandatory flag '-in'. Expected 'name -in value'"),
+				ErrorCode.MISSING_ARGUMENT.code)
+		else:
+			expression = self._expression(ast)
+			if isinstance(expression, str):
+				self._report(line, expression)
+			else:
+				self._try(line, lambda: self._assign(name, ast, assigned))
+		if guarded:
+			self.depth -= 1
+		return assigned
+
+	def _assign(self, name, ast, assigned):
+		# 선언 타입마다 식 변형이 다르면 (Numeric.variant) 현재 타입으로 분기
+		variants = {}
+		for var_type in sorted(self.declared[name], key=str):
+			variants.setdefault(Numeric.variant(var_type), []).append(var_type)
+		if len(variants) == 1:
+			self._store(name, self._expression(ast, next(iter(variants))), assigned)
+		else:
+			branches = sorted(variants.items(), key=lambda item: item[0] is None)
+			for index, (variant, types) in enumerate(branches):
+				if index == len(branches) - 1:
+					self._emit("else:")
+				else:
+					keyword = "if" if index == 0 else "elif"
+					self._emit(f"{keyword} {self._type_local(name)} in {tuple(types)!r}:")
+				self.depth += 1
+				self._store(name, self._expression(ast, variant), assigned)
+				self.depth -= 1
+		self._message(f"Variable '{name}' changed.\n")
+
+	def _store(self, name, expression, assigned):
+		local = self._local(name)
+		source = self._arithmetic(expression, assigned)
+		result = self._result_types(expression)
+		declared = self.declared[name]
+		var_type = next(iter(declared)) if len(declared) == 1 else "dynamic"
+		temp = self._temp()
+
+		if var_type == "int" and result <= {"int"}:
+			self._emit(f"{local} = {source}")
+		elif var_type is None and "float" not in result:
+			self._emit(f"{local} = {source}")
+		elif var_type == "float" and result <= {"float"}:
+			self._emit(f"{local} = {source}")
+		elif var_type in ("int", "float"):
+			# 정수로 떨어지는 실수의 int 변환은 선언 타입으로 바꿀 때 결과가 같으므로 생략
+			self._emit(f"{temp} = {source}")
+			self._emit(f"{local} = {temp} if {temp}.__class__ is {var_type} else _convert({temp}, {var_type!r})")
+		else:
+			self._emit(f"{temp} = {source}")
+			if "float" in result:
+				self._emit(f"if {temp}.__class__ is float and {temp}.is_integer():")
+				self._emit(f"    {temp} = int({temp})")
+			if var_type is None:
+				self._emit(f"{local} = {temp}")
+			elif var_type == "dynamic":
+				self._emit(f"{local} = _convert({temp}, {self._type_local(name)})")
+			else:
+				self._emit(f"{local} = _convert({temp}, {var_type!r})")
+
+	def _var_get(self, ast, line, assigned):
+		values = ast.get("val", [])
+		if len(values) < 1:
+			self._report(line, ErrorCode.MISSING_ARGUMENT.message.format("var get"), ErrorCode.MISSING_ARGUMENT.code)
+			return assigned
+		name = values[0]
+		if name not in self.locals:
+			self._report(line, ErrorCode.VARIABLE_NOT_FOUND.message.format(name), ErrorCode.VARIABLE_NOT_FOUND.code)
+			return assigned
+		text = f"{self._format(name)} + '\\n'"
+		if name in assigned:
+			self._emit(f"_w({text})")
+		else:
+			self._emit(f"if {self._local(name)} is _UNSET:")
+			self._emit(f"    _report({line}, {ErrorCode.VARIABLE_NOT_FOUND.message.format(name)!r}, "
+				f"{ErrorCode.VARIABLE_NOT_FOUND.code!r})")
+			self._emit("else:")
+			self._emit(f"    _w({text})")
+		return assigned
+
+	def _format(self, name):
+		# format_value: bool만 true/false로
+		local = self._local(name)
+		if "bool" in self.types[name]:
+			return f"_fmt({local})"
+		if self.types[name] <= {"str"}:
+			return local
+		return f"str({local})"
+
+	def _tmp_echo(self, ast, line, assigned):
+		# (정적 텍스트, None) 또는 (None, 식) 조각들
+		parts = []
+		for index, word in enumerate(ast["val"]):
+			if index:
+				parts.append((" ", None))
+			name = word if word in self.locals else word[1:] if word.startswith("$") else None
+			if name is None or name not in self.locals:
+				parts.append((str(word), None))
+			elif name in assigned:
+				parts.append((None, self._format(name)))
+			else:
+				parts.append((None, f"({self._format(name)} if {self._local(name)} is not _UNSET else {word!r})"))
+
+		merged = []
+		for text, source in parts:
+			if text is not None and merged and merged[-1][0] is not None:
+				merged[-1] = (merged[-1][0] + text, None)
+			else:
+				merged.append((text, source))
+		if not merged:
+			merged.append(("", None))
+
+		if all(text is not None for text, _ in merged):
+			result = merged[0][0]
+			if result.startswith('"') and result.endswith('"'):
+				result = result[1:-1]
+			self._emit(f"_w({result + chr(10)!r})")
+			return assigned
+
+		first, last = merged[0][0], merged[-1][0]
+		maybe_quoted = (first is None or first.startswith('"')) and (last is None or last.endswith('"'))
+		source = " + ".join(repr(text) if text is not None else code for text, code in merged)
+		if maybe_quoted:
+			self._emit(f"_w(_unquote({source}) + '\\n')")
+		elif last is not None:
+			self._emit(f"_w({' + '.join(repr(text) if text is not None else code for text, code in merged[:-1])}"
+				f" + {last + chr(10)!r})")
+		else:
+			self._emit(f"_w({source} + '\\n')")
+		return assigned
+
+	def _sys_stop(self, ast, line, assigned):
+		self._emit("return session.finish(0)")
+		return assigned
+
+	def _sys_limit(self, ast, line, assigned):
+		raw_args = ast.get("raw_args", [])
+		if len(raw_args) < 3 or raw_args[1] != "-in":
+			self._report(line, ErrorCode.MISSING_ARGUMENT.message.format(
+				"sys limit: Expected 'iterations|time -in value'"), ErrorCode.MISSING_ARGUMENT.code)
+			return assigned
+		setting = raw_args[0]
+		try:
+			if setting == "iterations":
+				self._emit(f"_max_iterations = {max(int(str(raw_args[2])), 0)} or _UNLIMITED")
+			elif setting == "time":
+				self._emit(f"_time_limit = {_literal(max(float(str(raw_args[2])), 0.0))}")
+			else:
+				self._report(line, ErrorCode.UNKNOWN_COMMAND.message.format(f"sys limit {setting}"),
+					ErrorCode.UNKNOWN_COMMAND.code)
+				return assigned
+		except ValueError:
+			self._report(line, f"Invalid limit value '{raw_args[2]}'")
+			return assigned
+		self._message(f"Limit '{setting}' set.\n")
+		return assigned
+
+
+# 명령어 처리 함수 → Compiler의 코드 생성 메서드
+_STATEMENTS = {
+	Var._crt: "_var_crt",
+	Var._chg: "_var_chg",
+	Var._get: "_var_get",
+	Tmp._echo: "_tmp_echo",
+	Sys._stop: "_sys_stop",
+	Sys._limit: "_sys_limit",
+}
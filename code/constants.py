@@ -1,5 +1,7 @@
-import sys
 from enum import Enum
+from output import STDERR
+
+VERSION = "0.1.10.00"
 
 class ErrorCode(Enum):
 	VARIABLE_NOT_FOUND = ("E001", "Variable '{}' not found")
@@ -13,10 +15,14 @@ class ErrorCode(Enum):
 	
 	def print_error(self, *args):
 		formatted_message = self.message.format(*args)
-		sys.stderr.write(f"Error [{self.code}]: {formatted_message}\n")
+		# 줄 번호/중복 처리와 출력 순서(출력 버퍼 먼저 flush)는 STDERR가 담당
+		STDERR.report(formatted_message, self.code)
 
 class CommandList :
-	noun_list = ("tmp", "temp", "sys", "system", "var", "variable")
-	adj_list = ("int", "str", "float", "bool", "list")
-	verb_list = ("chg", "change", "crt", "create", "echo", "stop")
-	prep_list = ("-in",)
\ No newline at end of file
+	noun_list = ("tmp", "temp", "sys", "system", "var", "variable", "list")
+	adj_list = ("int", "str", "float", "bool", "list", "decimal")
+	verb_list = ("chg", "change", "crt", "create", "echo", "stop", "limit", "profile",
+		"rng", "add", "get", "len", "slc", "map", "sum", "min", "max", "mean")
+	prep_list = ("-in",)
+	noun_aliases = {"temp": "tmp", "system": "sys", "variable": "var"}
+	verb_aliases = {"change": "chg", "create": "crt"}
\ No newline at end of file
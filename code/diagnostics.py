@@ -0,0 +1,117 @@
+import json
+
+
+class FailFast(BaseException):
+	"""--fail-fast: 첫 에러에서 실행 중단
+
+	명령어 실행부의 except Exception에 잡혀 '에러 출력 후 계속'이 되지 않도록
+	KeyboardInterrupt처럼 BaseException을 상속한다.
+	"""
+
+
+def format_message(label, code, message):
+	if code:
+		return f"{label} [{code}]: {message}"
+	return f"{label}: {message}"
+
+
+class Diagnostics:
+	"""세션의 에러/경고 수집기
+
+	- 줄 번호: 바인딩한 변수 저장소의 line(최상위 문장) + offset(안쪽 문장)
+	- 같은 코드, 줄, 메시지의 진단은 처음 한 번만 출력하고 횟수만 센다
+	  (detail은 메시지 뒤에 붙여 출력만 하고 비교하지 않음)
+	- 서로 다른 메시지는 max_messages개까지만 출력/보관하고 나머지는 개수만 센다
+	- fail_fast면 첫 에러에서 FailFast로 실행 중단
+	- json_format이면 실행 중에는 출력하지 않고 summary()에서 JSON 줄로 출력
+	"""
+
+	FORMATS = ("text", "json")
+
+	def __init__(self, max_messages=100, fail_fast=False, json_format=False, source=None):
+		self.max_messages = max_messages
+		self.fail_fast = fail_fast
+		self.json_format = json_format
+		self.source = source
+		self.variables = None
+		self.entries = {}
+		self.suppressed = 0
+		self.counts = {"error": 0, "warning": 0}
+
+	def bind(self, variables, source=None):
+		"""줄 번호를 읽을 변수 저장소 (와 JSON에 넣을 파일 이름) 지정"""
+		self.variables = variables
+		if source is not None:
+			self.source = source
+		return self
+
+	@property
+	def errors(self):
+		return self.counts["error"]
+
+	def _location(self):
+		variables = self.variables
+		if variables is None or not variables.line:
+			return None
+		return variables.line + variables.offset
+
+	def record(self, severity, message, code=None, label="Error", detail=None):
+		"""진단 하나를 기록하고 지금 출력할 텍스트(없으면 None) 반환"""
+		line = self._location()
+		key = (severity, code, line, message)
+		entry = self.entries.get(key)
+		if entry is not None:
+			self.counts[severity] = self.counts.get(severity, 0) + 1
+			entry["count"] += 1
+			return None
+		self.counts[severity] = self.counts.get(severity, 0) + 1
+		if self.max_messages and len(self.entries) >= self.max_messages:
+			self.suppressed += 1
+			return None
+		if detail:
+			message = f"{message}; {detail}"
+		entry = {"severity": severity, "code": code, "line": line, "message": message,
+			"label": label, "count": 1}
+		self.entries[key] = entry
+		if self.json_format:
+			return None
+		return self._prefix(line) + format_message(label, code, message) + "\n"
+
+	def _prefix(self, line):
+		if line is None:
+			return f"{self.source}: " if self.source else ""
+		if self.source:
+			return f"{self.source}:{line}: "
+		return f"line {line}: "
+
+	def summary(self):
+		"""반복/생략된 진단 요약 (text), 또는 모든 진단과 요약 (json)"""
+		if self.json_format:
+			lines = []
+			for entry in self.entries.values():
+				record = {key: entry[key] for key in ("severity", "code", "line", "message", "count")}
+				if self.source:
+					record["file"] = self.source
+				lines.append(json.dumps(record))
+			lines.append(json.dumps({
+				"summary": True,
+				"file": self.source,
+				"errors": self.counts["error"],
+				"warnings": self.counts["warning"],
+				"unique": len(self.entries),
+				"suppressed": self.suppressed,
+			}))
+			return "\n".join(lines) + "\n"
+
+		lines = []
+		for entry in self.entries.values():
+			if entry["count"] > 1:
+				lines.append(f"  {self._prefix(entry['line'])}"
+					f"{format_message(entry['label'], entry['code'], entry['message'])} "
+					f"(repeated {entry['count']} times)")
+		if self.suppressed:
+			lines.append(f"  {self.suppressed} more diagnostic(s) not shown (limit {self.max_messages})")
+		if not lines:
+			return ""
+		header = f"{self.counts['error']} error(s), {self.counts['warning']} warning(s):"
+		return "\n".join([header] + lines) + "\n"
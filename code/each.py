@@ -0,0 +1,360 @@
+import time
+import threading
+import contextvars
+from constants import CommandList
+from diagnostics import FailFast
+from logic import Loop
+from lists import ListValue, ListError
+from numeric import Numeric, to_decimal
+from optimizer import Optimizer
+from output import STDERR
+from store import VariableStore, SYMBOLS, UNSET, ConversionError, convert, format_value, is_numeric
+
+# 풀 작업 안에서 실행 중인지 (안쪽 -each -parallel은 순서대로 실행해 풀이 자기 작업을 기다리지 않게)
+_IN_WORKER = contextvars.ContextVar("each_worker", default=False)
+# 작업자마다 이만큼의 작업으로 나눠 보냄 (반복마다 걸리는 시간이 달라도 작업자가 놀지 않도록)
+_TASKS_PER_WORKER = 4
+# -sum의 시작 값을 선언 타입으로 맞추는 타입
+_NUMERIC_TYPES = ("int", "float", "decimal")
+
+
+class Each:
+	"""-each 반복문: 범위나 리스트의 원소마다 본문 실행
+
+	i -each 10 { ... }                   (0..9, 'start stop [step]'도 가능)
+	x -each $xs -parallel 4 -sum total -collect ys { ... }
+
+	반복마다 시작 시점 변수의 복사본에서 실행하므로 반복끼리는 서로의 변경을 보지 못하고,
+	반복 변수와 본문에서 바꾼 변수는 반복이 끝나면 사라진다. 결과는 선언한 리덕션으로만 돌아온다:
+	- -sum 이름: 반복마다 0에서 시작한 값을 반복 순서대로 원래 값에 더함
+	- -collect 이름: 반복이 끝났을 때의 값(만들지 않은 반복은 건너뜀)을 순서대로 리스트로
+
+	-parallel N이면 반복을 N개 작업자(backend: 프로세스 또는 스레드 풀, 0이면 CPU 수)에 나눠
+	실행한다. 출력과 진단은 반복마다 모아 두었다가 반복 순서대로 내보내므로 결과는 N과
+	관계없이 같다. 프로세스 풀은 설정마다 한 번만 띄워 다음 반복문에서도 다시 쓴다.
+	"""
+
+	BACKENDS = ("process", "thread")
+	backend = "process"
+	_pools = {}
+	_lock = threading.Lock()
+
+	@staticmethod
+	def set_backend(backend):
+		if backend not in Each.BACKENDS:
+			raise ValueError(f"Unknown parallel backend '{backend}'")
+		Each.backend = backend
+
+	@staticmethod
+	def execute(ast, variables, execute_func, items, workers=1):
+		"""items(range / 배열 / 리스트)의 원소마다 본문 실행 ("exit"이면 스크립트 중단)"""
+		line = ast.get("line", 0)
+		start = time.perf_counter()
+		reductions = []
+		for kind, name in ast["reductions"]:
+			slot = SYMBOLS.intern(name).slot
+			value = variables.load(slot)
+			if kind == "sum" and value is UNSET:
+				variables.offset = line
+				STDERR.report(f"Variable '{name}' not found", "E001")
+				return None
+			reductions.append((kind, name, slot, value))
+
+		context = _Context(ast, variables, execute_func)
+		if workers > 1 and len(items) > 1 and not _IN_WORKER.get():
+			results = Each._parallel(context, items, workers)
+		else:
+			results = _sequential(context, items)
+
+		totals = [value if kind == "sum" else [] for kind, _, _, value in reductions]
+		status = None
+		count = 0
+		try:
+			for status, events, values in results:
+				_replay(events, variables)
+				for index, value in enumerate(values):
+					totals[index] = _merge(reductions[index], totals[index], value, variables, line)
+				count += 1
+				if status is not None:
+					break
+		finally:
+			results.close()
+
+		variables.offset = line
+		for reduction, total in zip(reductions, totals):
+			_store(reduction, total, variables)
+		if status is not None:
+			return "exit"
+		if count < len(items):
+			# 세션 시간 예산 초과로 작업자가 멈춤
+			Loop._report_stop(variables, "time budget", "session", count, start, line)
+			return "exit"
+		return None
+
+	@staticmethod
+	def _parallel(context, items, workers):
+		# 프로세스 풀 모듈은 무거우므로 -parallel을 처음 쓸 때 불러옴
+		from concurrent.futures.process import BrokenProcessPool
+		pool = Each._pool(workers)
+		size = -(-len(items) // min(len(items), workers * _TASKS_PER_WORKER))
+		chunks = [items[start:start + size] for start in range(0, len(items), size)]
+		futures = [pool.submit(_run_chunk, context, chunk) for chunk in chunks]
+		try:
+			for future, chunk in zip(futures, chunks):
+				try:
+					results = future.result()
+				except BrokenProcessPool:
+					# 작업자 프로세스가 죽은 풀은 버리고 다음 반복문에서 새로 띄움
+					Each._discard(workers)
+					raise
+				yield from results
+				if len(results) < len(chunk) or results[-1][0] is not None:
+					return
+		finally:
+			for future in futures:
+				future.cancel()
+
+	@staticmethod
+	def _key(workers):
+		# 작업자 프로세스는 시작할 때의 산술 모드/최적화 수준으로 식을 컴파일
+		return (Each.backend, workers, Numeric.mode, Numeric.precision, Optimizer.level)
+
+	@staticmethod
+	def _pool(workers):
+		from multiprocessing import util
+		from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+		key = Each._key(workers)
+		with Each._lock:
+			pool = Each._pools.get(key)
+			if pool is None:
+				if Each.backend == "thread":
+					pool = ThreadPoolExecutor(workers, thread_name_prefix="nsh-each")
+				else:
+					pool = ProcessPoolExecutor(workers, initializer=_configure, initargs=key[2:])
+				if not Each._pools:
+					# 배치 작업 프로세스는 끝날 때 자식 프로세스를 기다리므로 그 전에 풀을 닫음
+					# (큐를 닫는 finalizer(우선순위 10)보다 먼저 실행되어야 종료 신호가 전달됨)
+					util.Finalize(None, Each.shutdown, exitpriority=100)
+				Each._pools[key] = pool
+		return pool
+
+	@staticmethod
+	def shutdown():
+		"""띄워 둔 작업자 풀을 모두 닫음"""
+		with Each._lock:
+			pools = list(Each._pools.values())
+			Each._pools.clear()
+		for pool in pools:
+			pool.shutdown(cancel_futures=True)
+
+	@staticmethod
+	def _discard(workers):
+		with Each._lock:
+			pool = Each._pools.pop(Each._key(workers), None)
+		if pool is not None:
+			pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _configure(mode, precision, level):
+	Numeric.set_mode(mode)
+	Numeric.set_precision(precision)
+	Optimizer.set_level(level)
+
+
+class _IterationLog:
+	"""반복 하나의 출력과 진단을 순서대로 기록 (OutputSink와 Diagnostics 대신 사용)
+
+	events: 출력 문자열 또는 (severity, message, code, label, detail, offset)
+	"""
+
+	def __init__(self, quiet, fail_fast):
+		self.quiet = quiet
+		self.fail_fast = fail_fast
+		self.events = []
+		self.variables = None
+
+	def write(self, text):
+		self.events.append(text)
+
+	def message(self, text):
+		if not self.quiet:
+			self.events.append(text)
+
+	def flush(self):
+		pass
+
+	def record(self, severity, message, code=None, label="Error", detail=None):
+		self.events.append((severity, message, code, label, detail, self.variables.offset))
+		return None
+
+
+class _Context:
+	"""반복 실행에 필요한 것 (프로세스 작업자에 보낼 때 변수는 이름으로 옮겨 다시 인턴)"""
+
+	def __init__(self, ast, variables, execute_func):
+		self.execute_func = execute_func
+		self.body = ast["block"]
+		self.name = ast["name"]
+		self.reductions = [(kind, name) for kind, name in ast["reductions"]]
+		self.appended = _appended(ast["block"])
+		self.quiet = variables.out.quiet
+		diagnostics = STDERR.diagnostics()
+		self.fail_fast = diagnostics is not None and diagnostics.fail_fast
+		self.base = variables.copy(limits=variables.limits.copy())
+		self._resolve()
+
+	def _resolve(self):
+		# 슬롯 번호는 프로세스마다 다름
+		base = self.base
+		self.slot = SYMBOLS.intern(self.name).slot
+		self.appended_slots = [SYMBOLS.intern(name).slot for name in self.appended]
+		self.initial = []
+		for kind, name in self.reductions:
+			slot = SYMBOLS.intern(name).slot
+			if kind == "sum":
+				var_type = base.kinds[slot] if slot < len(base.kinds) else None
+				self.initial.append((slot, convert(0, var_type) if var_type in _NUMERIC_TYPES else 0))
+			else:
+				self.initial.append((slot, UNSET))
+
+	def __getstate__(self):
+		state = dict(self.__dict__)
+		base = state.pop("base")
+		for name in ("slot", "appended_slots", "initial"):
+			del state[name]
+		names = SYMBOLS.names
+		state["values"] = [(names[slot], value, base.kinds[slot])
+			for slot, value in enumerate(base.frame) if value is not UNSET]
+		state["limits"] = base.limits
+		state["line"] = base.line
+		return state
+
+	def __setstate__(self, state):
+		values = state.pop("values")
+		base = VariableStore(limits=state.pop("limits"))
+		base.line = state.pop("line")
+		for name, value, var_type in values:
+			slot = SYMBOLS.intern(name).slot
+			base.store(slot, value)
+			base.kinds[slot] = var_type
+		self.__dict__.update(state)
+		self.base = base
+		self._resolve()
+
+	def run(self, element):
+		"""반복 하나를 시작 시점 변수의 복사본에서 실행해 (상태, 기록, 리덕션 값들) 반환"""
+		log = _IterationLog(self.quiet, self.fail_fast)
+		variables = self.base.copy(log, self.base.limits.copy())
+		log.variables = variables
+		for slot in self.appended_slots:
+			# list add는 리스트를 제자리에서 바꾸므로 반복마다 따로
+			value = variables.load(slot)
+			if isinstance(value, ListValue):
+				variables.store(slot, value.copy())
+		variables.store(self.slot, element)
+		variables.kinds[self.slot] = None
+		for slot, value in self.initial:
+			variables.store(slot, value)
+
+		status = None
+		execute = self.execute_func
+		with STDERR.redirect(None, log, log):
+			try:
+				for statement in self.body:
+					if execute(statement, variables) == "exit":
+						status = "exit"
+						break
+			except FailFast:
+				status = "fail"
+		return status, log.events, tuple(variables.load(slot) for slot, _ in self.initial)
+
+
+def _sequential(context, items):
+	limits = context.base.limits
+	for element in items:
+		if limits.deadline is not None and limits.expired():
+			return
+		yield context.run(element)
+
+
+def _run_chunk(context, items):
+	"""작업자에서 반복 여러 개를 차례로 실행 (중단/시간 초과면 거기까지만)"""
+	token = _IN_WORKER.set(True)
+	try:
+		results = []
+		limits = context.base.limits
+		for element in items:
+			if limits.deadline is not None and limits.expired():
+				break
+			result = context.run(element)
+			results.append(result)
+			if result[0] is not None:
+				break
+		return results
+	finally:
+		_IN_WORKER.reset(token)
+
+
+def _replay(events, variables):
+	"""반복의 출력/진단을 원래 세션으로 (진단 줄 번호는 기록 당시의 오프셋)"""
+	out = variables.out
+	for event in events:
+		if event.__class__ is str:
+			out.write(event)
+		else:
+			severity, message, code, label, detail, offset = event
+			variables.offset = offset
+			STDERR.report(message, code, severity, label, detail)
+
+
+def _merge(reduction, total, value, variables, line):
+	kind, name, _, _ = reduction
+	if kind == "collect":
+		if value is not UNSET:
+			total.append(value)
+		return total
+	if total is None:
+		# 앞에서 숫자가 아닌 값을 만나 더 이상 더하지 않음
+		return None
+	for operand in (total, value):
+		if not is_numeric(operand):
+			variables.offset = line
+			STDERR.report(f"-sum {name}: Non-numeric value '{format_value(operand)}'")
+			return None
+	try:
+		return total + value
+	except TypeError:
+		# Decimal과 float
+		return to_decimal(total) + to_decimal(value)
+
+
+def _store(reduction, total, variables):
+	kind, name, slot, _ = reduction
+	if total is None:
+		return
+	try:
+		if kind == "collect":
+			total = ListValue.from_values(total)
+		if variables.load(slot) is UNSET:
+			variables.declare_slot(slot, total, "list")
+			variables.out.message(f"Variable '{name}' created.\n")
+		else:
+			variables.assign_slot(slot, total)
+			variables.out.message(f"Variable '{name}' changed.\n")
+	except (ListError, ConversionError) as e:
+		STDERR.report(str(e))
+
+
+def _appended(block):
+	"""블록 안의 list add 대상 이름들"""
+	names = set()
+	for statement in block:
+		kind = statement.get("type")
+		if kind == "condition":
+			names |= _appended(statement["if_block"]) | _appended(statement.get("else_block") or ())
+		elif kind in ("while", "each"):
+			names |= _appended(statement["block"])
+		elif (statement["noun"] == "list" and statement.get("raw_args")
+				and CommandList.verb_aliases.get(statement["verb"], statement["verb"]) == "add"):
+			names.add(str(statement["raw_args"][0]))
+	return names
@@ -0,0 +1,355 @@
+import re
+import operator
+from decimal import Decimal, DecimalException, Overflow as DecimalOverflow
+from functools import lru_cache
+from lists import ListValue
+from numeric import Numeric
+from store import SYMBOLS, UNSET
+
+
+class ExpressionError(Exception):
+	pass
+
+
+class UndefinedVariable(ExpressionError):
+	def __init__(self, name):
+		super().__init__(name)
+		self.name = name
+
+
+_TOKEN_RE = re.compile(r'''
+	\s*(?:
+		(?P<num>(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?)
+	  | (?P<var>\$[a-zA-Z_][a-zA-Z0-9_]*)
+	  | (?P<op>\*\*|[-+*/%()])
+	  | (?P<error>\S)
+	)
+''', re.VERBOSE)
+
+
+def to_number(value):
+	"""변수 값을 숫자로 변환 (이미 숫자면 그대로, 리스트는 원소별 연산용으로 그대로)"""
+	if isinstance(value, (int, float, Decimal, ListValue)):
+		return value
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		pass
+	try:
+		if Numeric.mode == "decimal":
+			return Decimal(value.strip())
+		return float(value)
+	except (TypeError, ValueError, AttributeError, DecimalException):
+		raise ExpressionError("Non-numeric value in expression.")
+
+
+def _div(left, right):
+	if right == 0:
+		raise ExpressionError("Division by zero.")
+	if left.__class__ is int and right.__class__ is int and not left % right:
+		# 나누어떨어지는 정수 나눗셈은 float를 거치지 않음 (2**53보다 큰 값도 정확)
+		return left // right
+	return left / right
+
+
+def _mod(left, right):
+	if right == 0:
+		raise ExpressionError("Modulo by zero.")
+	return left % right
+
+
+def _pow(left, right):
+	try:
+		return left ** right
+	except ZeroDivisionError:
+		raise ExpressionError("Division by zero.")
+
+
+_BINARY_OPS = {
+	"+": operator.add,
+	"-": operator.sub,
+	"*": operator.mul,
+	"/": _div,
+	"%": _mod,
+	"**": _pow,
+}
+
+
+# int 변형: 정수끼리의 나눗셈/음수 거듭제곱도 정수로 (0 쪽으로 버림, int()와 같은 결과)
+
+def _int_div(left, right):
+	if left.__class__ is int and right.__class__ is int:
+		if right == 0:
+			raise ExpressionError("Division by zero.")
+		quotient = abs(left) // abs(right)
+		return -quotient if (left < 0) != (right < 0) else quotient
+	return _div(left, right)
+
+
+def _int_pow(left, right):
+	if left.__class__ is int and right.__class__ is int and right < 0:
+		if left == 0:
+			raise ExpressionError("Division by zero.")
+		if abs(left) != 1:
+			return 0
+		return left if right % 2 else 1
+	return _pow(left, right)
+
+
+# decimal 변형: float 피연산자는 Decimal로 바꿔 계산 (리스트와의 원소별 연산은 ListValue가 처리)
+
+def _decimal_pair(left, right):
+	if left.__class__ is ListValue or right.__class__ is ListValue:
+		return left, right
+	return (Decimal(repr(left)) if left.__class__ is float else left,
+		Decimal(repr(right)) if right.__class__ is float else right)
+
+
+def _decimal(func):
+	def apply(left, right):
+		try:
+			return func(*_decimal_pair(left, right))
+		except DecimalOverflow:
+			raise OverflowError("decimal overflow")
+		except DecimalException:
+			raise ExpressionError("Invalid decimal operation.")
+	return apply
+
+
+def _decimal_div(left, right):
+	if right == 0:
+		raise ExpressionError("Division by zero.")
+	if left.__class__ is int and right.__class__ is int:
+		if not left % right:
+			return left // right
+		return Decimal(left) / right
+	return left / right
+
+
+# float 변형: 모든 피연산자를 float로 (리스트는 그대로)
+
+def _float(func):
+	def apply(left, right):
+		return func(left if left.__class__ is ListValue else float(left),
+			right if right.__class__ is ListValue else float(right))
+	return apply
+
+
+_VARIANT_OPS = {
+	"exact": _BINARY_OPS,
+	"int": dict(_BINARY_OPS, **{"/": _int_div, "**": _int_pow}),
+	"decimal": {op: _decimal(func) for op, func in dict(_BINARY_OPS, **{"/": _decimal_div}).items()},
+	"float": {op: _float(func) for op, func in _BINARY_OPS.items()},
+}
+
+
+class Num:
+	__slots__ = ("value",)
+
+	def __init__(self, value):
+		self.value = value
+
+	def evaluate(self, variables):
+		return self.value
+
+	def __repr__(self):
+		return repr(self.value)
+
+
+class VarRef:
+	"""변수 참조 (컴파일할 때 이름을 프레임 슬롯 번호로 바꿔 둠)"""
+
+	__slots__ = ("name", "slot")
+
+	def __init__(self, name):
+		self.name = name
+		self.slot = SYMBOLS.intern(name).slot
+
+	def evaluate(self, variables):
+		try:
+			value = variables.frame[self.slot]
+		except IndexError:
+			raise UndefinedVariable(self.name)
+		if value is UNSET:
+			raise UndefinedVariable(self.name)
+		return to_number(value)
+
+	def __reduce__(self):
+		# 슬롯 번호는 프로세스마다 다르므로 이름으로 다시 만듦
+		return (VarRef, (self.name,))
+
+	def __repr__(self):
+		return "$" + self.name
+
+
+class Neg:
+	__slots__ = ("operand",)
+
+	def __init__(self, operand):
+		self.operand = operand
+
+	def evaluate(self, variables):
+		return -self.operand.evaluate(variables)
+
+	def __repr__(self):
+		return f"(-{self.operand!r})"
+
+
+class BinOp:
+	"""이항 연산 (variant: 산술 모드/대입 대상 타입에 따른 연산 함수 종류)"""
+
+	__slots__ = ("op", "left", "right", "variant", "func")
+
+	def __init__(self, op, left, right, variant="exact"):
+		self.op = op
+		self.left = left
+		self.right = right
+		self.variant = variant
+		self.func = _VARIANT_OPS[variant][op]
+
+	def evaluate(self, variables):
+		left = self.left.evaluate(variables)
+		right = self.right.evaluate(variables)
+		try:
+			return self.func(left, right)
+		except TypeError:
+			# Decimal과 float가 섞인 연산: Decimal로 맞춰 다시 계산 (그 외에는 원래 에러)
+			return _VARIANT_OPS["decimal"][self.op](left, right)
+
+	def __getstate__(self):
+		return (self.op, self.left, self.right, self.variant)
+
+	def __setstate__(self, state):
+		self.__init__(*state)
+
+	def __repr__(self):
+		return f"({self.left!r} {self.op} {self.right!r})"
+
+
+class _ExpressionParser:
+	"""우선순위: ( ) > ** (오른쪽 결합) > 단항 - > * / % > + -"""
+
+	def __init__(self, tokens, variant="exact"):
+		self.tokens = tokens
+		self.variant = variant
+		self.pos = 0
+
+	def _peek(self):
+		if self.pos < len(self.tokens):
+			return self.tokens[self.pos]
+		return (None, None)
+
+	def parse(self):
+		if not self.tokens:
+			raise ExpressionError("Empty expression.")
+		node = self._additive()
+		if self.pos != len(self.tokens):
+			raise ExpressionError("Invalid expression format (did not resolve to single value).")
+		return node
+
+	def _additive(self):
+		node = self._multiplicative()
+		while self._peek() in (("op", "+"), ("op", "-")):
+			op = self.tokens[self.pos][1]
+			self.pos += 1
+			node = BinOp(op, node, self._multiplicative(), self.variant)
+		return node
+
+	def _multiplicative(self):
+		node = self._unary()
+		while self._peek() in (("op", "*"), ("op", "/"), ("op", "%")):
+			op = self.tokens[self.pos][1]
+			self.pos += 1
+			node = BinOp(op, node, self._unary(), self.variant)
+		return node
+
+	def _unary(self):
+		kind, value = self._peek()
+		if kind == "op" and value in ("-", "+"):
+			self.pos += 1
+			operand = self._unary()
+			return Neg(operand) if value == "-" else operand
+		return self._power()
+
+	def _power(self):
+		node = self._atom()
+		if self._peek() == ("op", "**"):
+			self.pos += 1
+			node = BinOp("**", node, self._unary(), self.variant)
+		return node
+
+	def _atom(self):
+		kind, value = self._peek()
+		self.pos += 1
+		if kind == "num":
+			return Num(value)
+		if kind == "var":
+			return VarRef(value)
+		if (kind, value) == ("op", "("):
+			node = self._additive()
+			if self._peek() != ("op", ")"):
+				raise ExpressionError("Missing ')' in expression.")
+			self.pos += 1
+			return node
+		if kind is None:
+			raise ExpressionError("Invalid expression format (did not resolve to single value).")
+		raise ExpressionError("Non-numeric value in expression.")
+
+
+def _number(text, variant):
+	try:
+		return int(text)
+	except ValueError:
+		return Decimal(text) if variant == "decimal" else float(text)
+
+
+def _tokenize(source, variant="exact"):
+	tokens = []
+	for match in _TOKEN_RE.finditer(source.rstrip()):
+		kind = match.lastgroup
+		text = match.group(kind)
+		if kind == "num":
+			tokens.append((kind, _number(text, variant)))
+		elif kind == "var":
+			tokens.append((kind, text[1:]))
+		elif kind == "op":
+			tokens.append((kind, text))
+		else:
+			raise ExpressionError("Non-numeric value in expression.")
+	return tokens
+
+
+def compile_expression(source, variant=None):
+	"""산술식 문자열을 평가 가능한 트리로 컴파일 (variant가 없으면 현재 산술 모드)"""
+	return _compile_expression(source, variant or Numeric.mode)
+
+
+@lru_cache(maxsize=1024)
+def _compile_expression(source, variant):
+	# (소스 문자열, 변형) 단위로 캐시
+	return _ExpressionParser(_tokenize(source, variant), variant).parse()
+
+
+compile_expression.cache_clear = _compile_expression.cache_clear
+
+
+def expression_names(node):
+	"""식이 읽는 변수 이름 리스트 (나온 순서대로)
+
+	반복문에서 끌어올린 부분식의 숨은 변수(%h...)는 스크립트 변수가 아니므로 제외
+	"""
+	if isinstance(node, VarRef):
+		return [] if node.name.startswith("%") else [node.name]
+	if isinstance(node, BinOp):
+		return expression_names(node.left) + expression_names(node.right)
+	if isinstance(node, Neg):
+		return expression_names(node.operand)
+	return []
+
+
+def evaluate(expression, variables):
+	"""컴파일된 식을 평가 (정수로 떨어지는 실수는 int로 반환)"""
+	result = expression.evaluate(variables)
+	if isinstance(result, float) and result.is_integer():
+		return int(result)
+	return result
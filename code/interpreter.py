@@ -0,0 +1,82 @@
+import io
+import sys
+from shell import Run, Command
+from output import OutputSink, STDERR
+from diagnostics import Diagnostics
+from profiler import Profiler
+from store import VariableStore, LoopLimits
+
+
+class Interpreter:
+	"""독립된 셸 세션 (변수 저장소, 출력, 에러 출력, 실행 한도를 인스턴스마다 따로 가짐)
+
+	파싱 캐시, 컴파일된 식/조건 캐시, 스크립트 캐시, 명령 테이블은 모든 인스턴스가
+	공유한다. 인스턴스 하나는 한 번에 한 스레드에서만 사용하고, 스레드마다 다른
+	인스턴스를 쓰면 동시에 실행해도 된다.
+
+	out: 출력 OutputSink (기본: 표준 출력으로 나가는 새 버퍼)
+	err: 에러 메시지를 쓸 스트림 (기본: sys.stderr)
+	diagnostics: 에러/경고 수집기 (기본: 새 Diagnostics, summarize()로 요약 출력)
+	"""
+
+	def __init__(self, out=None, err=None, limits=None, quiet=False, diagnostics=None):
+		if out is None:
+			out = OutputSink(quiet=quiet)
+		self.err = err
+		self.variables = VariableStore(out=out, limits=limits if limits is not None else LoopLimits())
+		self.diagnostics = (diagnostics if diagnostics is not None else Diagnostics()).bind(self.variables)
+
+	@staticmethod
+	def to_memory(limits=None, quiet=False, diagnostics=None):
+		"""출력과 에러를 모두 메모리에 모으는 인스턴스 (output()/errors()로 확인)"""
+		return Interpreter(OutputSink.to_memory(quiet), io.StringIO(), limits, diagnostics=diagnostics)
+
+	@property
+	def out(self):
+		return self.variables.out
+
+	@property
+	def limits(self):
+		return self.variables.limits
+
+	def execute(self, source):
+		"""문장(여러 줄 가능) 문자열을 실행하고 종료 상태 반환"""
+		with self._session():
+			return Run.run_stream(io.StringIO(source), self.variables)
+
+	def run_file(self, path):
+		"""스크립트 파일을 실행하고 종료 상태 반환"""
+		with self._session():
+			return Run.run_file(path, self.variables)
+
+	def profile(self, enabled=True):
+		"""문장 단위 프로파일링 켜기/끄기 (report()로 결과 확인)"""
+		if enabled and self.variables.profiler is None:
+			self.variables.profiler = Profiler(Command.execute)
+		if self.variables.profiler is not None:
+			self.variables.profiler.active = enabled
+
+	def report(self):
+		profiler = self.variables.profiler
+		return profiler.report() if profiler is not None else ""
+
+	def summarize(self):
+		"""반복/생략된 진단 요약 (JSON 형식이면 모든 진단)을 에러 스트림에 출력"""
+		summary = self.diagnostics.summary()
+		if summary:
+			with self._session():
+				STDERR.write(summary)
+
+	def output(self):
+		"""메모리 출력 버퍼의 내용"""
+		return self.variables.out.getvalue()
+
+	def errors(self):
+		"""메모리 에러 스트림의 내용"""
+		return self.err.getvalue() if isinstance(self.err, io.StringIO) else ""
+
+	def close(self):
+		self.variables.out.close()
+
+	def _session(self):
+		return STDERR.redirect(self.err or sys.stderr, self.variables.out, self.diagnostics)
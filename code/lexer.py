@@ -0,0 +1,74 @@
+import re
+
+
+class LexError(Exception):
+    def __init__(self, message, pos):
+        super().__init__(f"{message} (at char {pos})")
+        self.pos = pos
+
+
+# 토큰 종류
+VAR = "var"
+STR = "str"
+NUM = "num"
+ARITH = "arith"
+IDENT = "ident"
+CMP = "cmp"
+LOGIC = "logic"
+PREP = "prep"
+KEYWORD = "keyword"
+LBRACE = "{"
+RBRACE = "}"
+COLON = ":"
+SEMICOLON = ";"
+
+# pyparsing 문법과 같은 순서로 매칭 (플래그는 접두어 매칭)
+_TOKEN_RE = re.compile(r'''
+    (?P<nl>[ \t\r]*\n[ \t\r\n]*)
+  | (?P<ws>[ \t\r]+)
+  | (?P<str>"(?:[^"\n\r\\]|\\.)*")
+  | (?P<var>\$[a-zA-Z_][a-zA-Z0-9_]*)
+  | (?P<logic>-and|-or)
+  | (?P<prep>-in)
+  | (?P<keyword>-if|-else|-while|-each|-parallel|-sum|-collect)
+  | (?P<num>[+-]?(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|[+-]?\d+(?:[eE][+-]?\d+)?)
+  | (?P<ident>[a-zA-Z_][a-zA-Z0-9_]*)
+  | (?P<cmp>==|!=|<=|>=|<|>)
+  | (?P<arith>\*\*|[*/%()+]|-(?![a-zA-Z_]))
+  | (?P<punct>[{}:;])
+  | (?P<error>.)
+''', re.VERBOSE | re.DOTALL)
+
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+_WHITESPACE_ESCAPES = {"t": "\t", "n": "\n", "f": "\f", "r": "\r"}
+
+
+def _unescape(match):
+    char = match.group(1)
+    return _WHITESPACE_ESCAPES.get(char, char)
+
+
+class Lexer:
+    """한 번의 스캔으로 문장을 (종류, 값) 토큰 리스트로 변환"""
+
+    @staticmethod
+    def tokenize(source):
+        tokens = []
+        append = tokens.append
+        for match in _TOKEN_RE.finditer(source):
+            kind = match.lastgroup
+            text = match.group()
+            if kind == "ws":
+                continue
+            if kind == "nl":
+                # 줄바꿈은 문장 구분자 (값의 "\n" 개수로 줄 번호 계산)
+                append((SEMICOLON, "\n" * text.count("\n")))
+            elif kind == "str":
+                append((STR, _ESCAPE_RE.sub(_unescape, text[1:-1])))
+            elif kind == "punct":
+                append((text, text))
+            elif kind == "error":
+                raise LexError(f"Unexpected character '{text}'", match.start())
+            else:
+                append((kind, text))
+        return tokens
@@ -0,0 +1,291 @@
+import array
+import operator
+from decimal import Decimal, DecimalException
+from itertools import repeat
+from numeric import Numeric, to_decimal
+from store import parse_value, format_value
+
+
+class ListError(ValueError):
+	pass
+
+
+# 원소 종류 → array 타입 코드 (decimal / 문자열 리스트는 일반 list로 보관)
+_TYPECODES = {"int": "q", "float": "d"}
+_NUMBER_TYPES = (int, float, Decimal)
+
+_OPS = {
+	"+": operator.add,
+	"-": operator.sub,
+	"*": operator.mul,
+	"/": operator.truediv,
+	"%": operator.mod,
+	"**": operator.pow,
+}
+
+_NUMPY = None
+
+
+def _numpy():
+	"""NumPy가 있으면 모듈, 없으면 None (처음 필요할 때 한 번만 import)"""
+	global _NUMPY
+	if _NUMPY is None:
+		try:
+			import numpy
+			_NUMPY = numpy
+		except ImportError:
+			_NUMPY = False
+	return _NUMPY or None
+
+
+def merge_signs(tokens):
+	# 렉서가 '-3'을 '-', '3'으로 나누므로 다시 합침
+	merged = []
+	sign = ""
+	for token in tokens:
+		token = str(token)
+		if token in ("-", "+"):
+			sign = "-" if (sign == "-") != (token == "-") else ""
+			continue
+		merged.append(sign + token if sign else token)
+		sign = ""
+	return merged
+
+
+class ListValue:
+	"""array 기반 리스트 값 (kind: int / float / decimal / str)
+
+	숫자 리스트는 array('q') / array('d')에 연속으로 저장하고, 원소별 연산과 집계는
+	한 번의 벌크 연산으로 처리한다. Decimal은 array에 넣을 수 없으므로 decimal 리스트는
+	일반 list에 보관하고 Decimal 연산으로 계산한다. NumPy가 있고 use_numpy가 켜져 있으면 실수 연산은
+	같은 버퍼를 NumPy 배열로 보고 계산한다 (정수 합계/연산은 오버플로 검사를 위해
+	항상 파이썬 정수로 계산).
+	"""
+
+	__slots__ = ("data", "kind")
+	use_numpy = True
+
+	def __init__(self, data, kind):
+		self.data = data
+		self.kind = kind
+
+	@staticmethod
+	def from_values(values, kind=None):
+		"""리터럴 값(문자열/숫자) 목록으로 생성 (kind가 없으면 원소에서 추론)
+
+		decimal 모드에서는 소수 리터럴이 Decimal이 되므로 decimal 리스트로 추론된다.
+		"""
+		values = [parse_value(value) if isinstance(value, str) else value for value in values]
+		if kind is None:
+			if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+				kind = "int"
+			elif all(isinstance(value, _NUMBER_TYPES) and not isinstance(value, bool) for value in values):
+				kind = "decimal" if any(isinstance(value, Decimal) for value in values) else "float"
+			else:
+				kind = "str"
+		if kind == "str":
+			return ListValue([format_value(value) for value in values], kind)
+		if kind == "decimal":
+			try:
+				return ListValue([to_decimal(value) for value in values], kind)
+			except (TypeError, AttributeError, DecimalException):
+				raise ListError(f"Cannot convert list elements to {kind}")
+		if kind not in _TYPECODES:
+			raise ListError(f"Unsupported list element type '{kind}'")
+		try:
+			return ListValue(array.array(_TYPECODES[kind], values), kind)
+		except TypeError:
+			raise ListError(f"Cannot convert list elements to {kind}")
+		except OverflowError:
+			raise ListError("Integer too large for an int list (use list:float)")
+
+	@staticmethod
+	def from_tokens(tokens, kind=None):
+		"""명령어 인자 토큰(따옴표/부호 분리 포함)으로 생성"""
+		return ListValue.from_values([token.strip('"') for token in merge_signs(tokens)], kind)
+
+	@staticmethod
+	def from_range(start, stop, step=1):
+		if step == 0:
+			raise ListError("Range step must not be zero")
+		if all(isinstance(value, int) for value in (start, stop, step)):
+			return ListValue(array.array("q", range(start, stop, step)), "int")
+		if any(isinstance(value, Decimal) for value in (start, stop, step)):
+			start, stop, step = map(to_decimal, (start, stop, step))
+			count = max(int(-(-(stop - start) // step)), 0)
+			return ListValue([start + i * step for i in range(count)], "decimal")
+		count = max(int(-(-(stop - start) // step)), 0)
+		return ListValue(array.array("d", (start + i * step for i in range(count))), "float")
+
+	def __len__(self):
+		return len(self.data)
+
+	def __iter__(self):
+		return iter(self.data)
+
+	def __eq__(self, other):
+		return isinstance(other, ListValue) and self.kind == other.kind and self.data == other.data
+
+	__hash__ = None
+
+	def __str__(self):
+		return "[" + ", ".join(map(format_value, self.data)) + "]"
+
+	def __repr__(self):
+		return f"ListValue({self.kind}, {self})"
+
+	def copy(self):
+		return ListValue(self.data[:], self.kind)
+
+	def append(self, values):
+		"""values(리터럴/숫자 목록)를 뒤에 추가 (원소 종류는 유지)"""
+		if self.kind == "str":
+			self.data.extend(format_value(value) for value in values)
+			return
+		extra = ListValue.from_values(values, self.kind)
+		self.data.extend(extra.data)
+
+	def get(self, index):
+		try:
+			return self.data[index]
+		except IndexError:
+			raise ListError(f"List index {index} out of range (length {len(self.data)})")
+
+	def slice(self, start=None, stop=None, step=None):
+		if step == 0:
+			raise ListError("Slice step must not be zero")
+		return ListValue(self.data[start:stop:step], self.kind)
+
+	# 원소별 산술: 리스트 ⊕ 스칼라, 스칼라 ⊕ 리스트, 같은 길이의 리스트끼리
+
+	def _numeric(self):
+		if self.kind == "str":
+			raise ListError("Arithmetic on a list of strings")
+
+	def _binary(self, op, other, reverse=False):
+		if isinstance(other, ListValue):
+			other._numeric()
+			if len(other) != len(self):
+				raise ListError(f"List lengths differ ({len(self)} and {len(other)})")
+			other_kind = other.kind
+		elif isinstance(other, _NUMBER_TYPES):
+			other_kind = "decimal" if isinstance(other, Decimal) else "float" if isinstance(other, float) else "int"
+		else:
+			return NotImplemented
+		self._numeric()
+
+		if "decimal" in (self.kind, other_kind) or (op == "/" and Numeric.mode == "decimal"):
+			return self._decimal_binary(op, other, reverse)
+		kind = "float" if op == "/" or "float" in (self.kind, other_kind) else "int"
+		if kind == "float" and self.use_numpy and _numpy() is not None:
+			return self._numpy_binary(op, other, reverse)
+
+		right = other.data if isinstance(other, ListValue) else repeat(other)
+		pairs = (right, self.data) if reverse else (self.data, right)
+		func = _OPS[op]
+		try:
+			if kind == "int":
+				try:
+					return ListValue(array.array("q", map(func, *pairs)), "int")
+				except TypeError:
+					# 정수 ** 음수 같은 실수 결과 (repeat는 다시 써도 되므로 그대로 재계산)
+					pass
+				except OverflowError:
+					raise ListError("Integer overflow in list arithmetic (use list:float)")
+			return ListValue(array.array("d", map(func, *pairs)), "float")
+		except ZeroDivisionError:
+			raise ListError("Division by zero.")
+
+	def _decimal_binary(self, op, other, reverse):
+		# float 원소/스칼라는 최단 표기로 Decimal로 바꿔서 계산 (0.1 → Decimal('0.1'))
+		left = map(to_decimal, self.data)
+		right = map(to_decimal, other.data) if isinstance(other, ListValue) else repeat(to_decimal(other))
+		pairs = (right, left) if reverse else (left, right)
+		try:
+			return ListValue(list(map(_OPS[op], *pairs)), "decimal")
+		except ZeroDivisionError:
+			raise ListError("Division by zero.")
+		except DecimalException as e:
+			raise ListError(f"Invalid list arithmetic ({e.__class__.__name__})")
+
+	def _numpy_binary(self, op, other, reverse):
+		np = _numpy()
+		left = self._as_numpy()
+		right = other._as_numpy() if isinstance(other, ListValue) else other
+		if reverse:
+			left, right = right, left
+		with np.errstate(divide="raise", invalid="raise", over="raise"):
+			try:
+				result = _OPS[op](np.asarray(left, dtype=np.float64), right)
+			except FloatingPointError as e:
+				raise ListError(f"Invalid list arithmetic ({e})")
+		values = array.array("d")
+		values.frombytes(result.astype(np.float64).tobytes())
+		return ListValue(values, "float")
+
+	def _as_numpy(self):
+		np = _numpy()
+		return np.frombuffer(self.data, dtype=np.float64 if self.kind == "float" else np.int64)
+
+	def __add__(self, other):
+		return self._binary("+", other)
+
+	def __radd__(self, other):
+		return self._binary("+", other, True)
+
+	def __sub__(self, other):
+		return self._binary("-", other)
+
+	def __rsub__(self, other):
+		return self._binary("-", other, True)
+
+	def __mul__(self, other):
+		return self._binary("*", other)
+
+	def __rmul__(self, other):
+		return self._binary("*", other, True)
+
+	def __truediv__(self, other):
+		return self._binary("/", other)
+
+	def __rtruediv__(self, other):
+		return self._binary("/", other, True)
+
+	def __mod__(self, other):
+		return self._binary("%", other)
+
+	def __rmod__(self, other):
+		return self._binary("%", other, True)
+
+	def __pow__(self, other):
+		return self._binary("**", other)
+
+	def __rpow__(self, other):
+		return self._binary("**", other, True)
+
+	def __neg__(self):
+		return self._binary("*", -1)
+
+	# 집계
+
+	def reduce(self, name):
+		"""sum / min / max / mean"""
+		self._numeric()
+		if not self.data:
+			if name == "sum":
+				return 0
+			raise ListError(f"{name} of an empty list")
+		np = _numpy() if self.use_numpy else None
+		if np is not None and self.kind != "decimal" and (self.kind == "float" or name in ("min", "max")):
+			view = self._as_numpy()
+			result = getattr(view, name)()
+			return result.item()
+		if name == "sum":
+			return sum(self.data)
+		if name == "min":
+			return min(self.data)
+		if name == "max":
+			return max(self.data)
+		if name == "mean":
+			return sum(self.data) / len(self.data)
+		raise ListError(f"Unknown reduction '{name}'")
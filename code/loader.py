@@ -0,0 +1,182 @@
+import codecs
+
+COMMENT_PREFIXES = ('//', '##', 'cmt')
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_lines(stream, chunk_size=CHUNK_SIZE, waiting=None):
+	"""스트림을 chunk 단위로 읽어 줄 단위로 반환 (파일 전체를 메모리에 올리지 않음)
+
+	파이프처럼 탐색할 수 없는 스트림은 도착한 만큼만 읽으므로 쓰는 쪽이 천천히 보내도
+	줄이 오는 대로 반환한다. waiting: 읽기 전에 (입력을 기다리게 될 수 있을 때) 호출
+	"""
+	read = _reader(stream, chunk_size)
+	remainder = ""
+	while True:
+		if waiting is not None:
+			waiting()
+		chunk = read()
+		if not chunk:
+			break
+		lines = (remainder + chunk).split("\n")
+		remainder = lines.pop()
+		yield from lines
+	if remainder:
+		yield remainder
+
+
+def _reader(stream, chunk_size):
+	buffer = getattr(stream, "buffer", None)
+	try:
+		seekable = stream.seekable()
+	except (AttributeError, ValueError, OSError):
+		seekable = False
+	if seekable or buffer is None or not hasattr(buffer, "read1"):
+		return lambda: stream.read(chunk_size)
+	# TextIOWrapper.read(n)는 n글자가 모이거나 EOF까지 기다리므로 바이트 버퍼의 read1을 직접 디코딩
+	decoder = codecs.getincrementaldecoder(stream.encoding or "utf-8")(stream.errors or "strict")
+
+	def read():
+		data = buffer.read1(chunk_size)
+		return decoder.decode(data, final=not data).replace("\r\n", "\n")
+	return read
+
+
+class StatementAssembler:
+	"""줄을 하나씩 받아 { } 깊이와 따옴표를 추적하며 완성된 문장을 조립
+
+	multiline_strings가 켜져 있으면 닫히지 않은 따옴표도 다음 줄로 이어진 것으로 보고,
+	이어지는 줄을 '\\n' 이스케이프로 붙여 줄바꿈이 들어간 문자열 하나로 만든다
+	(대화형 셸용. 파일 모드에서는 따옴표 실수가 나머지 파일을 삼키지 않도록 끔).
+	"""
+
+	def __init__(self, multiline_strings=False):
+		self.multiline_strings = multiline_strings
+		self.reset()
+
+	def reset(self):
+		self.depth = 0
+		self.in_quote = False
+		self.lines = []
+		self.start_line = 0
+		# -else가 아직 없는 -if 문장은 다음 줄이 -else인지 확인할 때까지 보류
+		self.held = False
+
+	@property
+	def pending(self):
+		"""여러 줄 문장이 아직 닫히지 않았는지 여부"""
+		return bool(self.lines) and not self.held
+
+	def _scan(self, line):
+		# 따옴표 안의 중괄호는 무시
+		depth = self.depth
+		in_quote = self.in_quote
+		escaped = False
+		for char in line:
+			if escaped:
+				escaped = False
+			elif in_quote:
+				if char == "\\":
+					escaped = True
+				elif char == '"':
+					in_quote = False
+			elif char == '"':
+				in_quote = True
+			elif char == "{":
+				depth += 1
+			elif char == "}":
+				depth = max(depth - 1, 0)
+		self.depth = depth
+		if self.multiline_strings:
+			self.in_quote = in_quote
+
+	def feed(self, line, line_no=0):
+		"""한 줄 추가, 완성된 (시작 줄 번호, 문장) 리스트 반환"""
+		if self.in_quote:
+			# 문자열 안: 공백/주석 처리 없이 앞 줄에 이어 붙임
+			line = line.rstrip("\r\n")
+			self._scan(line)
+			self.lines[-1] += "\\n" + line
+			return self._complete(self.lines[-1].lstrip())
+
+		stripped = line.strip()
+		if not stripped or stripped.startswith(COMMENT_PREFIXES):
+			# 문장 중간의 빈 줄/주석은 줄 번호 유지를 위해 빈 줄로 남김
+			if self.lines:
+				self.lines.append("")
+			return []
+
+		statements = []
+		if self.held:
+			self.held = False
+			if not stripped.startswith("-else"):
+				statements.append(self.flush())
+
+		if not self.lines:
+			self.start_line = line_no
+		if "{" in stripped or "}" in stripped or (self.multiline_strings and '"' in stripped):
+			self._scan(stripped)
+		self.lines.append(stripped)
+		statements.extend(self._complete(stripped))
+		return statements
+
+	def _complete(self, stripped):
+		# 깊이 0이고 따옴표가 닫혔으면 문장 완성 (-else를 받을 수 있는 -if 문장이면 보류)
+		if self.depth or self.in_quote:
+			return []
+		if stripped.endswith("}") and _takes_else(self.lines):
+			self.held = True
+			return []
+		return [self.flush()]
+
+	def flush(self):
+		"""남아 있는 (닫히지 않았을 수도 있는) 문장을 반환"""
+		if not self.lines:
+			return None
+		while not self.lines[-1]:
+			self.lines.pop()
+		statement = (self.start_line, "\n".join(self.lines))
+		self.reset()
+		return statement
+
+
+def _takes_else(lines):
+	"""블록 바깥의 단어에 -if가 있고 -else는 아직 없는 문장인지"""
+	words = []
+	depth = 0
+	in_quote = escaped = False
+	for line in lines:
+		word = ""
+		for char in line + " ":
+			if escaped:
+				escaped = False
+			elif in_quote:
+				if char == "\\":
+					escaped = True
+				elif char == '"':
+					in_quote = False
+			elif char == '"':
+				in_quote = True
+			elif char == "{":
+				depth += 1
+			elif char == "}":
+				depth = max(depth - 1, 0)
+			elif depth:
+				continue
+			elif char.isspace():
+				if word:
+					words.append(word)
+				word = ""
+			else:
+				word += char
+	return "-if" in words and "-else" not in words
+
+
+def iter_statements(stream, chunk_size=CHUNK_SIZE, waiting=None):
+	"""스트림에서 (시작 줄 번호, 문장 문자열)을 하나씩 생성"""
+	assembler = StatementAssembler()
+	for line_no, line in enumerate(iter_lines(stream, chunk_size, waiting), 1):
+		yield from assembler.feed(line, line_no)
+	statement = assembler.flush()
+	if statement is not None:
+		yield statement
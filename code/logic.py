@@ -1,14 +1,335 @@
-import sys
-from pyparsing import (
-    Word, alphas, alphanums, QuotedString, Literal, Optional, 
-    ZeroOrMore, Regex, pyparsing_common, Group, Suppress,
-    restOfLine, lineEnd
-)
+import re
+import time
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+import lexer
+from lexer import Lexer, LexError
 from constants import CommandList, ErrorCode
+from output import STDERR
+from predicate import compile_condition
+from optimizer import Optimizer
+from numeric import Numeric
+from resolver import Resolver
+
+
+class ParseError(Exception):
+    pass
+
+
+_WHITESPACE_RE = re.compile(r'"(?:\\.|[^"\\])*"|\s+')
+
+
+def _build_grammar():
+    """pyparsing 문법 객체 생성 (pyparsing 엔진을 처음 사용할 때 한 번만 호출)"""
+    from pyparsing import (
+        Word, alphas, alphanums, QuotedString, Literal, Optional, 
+        ZeroOrMore, OneOrMore, Regex, Group, Suppress,
+        ParserElement, Forward, Empty
+    )
+    ParserElement.enable_packrat()
+    
+    # 기본 요소 정의
+    identifier = Word(alphas + "_", alphanums + "_")
+    # 변수: $ + identifier를 하나의 토큰으로 합침
+    variable = Regex(r'\$[a-zA-Z_][a-zA-Z0-9_]*')
+    # 숫자는 원문 그대로 유지 (산술식에서 부호를 잃지 않도록)
+    number = Regex(r'[+-]?(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|[+-]?\d+(?:[eE][+-]?\d+)?')
+    arith_op = Regex(r'\*\*|[*/%()+]|-(?![a-zA-Z_])')
+    quoted_string = QuotedString('"', esc_char='\\')
+    
+    # 연산자
+    comparison_op = (
+        Literal("==") | Literal("!=") | 
+        Literal("<=") | Literal(">=") | 
+        Literal("<") | Literal(">")
+    )
+    logical_op = Literal("-and") | Literal("-or")
+    
+    # 값 (변수는 $를 포함해서 하나의 문자열로)
+    value_with_var = (variable | quoted_string | number | identifier)
+    
+    # 조건식 (단순 비교)
+    simple_condition = Group(
+        value_with_var("left") + 
+        comparison_op("op") + 
+        value_with_var("right")
+    )
+    
+    # 복합 조건식 (and/or 포함)
+    condition = simple_condition + ZeroOrMore(
+        logical_op("logical") + simple_condition
+    )
+    
+    # 문장 시작 위치의 줄 번호 (문장 첫 줄 기준 0부터)
+    line = Empty().set_parse_action(lambda s, loc, toks: [s.count("\n", 0, loc)])("line")
+    
+    # 블록 { 문장; 문장 ... } (문장 구분: 줄바꿈 또는 ';')
+    statement = Forward()
+    separator = Suppress(";")
+    block_content = Group(
+        Suppress("{") + ZeroOrMore(separator | Group(statement)) + Suppress("}")
+    )
+    
+    # if-else 문
+    if_stmt = (
+        line +
+        condition("condition") + 
+        Suppress("-if") + 
+        block_content("if_block") +
+        Optional(ZeroOrMore(separator) + Suppress("-else") + block_content("else_block"))
+    )
+    
+    # while 문
+    while_stmt = (
+        line +
+        condition("condition") + 
+        Suppress("-while") + 
+        block_content("while_block")
+    )
+    
+    # each 문: 이름 -each 범위|$리스트 [-parallel N] [-sum 이름] [-collect 이름] { ... }
+    each_option = Group(
+        Literal("-parallel") + (variable | number) |
+        (Literal("-sum") | Literal("-collect")) + identifier
+    )
+    each_stmt = (
+        line +
+        identifier("each_name") +
+        Suppress("-each") +
+        Group(OneOrMore(variable | number))("each_source") +
+        Group(ZeroOrMore(each_option))("each_options") +
+        block_content("each_block")
+    )
+    
+    # 일반 명령어: noun[:type] verb [args...]
+    noun_part = identifier("noun") + Optional(
+        Suppress(":") + identifier("adjective")
+    )
+    prep_flag = Literal("-in")
+    arg_value = variable | quoted_string | number | identifier | arith_op
+    
+    command = (
+        line +
+        noun_part + 
+        identifier("verb") + 
+        ZeroOrMore(prep_flag | arg_value)("args")
+    )
+    
+    # 전체 문법
+    statement <<= if_stmt | while_stmt | each_stmt | command
+    return statement
+
+
+_STATEMENT = None
+# pyparsing의 packrat 캐시는 전역이므로 문법 생성과 파싱을 한 스레드씩만
+_GRAMMAR_LOCK = threading.RLock()
+
+
+def _grammar():
+    global _STATEMENT
+    if _STATEMENT is None:
+        with _GRAMMAR_LOCK:
+            if _STATEMENT is None:
+                _STATEMENT = _build_grammar()
+    return _STATEMENT
+
+
+class ParseCache:
+    """정규화된 문장 문자열을 키로 하는 LRU 파싱 캐시"""
+    
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # 여러 Interpreter가 스레드에서 같은 캐시를 공유
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
+
+
+class FastParser:
+    """Lexer 토큰을 사용하는 재귀 하강 파서 (pyparsing 문법과 같은 AST 생성)"""
+    
+    _VALUE_KINDS = (lexer.VAR, lexer.STR, lexer.NUM, lexer.IDENT)
+    _ARG_KINDS = (lexer.PREP,) + _VALUE_KINDS + (lexer.ARITH,)
+    
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        # 토큰 위치 → 문장 첫 줄 기준 줄 번호
+        self.lines = None
+        if any(kind == lexer.SEMICOLON and value != ";" for kind, value in tokens):
+            self.lines = []
+            line = 0
+            for kind, value in tokens:
+                self.lines.append(line)
+                if kind == lexer.SEMICOLON:
+                    line += value.count("\n")
+    
+    def _line(self):
+        if self.lines is None or self.pos >= len(self.lines):
+            return 0
+        return self.lines[self.pos]
+    
+    @staticmethod
+    def parse(command_str):
+        parser = FastParser(Lexer.tokenize(command_str))
+        ast = parser._statement()
+        if parser.pos != len(parser.tokens):
+            parser._error("end of text")
+        return ast
+    
+    def _peek(self, offset=0):
+        index = self.pos + offset
+        if index < len(self.tokens):
+            return self.tokens[index][0]
+        return None
+    
+    def _error(self, expected):
+        if self.pos < len(self.tokens):
+            found = f"'{self.tokens[self.pos][1]}'"
+        else:
+            found = "end of text"
+        raise ParseError(f"Expected {expected}, found {found} (at token {self.pos})")
+    
+    def _expect(self, kind, value=None):
+        if self._peek() != kind or (value is not None and self.tokens[self.pos][1] != value):
+            self._error(value or kind)
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token[1]
+    
+    def _statement(self):
+        line = self._line()
+        if self._peek() in self._VALUE_KINDS and self._peek(1) == lexer.CMP:
+            condition = self._condition()
+            keyword = self._expect(lexer.KEYWORD)
+            if keyword == "-if":
+                if_block = self._block()
+                else_block = None
+                # '}' 다음 줄의 -else 허용
+                offset = 0
+                while self._peek(offset) == lexer.SEMICOLON:
+                    offset += 1
+                if self._peek(offset) == lexer.KEYWORD and self.tokens[self.pos + offset][1] == "-else":
+                    self.pos += offset + 1
+                    else_block = self._block()
+                return Parser._if_ast(condition, if_block, else_block, line)
+            if keyword == "-while":
+                return Parser._while_ast(condition, self._block(), line)
+            self.pos -= 1
+            self._error("'-if' or '-while'")
+        if (self._peek() == lexer.IDENT and self._peek(1) == lexer.KEYWORD
+                and self.tokens[self.pos + 1][1] == "-each"):
+            return self._each(line)
+        return self._command(line)
+    
+    def _each(self, line):
+        name = self._expect(lexer.IDENT)
+        self._expect(lexer.KEYWORD, "-each")
+        source = []
+        while self._peek() in (lexer.VAR, lexer.NUM):
+            source.append(self._value())
+        if not source:
+            self._error("range or $list")
+        options = []
+        while self._peek() == lexer.KEYWORD:
+            option = self.tokens[self.pos][1]
+            if option == "-parallel":
+                self.pos += 1
+                if self._peek() not in (lexer.VAR, lexer.NUM):
+                    self._error("worker count")
+                options.append((option, self._value()))
+            elif option in ("-sum", "-collect"):
+                self.pos += 1
+                options.append((option, self._expect(lexer.IDENT)))
+            else:
+                break
+        return Parser._each_ast(name, source, options, self._block(), line)
+    
+    def _value(self):
+        if self._peek() not in self._VALUE_KINDS:
+            self._error("value")
+        value = self.tokens[self.pos][1]
+        self.pos += 1
+        return value
+    
+    def _condition(self):
+        condition = [self._value(), self._expect(lexer.CMP), self._value()]
+        while self._peek() == lexer.LOGIC:
+            condition.append(self._expect(lexer.LOGIC))
+            condition.extend((self._value(), self._expect(lexer.CMP), self._value()))
+        return condition
+    
+    def _block(self):
+        self._expect(lexer.LBRACE)
+        block = []
+        while True:
+            kind = self._peek()
+            if kind == lexer.RBRACE:
+                self.pos += 1
+                return block
+            if kind == lexer.SEMICOLON:
+                self.pos += 1
+            elif kind is None:
+                self._error("'}'")
+            else:
+                ast = self._statement()
+                if ast is not None:
+                    block.append(ast)
+    
+    def _command(self, line=0):
+        noun = self._expect(lexer.IDENT)
+        adjective = None
+        if self._peek() == lexer.COLON:
+            self.pos += 1
+            adjective = self._expect(lexer.IDENT)
+        verb = self._expect(lexer.IDENT)
+        start = self.pos
+        while self._peek() in self._ARG_KINDS:
+            self.pos += 1
+        args = [value for _, value in self.tokens[start:self.pos]]
+        return Parser._command_ast(noun, adjective, verb, args, line)
 
 
 class Parser:
-    """pyparsing을 사용한 파서"""
+    """문장 파서 (기본: FastParser, 비교용: pyparsing)"""
+    
+    ENGINES = ("fast", "pyparsing")
+    engine = "fast"
+    cache = ParseCache()
     
     @staticmethod
     def _is_number(value):
@@ -19,136 +340,162 @@ class Parser:
             return False
     
     @staticmethod
-    def parse_command(command_str):
-        """명령어 문자열을 파싱"""
-        # 주석 처리
+    def set_engine(engine):
+        if engine not in Parser.ENGINES:
+            raise ValueError(f"Unknown parser engine '{engine}'")
+        Parser.engine = engine
+    
+    @staticmethod
+    def _normalize_space(match):
+        text = match.group(0)
+        if text.startswith('"'):
+            return text
+        newlines = text.count("\n")
+        return "\n" * newlines if newlines else " "
+    
+    @staticmethod
+    def normalize(command_str):
+        """따옴표 밖의 공백을 하나로 합쳐 캐시 키로 사용 (줄바꿈은 문장 구분자로 유지)"""
+        command_str = command_str.strip()
+        if "\n" in command_str:
+            command_str = "\n".join(
+                "" if line.strip().startswith(('//','##','cmt')) else line
+                for line in command_str.splitlines()
+            )
+        return _WHITESPACE_RE.sub(Parser._normalize_space, command_str).strip()
+    
+    @staticmethod
+    def parse(command_str, engine=None):
+        """문장 문자열을 AST로 변환 (정규화된 문장 단위로 캐시)"""
         if command_str.strip().startswith(('//','##','cmt')):
             return None
         
-        # 기본 요소 정의
-        identifier = Word(alphas + "_", alphanums + "_")
-        # 변수: $ + identifier를 하나의 토큰으로 합침
-        variable = Regex(r'\$[a-zA-Z_][a-zA-Z0-9_]*')
-        number = pyparsing_common.number()
-        quoted_string = QuotedString('"', escChar='\\')
-        
-        # 연산자
-        comparison_op = (
-            Literal("==") | Literal("!=") | 
-            Literal("<=") | Literal(">=") | 
-            Literal("<") | Literal(">")
-        )
-        logical_op = Literal("-and") | Literal("-or")
-        
-        # 값 (변수는 $를 포함해서 하나의 문자열로)
-        value_with_var = (variable | quoted_string | number | identifier)
-        
-        # 조건식 (단순 비교)
-        simple_condition = Group(
-            value_with_var("left") + 
-            comparison_op("op") + 
-            value_with_var("right")
-        )
-        
-        # 복합 조건식 (and/or 포함)
-        condition = simple_condition + ZeroOrMore(
-            logical_op("logical") + simple_condition
-        )
+        engine = engine or Parser.engine
+        # 상수 계산 결과가 최적화 수준/산술 모드/decimal 정밀도에 따라 다름
+        key = (engine, Optimizer.level, Numeric.mode, Numeric.precision, Parser.normalize(command_str))
+        ast = Parser.cache.get(key)
+        if ast is not None:
+            return ast
         
-        # 블록 { ... }
-        block_content = Suppress("{") + ZeroOrMore(
-            ~Literal("}") + (value_with_var | comparison_op | logical_op | Literal("-in"))
-        )("block") + Suppress("}")
-        
-        # if-else 문
-        if_stmt = (
-            condition("condition") + 
-            Suppress("-if") + 
-            block_content("if_block") +
-            Optional(Suppress("-else") + block_content("else_block"))
-        )
-        
-        # while 문
-        while_stmt = (
-            condition("condition") + 
-            Suppress("-while") + 
-            block_content("while_block")
-        )
-        
-        # 일반 명령어: noun[:type] verb [args...]
-        noun_part = identifier("noun") + Optional(
-            Suppress(":") + identifier("adjective")
-        )
-        prep_flag = Literal("-in")
-        arg_value = variable | quoted_string | number | identifier
-        
-        command = (
-            noun_part + 
-            identifier("verb") + 
-            ZeroOrMore(prep_flag | arg_value)("args")
-        )
+        if engine == "fast":
+            try:
+                ast = FastParser.parse(key[-1])
+            except (ParseError, LexError) as e:
+                STDERR.report(str(e), label="Parse error")
+                return None
+        else:
+            ast = Parser.to_ast(Parser.parse_command(Parser._pyparsing_source(key[-1])), None)
         
-        # 전체 문법
-        statement = if_stmt | while_stmt | command
+        if ast is not None:
+            ast = Resolver.resolve(Optimizer.optimize(ast))
+            Parser.cache.put(key, ast)
+        return ast
+    
+    @staticmethod
+    def compare_engines(command_str):
+        """두 엔진의 AST를 비교해 (일치 여부, fast AST, pyparsing AST) 반환"""
+        key = Parser.normalize(command_str)
+        try:
+            fast_ast = FastParser.parse(key)
+        except (ParseError, LexError):
+            fast_ast = None
+        try:
+            with _GRAMMAR_LOCK:
+                parsed = _grammar().parse_string(Parser._pyparsing_source(key), parse_all=True)
+            pyparsing_ast = Parser.to_ast(parsed, None)
+        except Exception:
+            pyparsing_ast = None
+        return fast_ast == pyparsing_ast, fast_ast, pyparsing_ast
+    
+    @staticmethod
+    def _pyparsing_source(key):
+        # pyparsing은 줄바꿈을 공백으로 건너뛰므로 ';' 구분자를 덧붙임 (줄 번호는 유지)
+        return key.replace("\n", "\n;")
+    
+    @staticmethod
+    def parse_command(command_str):
+        """명령어 문자열을 pyparsing으로 파싱"""
+        # 주석 처리
+        if command_str.strip().startswith(('//','##','cmt')):
+            return None
         
         try:
-            result = statement.parseString(command_str, parseAll=True)
-            return result
+            with _GRAMMAR_LOCK:
+                return _grammar().parse_string(command_str, parse_all=True)
         except Exception as e:
-            sys.stderr.write(f"Parse error: {e}\n")
+            STDERR.report(str(e), label="Parse error")
             return None
     
     @staticmethod
-    def to_ast(parsed, variables):
-        """pyparsing 결과를 AST로 변환"""
-        if parsed is None:
-            return None
-        
-        # if 문 처리
-        if "if_block" in parsed:
-            # condition을 평평한 리스트로 변환
-            condition_list = []
-            for item in parsed.condition:
-                if hasattr(item, '__iter__') and not isinstance(item, str):
-                    condition_list.extend(str(x) for x in item)
-                else:
-                    condition_list.append(str(item))
-            
-            return {
-                "type": "condition",
-                "condition": condition_list,
-                "if_block": list(parsed.if_block),
-                "else_block": list(parsed.else_block) if "else_block" in parsed else None
-            }
-        
-        # while 문 처리
-        if "while_block" in parsed:
-            # condition을 평평한 리스트로 변환
-            condition_list = []
-            for item in parsed.condition:
-                if hasattr(item, '__iter__') and not isinstance(item, str):
-                    condition_list.extend(str(x) for x in item)
-                else:
-                    condition_list.append(str(item))
-            
-            return {
-                "type": "while",
-                "condition": condition_list,
-                "block": list(parsed.while_block)
-            }
-        
-        # 일반 명령어 처리
+    def _flatten_condition(condition):
+        # condition을 평평한 리스트로 변환
+        condition_list = []
+        for item in condition:
+            if hasattr(item, '__iter__') and not isinstance(item, str):
+                condition_list.extend(str(x) for x in item)
+            else:
+                condition_list.append(str(item))
+        return condition_list
+    
+    @staticmethod
+    def _if_ast(condition, if_block, else_block, line=0):
+        """if_block / else_block: 이미 파싱된 하위 문장 AST 리스트"""
+        condition = Parser._flatten_condition(condition)
+        return {
+            "type": "condition",
+            "condition": condition,
+            "predicate": Condition.compile(condition),
+            "if_block": list(if_block),
+            "else_block": list(else_block) if else_block is not None else None,
+            "line": line
+        }
+    
+    @staticmethod
+    def _while_ast(condition, block, line=0):
+        """block: 이미 파싱된 하위 문장 AST 리스트"""
+        condition = Parser._flatten_condition(condition)
+        return {
+            "type": "while",
+            "condition": condition,
+            "predicate": Condition.compile(condition),
+            "block": list(block),
+            "line": line
+        }
+    
+    @staticmethod
+    def _each_ast(name, source, options, block, line=0):
+        """options: (플래그, 값) 목록, block: 이미 파싱된 하위 문장 AST 리스트"""
+        parallel = None
+        reductions = []
+        for flag, value in options:
+            if flag == "-parallel":
+                parallel = str(value)
+            else:
+                reductions.append((flag[1:], str(value)))
+        return {
+            "type": "each",
+            "name": str(name),
+            "source": [str(token) for token in source],
+            "parallel": parallel,
+            "reductions": reductions,
+            "block": list(block),
+            "line": line
+        }
+    
+    @staticmethod
+    def _command_ast(noun, adjective, verb, args, line=0):
         ast = {
-            "noun": parsed.noun,
-            "adjectives": [parsed.adjective] if "adjective" in parsed else [],
-            "verb": parsed.verb,
+            "noun": noun,
+            "adjectives": [adjective] if adjective is not None else [],
+            "verb": verb,
             "prep": [],
             "val": [],
-            "raw_args": []
+            "raw_args": [],
+            "line": line
         }
         
-        if "args" in parsed:
-            args = list(parsed.args)
+        if args:
+            args = list(args)
             ast["raw_args"] = args
             
             for arg in args:
@@ -163,125 +510,178 @@ class Parser:
             return None
         
         return ast
+    
+    @staticmethod
+    def _block_to_ast(block):
+        statements = (Parser.to_ast(statement, None) for statement in block)
+        return [ast for ast in statements if ast is not None]
+    
+    @staticmethod
+    def to_ast(parsed, variables):
+        """pyparsing 결과를 AST로 변환"""
+        if parsed is None:
+            return None
+        
+        # if 문 처리
+        if "if_block" in parsed:
+            return Parser._if_ast(
+                parsed.condition,
+                Parser._block_to_ast(parsed.if_block),
+                Parser._block_to_ast(parsed.else_block) if "else_block" in parsed else None,
+                parsed.line
+            )
+        
+        # while 문 처리
+        if "while_block" in parsed:
+            return Parser._while_ast(
+                parsed.condition,
+                Parser._block_to_ast(parsed.while_block),
+                parsed.line
+            )
+        
+        # each 문 처리
+        if "each_block" in parsed:
+            return Parser._each_ast(
+                parsed.each_name,
+                parsed.each_source,
+                parsed.each_options,
+                Parser._block_to_ast(parsed.each_block),
+                parsed.line
+            )
+        
+        # 일반 명령어 처리
+        return Parser._command_ast(
+            parsed.noun,
+            parsed.adjective if "adjective" in parsed else None,
+            parsed.verb,
+            parsed.args if "args" in parsed else None,
+            parsed.line
+        )
+
+
+# 반복 한도 경고 코드 (같은 반복문의 경고는 한 번만 출력되고 횟수로 요약됨)
+LOOP_LIMIT_WARNING = "W001"
 
 
 class Loop:
     @staticmethod
-    def execute_while(ast, variables, execute_func):
-        max_iterations = 1000
+    def execute_while(ast, variables, execute_func, resolve_func=None, test_func=None):
+        """-while 실행: 본문 문장의 핸들러를 미리 찾아 두고 조건/본문만 반복
+
+        test_func(predicate, variables): 조건 평가를 감싸는 함수 (프로파일러의 시간 측정용)
+        """
+        if "invariant" not in ast:
+            return Loop._run_while(ast, ast["predicate"], ast["block"], variables,
+                                   execute_func, resolve_func, test_func)
+        # 최적화된 반복문: 불변 조건은 시작 시점 값으로, 부분식은 첫 조건 통과 후 한 번 계산
+        predicate = Optimizer.enter_loop(ast, variables)
+        if "hoisting" not in ast:
+            return Loop._run_while(ast, predicate, ast["block"], variables,
+                                   execute_func, resolve_func, test_func)
+        hoisted = []
+        
+        def enter(variables):
+            block, names = Optimizer.hoist(ast, variables)
+            hoisted.extend(names)
+            return block
+        
+        try:
+            return Loop._run_while(ast, predicate, ast["block"], variables,
+                                   execute_func, resolve_func, test_func, enter)
+        finally:
+            for name in hoisted:
+                variables.pop(name, None)
+    
+    @staticmethod
+    def _run_while(ast, predicate, block, variables, execute_func, resolve_func, test_func=None, enter=None):
+        """enter(variables): 첫 조건 검사를 통과한 뒤 한 번 호출해 실행할 본문을 받음"""
+        if test_func is not None:
+            condition = predicate
+            predicate = lambda variables: test_func(condition, variables)
+        limits = variables.limits
+        max_iterations = limits.max_iterations or float("inf")
+        interval = max(limits.check_interval, 1)
+        
+        body = Loop._body(block, execute_func, resolve_func) if enter is None else None
+        line = ast.get("line", 0)
+        
         iterations = 0
+        start = time.perf_counter()
+        deadline = start + limits.time_limit if limits.time_limit else None
+        # 세션 마감 시각이 더 이르면 그때까지만
+        budget = limits.deadline
+        if budget is not None and (deadline is None or budget < deadline):
+            deadline = budget
+        next_check = interval
         
         while iterations < max_iterations:
-            result = Condition.evaluate_condition(
-                ast["condition"], 
-                variables
-            )
-            
-            if not result:
-                break
-            
-            # 블록 실행
-            block_tokens = ast["block"]
-            # 블록을 명령어 문자열로 재구성
-            block_str = " ".join(str(t) for t in block_tokens)
+            variables.offset = line
+            if not predicate(variables):
+                return None
+            if enter is not None:
+                body = Loop._body(enter(variables), execute_func, resolve_func)
+                enter = None
             
-            parsed = Parser.parse_command(block_str)
-            if parsed:
-                block_ast = Parser.to_ast(parsed, variables)
-                if block_ast:
-                    execute_func(block_ast, variables)
+            for handler, statement, offset in body:
+                variables.offset = offset
+                # 문장 하나의 에러는 보고만 하고 다음 문장으로 (Command.execute와 같이)
+                try:
+                    if handler(statement, variables) == "exit":
+                        return "exit"
+                except Exception as e:
+                    variables.out.flush()
+                    STDERR.report(str(e), label="Runtime Error during execution")
             
             iterations += 1
+            if deadline is not None and iterations == next_check:
+                next_check += interval
+                if time.perf_counter() > deadline:
+                    if limits.expired():
+                        # 세션 시간 예산 초과: 스크립트 전체를 중단
+                        Loop._report_stop(variables, "time budget", "session",
+                                          iterations, start, line)
+                        return "exit"
+                    Loop._report_stop(variables, "time limit", f"{limits.time_limit}s",
+                                      iterations, start, line)
+                    return None
         
-        if iterations >= max_iterations:
-            sys.stderr.write("Warning: Loop exceeded maximum iterations\n")
+        Loop._report_stop(variables, "maximum iterations", limits.max_iterations,
+                          iterations, start, line)
+        return None
+    
+    @staticmethod
+    def _body(block, execute_func, resolve_func):
+        # 본문 문장마다 실행 함수를 한 번만 결정
+        body = []
+        for statement in block:
+            handler = resolve_func(statement) if resolve_func else None
+            body.append((handler or execute_func, statement, statement.get("line", 0)))
+        return body
+    
+    @staticmethod
+    def _report_stop(variables, reason, limit, iterations, start, line=0):
+        elapsed = time.perf_counter() - start
+        # 경고는 본문의 마지막 문장이 아니라 -while 문장의 줄로
+        variables.offset = line
+        STDERR.report(
+            f"Loop exceeded {reason} ({limit})", LOOP_LIMIT_WARNING, severity="warning",
+            detail=f"stopped after {iterations} iterations in {elapsed:.3f}s"
+        )
 
 
 class Condition:
+    @staticmethod
+    def compile(condition_tokens):
+        """조건 토큰 리스트를 조건 트리(Predicate)로 컴파일"""
+        return compile_condition(condition_tokens)
+    
     @staticmethod
     def evaluate_condition(condition_tokens, variables):
-        """조건식 평가"""
-        # -and 처리
-        if '-and' in condition_tokens:
-            and_index = condition_tokens.index('-and')
-            left_condition = condition_tokens[:and_index]
-            right_condition = condition_tokens[and_index + 1:]
-            
-            left_result = Condition.evaluate_condition(left_condition, variables)
-            right_result = Condition.evaluate_condition(right_condition, variables)
-            
-            return left_result and right_result
-        
-        # -or 처리
-        elif '-or' in condition_tokens:
-            or_index = condition_tokens.index('-or')
-            left_condition = condition_tokens[:or_index]
-            right_condition = condition_tokens[or_index + 1:]
-            
-            left_result = Condition.evaluate_condition(left_condition, variables)
-            right_result = Condition.evaluate_condition(right_condition, variables)
-            
-            return left_result or right_result
-        
-        # 단순 비교
-        if len(condition_tokens) < 3:
-            return False
-        
-        left = str(condition_tokens[0])
-        operator = str(condition_tokens[1])
-        right = str(condition_tokens[2])
-        
-        # 변수 값 가져오기 ($ 처리)
-        if left.startswith("$"):
-            var_name = left[1:]
-            if var_name in variables:
-                left_value = variables[var_name]
-            else:
-                ErrorCode.VARIABLE_NOT_FOUND.print_error(var_name)
-                return False
-        else:
-            left_value = left
-        
-        if right.startswith("$"):
-            var_name = right[1:]
-            if var_name in variables:
-                right_value = variables[var_name]
-            else:
-                ErrorCode.VARIABLE_NOT_FOUND.print_error(var_name)
-                return False
-        else:
-            right_value = right
-        
-        # 숫자 비교
-        left_num = float(left_value) if Parser._is_number(str(left_value)) else None
-        right_num = float(right_value) if Parser._is_number(str(right_value)) else None
-        
-        if left_num is not None and right_num is not None:
-            if operator == "<":
-                return left_num < right_num
-            elif operator == ">":
-                return left_num > right_num
-            elif operator == "<=":
-                return left_num <= right_num
-            elif operator == ">=":
-                return left_num >= right_num
-            elif operator == "==":
-                return left_num == right_num
-            elif operator == "!=":
-                return left_num != right_num
-        else:
-            # 문자열 비교
-            if operator == "<":
-                return left_value < right_value
-            elif operator == ">":
-                return left_value > right_value
-            elif operator == "<=":
-                return left_value <= right_value
-            elif operator == ">=":
-                return left_value >= right_value
-            elif operator == "==":
-                return left_value == right_value
-            elif operator == "!=":
-                return left_value != right_value
-        
-        return False
\ No newline at end of file
+        """조건식 평가 (AST에 predicate가 없을 때만 사용)"""
+        return _compile_cached(tuple(str(t) for t in condition_tokens), Numeric.mode)(variables)
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(condition_tokens, mode):
+    # 산술 모드마다 리터럴 해석이 다르므로 모드도 키에 포함
+    return compile_condition(condition_tokens)
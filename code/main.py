@@ -1,9 +1,154 @@
 import sys
+import glob
+import argparse
+from logic import Parser
+import shell
 from shell import Run
+from output import OutputSink, STDERR
+from diagnostics import Diagnostics
+from profiler import Profiler
+from optimizer import Optimizer
+from numeric import Numeric
+from each import Each
+from compiler import Compiler
+from script_cache import ScriptCache
+from constants import VERSION
 
-if len(sys.argv) > 1:
-	filename = sys.argv[1]
-	Run.run_file(filename)
-else:
-	sys.stdout.write("Nature Shell ver 0.1.10.00\n")
-	Run.start()
\ No newline at end of file
+arg_parser = argparse.ArgumentParser(description="Nature Shell")
+arg_parser.add_argument("scripts", nargs="*", metavar="script",
+	help="script file(s) or glob pattern(s); several scripts run as a batch")
+arg_parser.add_argument("-j", "--jobs", type=int, metavar="N",
+	help="run a batch of scripts on N worker processes (0 = one per CPU)")
+arg_parser.add_argument("--tag", action="store_true",
+	help="in batch mode, prefix every output line with its script path")
+arg_parser.add_argument("--parser", choices=Parser.ENGINES, default=Parser.engine,
+	help="statement parser engine")
+arg_parser.add_argument("--check-parser", action="store_true",
+	help="parse the file with both engines and report AST differences")
+arg_parser.add_argument("-q", "--quiet", action="store_true",
+	help="suppress 'Variable ... created/changed' messages")
+arg_parser.add_argument("-o", "--output", metavar="FILE",
+	help="write script output to FILE instead of stdout")
+arg_parser.add_argument("--max-iterations", type=int, metavar="N",
+	help="stop a -while loop after N iterations (0 = unlimited, default 1000)")
+arg_parser.add_argument("--time-limit", type=float, metavar="SECONDS",
+	help="stop a -while loop after SECONDS of wall-clock time (0 = unlimited)")
+arg_parser.add_argument("--profile", action="store_true",
+	help="profile every statement and print a report to stderr on exit")
+arg_parser.add_argument("--no-cache", action="store_true",
+	help="do not read or write the compiled-script cache")
+arg_parser.add_argument("--cache-dir", metavar="DIR",
+	help="directory for compiled-script cache files (default: __nscache__ next to the script)")
+arg_parser.add_argument("--serve", action="store_true",
+	help="run a server on a Unix domain socket (use client.py to send scripts)")
+arg_parser.add_argument("--socket", metavar="PATH",
+	help="server socket path (default: $NSH_SOCKET or /tmp/nature-shell-<uid>.sock)")
+arg_parser.add_argument("--concurrency", type=int, default=4, metavar="N",
+	help="scripts the server runs at the same time (default 4)")
+arg_parser.add_argument("--time-budget", type=float, default=0.0, metavar="SECONDS",
+	help="stop a server request after SECONDS of wall-clock time (0 = unlimited)")
+arg_parser.add_argument("-O", type=int, choices=Optimizer.LEVELS, default=Optimizer.level,
+	dest="optimize", help="AST optimization level: -O0 off, -O1 constant folding, "
+	"dead-branch removal and loop-invariant hoisting (default)")
+arg_parser.add_argument("--numeric", choices=Numeric.MODES, default=Numeric.mode,
+	help="arithmetic mode: exact integers with float fractions (default), decimal fractions, "
+	"or float for everything; int and decimal variables always use their own type")
+arg_parser.add_argument("--decimal-precision", type=int, default=Numeric.precision, metavar="N",
+	help=f"significant digits of decimal arithmetic (default {Numeric.precision})")
+arg_parser.add_argument("--parallel-backend", choices=Each.BACKENDS, default=Each.backend,
+	help="workers of '-each ... -parallel N' loops: separate processes (default, uses every core) "
+	"or threads (no start-up cost, but one core for pure computation)")
+arg_parser.add_argument("--dump-optimized", action="store_true",
+	help="print the optimized program instead of running it")
+arg_parser.add_argument("--compile", action="store_true",
+	help="compile the script to a standalone Python module (-o FILE, default: script name with .py)")
+arg_parser.add_argument("--max-errors", type=int, metavar="N",
+	help="print at most N distinct diagnostics per script, then only count them "
+	"(0 = unlimited; default 100 for scripts, unlimited in the interactive shell)")
+arg_parser.add_argument("--fail-fast", action="store_true",
+	help="stop at the first error")
+arg_parser.add_argument("--diagnostics", choices=Diagnostics.FORMATS, default="text",
+	help="diagnostics format: text as they occur, or JSON lines on stderr at exit")
+args = arg_parser.parse_args()
+
+Parser.set_engine(args.parser)
+Optimizer.set_level(args.optimize)
+Numeric.set_mode(args.numeric)
+if args.decimal_precision < 1:
+	arg_parser.error("--decimal-precision must be at least 1")
+Numeric.set_precision(args.decimal_precision)
+Each.set_backend(args.parallel_backend)
+ScriptCache.enabled = not args.no_cache
+ScriptCache.directory = args.cache_dir
+if args.compile:
+	# -o는 실행 출력이 아니라 생성할 모듈 경로
+	if len(args.scripts) != 1:
+		arg_parser.error("--compile requires a single filename")
+	sys.exit(Compiler.compile_file(args.scripts[0], args.output))
+if args.output:
+	shell.variable.out = OutputSink.to_file(args.output)
+shell.variable.out.quiet = args.quiet
+if args.max_iterations is not None:
+	shell.variable.limits.max_iterations = max(args.max_iterations, 0)
+if args.time_limit is not None:
+	shell.variable.limits.time_limit = max(args.time_limit, 0.0)
+if args.profile:
+	shell.variable.profiler = Profiler(shell.Command.execute)
+
+batch_mode = len(args.scripts) > 1 or args.jobs is not None or any(
+	glob.has_magic(script) for script in args.scripts)
+
+if args.check_parser:
+	if len(args.scripts) != 1:
+		arg_parser.error("--check-parser requires a single filename")
+	sys.exit(Run.check_parser(args.scripts[0]))
+if args.dump_optimized:
+	if len(args.scripts) != 1:
+		arg_parser.error("--dump-optimized requires a single filename")
+	sys.exit(Run.dump(args.scripts[0]))
+if args.serve:
+	if args.scripts or args.profile:
+		arg_parser.error("--serve does not take scripts or --profile")
+	# 서버/배치 모듈(asyncio, 프로세스 풀)은 해당 모드에서만 불러옴
+	import client
+	import server
+	sys.exit(server.serve(args.socket or client.default_socket(), args.concurrency,
+		max(args.time_budget, 0.0), shell.variable.limits, args.quiet))
+if batch_mode and args.profile:
+	arg_parser.error("--profile is not supported in batch mode")
+
+# 배치 모드에서는 스크립트마다 shell.variable이 바뀌므로 출력 대상을 먼저 잡아 둠
+out = shell.variable.out
+status = 0
+try:
+	if batch_mode:
+		import batch
+		options = batch.BatchOptions(args.parser, args.quiet, shell.variable.limits,
+			not args.no_cache, args.cache_dir, args.optimize,
+			100 if args.max_errors is None else max(args.max_errors, 0),
+			args.fail_fast, args.diagnostics, args.numeric, args.decimal_precision, args.parallel_backend)
+		status = batch.main(args.scripts, options,
+			1 if args.jobs is None else args.jobs, args.tag, out)
+	else:
+		interactive = not args.scripts and sys.stdin.isatty()
+		max_errors = args.max_errors
+		if max_errors is None:
+			max_errors = 0 if interactive else 100
+		diagnostics = Diagnostics(max(max_errors, 0), args.fail_fast, args.diagnostics == "json",
+			args.scripts[0] if args.scripts else None).bind(shell.variable)
+		try:
+			with STDERR.redirect(sys.stderr, out, diagnostics):
+				if args.scripts:
+					status = Run.run_file(args.scripts[0])
+				else:
+					if interactive:
+						sys.stdout.write(f"Nature Shell ver {VERSION}\n")
+					status = Run.start()
+		finally:
+			out.flush()
+			sys.stderr.write(diagnostics.summary())
+finally:
+	out.close()
+	if args.profile and shell.variable.profiler is not None:
+		sys.stderr.write(shell.variable.profiler.report())
+sys.exit(status)
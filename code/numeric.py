@@ -0,0 +1,55 @@
+import decimal
+from decimal import Decimal
+
+
+class Numeric:
+	"""산술 모드 (프로세스 전역, Parser.engine / Optimizer.level처럼 실행 시작 시 한 번 설정)
+
+	- exact (기본): 정수끼리의 연산은 끝까지 파이썬 int (나누어떨어지는 나눗셈도 int라서
+	  2**53을 넘는 값도 정확), 소수는 float
+	- decimal: 소수 리터럴/값과 나누어떨어지지 않는 나눗셈을 Decimal로 (precision 자리)
+	- float: 모든 연산을 float로 (정수로 떨어지는 결과만 int로 되돌림, 예전 방식)
+
+	변수 타입이 모드보다 우선한다: int 변수에 대입하는 식은 정수 연산(나눗셈은 0 쪽으로
+	버림), decimal / float 변수에 대입하는 식은 그 타입의 연산으로 계산한다 (variant).
+	모드마다 식 트리가 다르므로 파싱 캐시와 스크립트 캐시의 키에 모드가 들어간다.
+	"""
+
+	MODES = ("exact", "decimal", "float")
+	mode = "exact"
+	precision = decimal.DefaultContext.prec
+
+	@staticmethod
+	def set_mode(mode):
+		if mode not in Numeric.MODES:
+			raise ValueError(f"Unknown numeric mode: {mode}")
+		Numeric.mode = mode
+
+	@staticmethod
+	def set_precision(precision):
+		"""Decimal 연산의 유효 자릿수 (새로 만드는 스레드도 DefaultContext를 복사해 같은 값을 씀)"""
+		if precision < 1:
+			raise ValueError(f"Invalid decimal precision: {precision}")
+		Numeric.precision = precision
+		decimal.DefaultContext.prec = precision
+		decimal.getcontext().prec = precision
+
+	@staticmethod
+	def variant(var_type):
+		"""대입 대상의 선언 타입에 맞는 식 변형 (None이면 모드 그대로의 식)"""
+		if var_type == "int":
+			return "int"
+		if var_type in ("decimal", "float") and var_type != Numeric.mode:
+			return var_type
+		return None
+
+
+def to_decimal(value):
+	"""Decimal로 변환 (float는 최단 표기를 써서 0.1 → Decimal('0.1'))"""
+	if isinstance(value, Decimal):
+		return value
+	if isinstance(value, float):
+		return Decimal(repr(value))
+	if isinstance(value, int):
+		return Decimal(int(value))
+	return Decimal(value.strip())
@@ -0,0 +1,487 @@
+from functools import lru_cache
+from constants import CommandList
+from expression import Num, VarRef, Neg, BinOp, ExpressionError, compile_expression, expression_names
+from predicate import Constant, CompareVarConst, CompareVarVar, And, Or, _MIRRORED, _compare, predicate_names
+from store import SYMBOLS, UNSET, format_value
+from numeric import Numeric
+
+
+# 값 부분을 산술식으로 컴파일하는 명령어 (PreProcessing._compile 사용)
+EXPRESSION_COMMANDS = {("var", "chg"), ("list", "map")}
+# 첫 인자(대상 변수)만 바꾸는 명령어 (noun → 해당 동사들, None이면 모든 동사)
+ASSIGNING_COMMANDS = {"var": ("crt", "chg"), "list": None}
+# 변수를 바꾸지 않는 명령어
+PURE_NOUNS = ("tmp", "sys")
+# 이 크기보다 큰 정수 거듭제곱은 실행 시점으로 미룸 (컴파일 시간/메모리 보호)
+_MAX_FOLDED_EXPONENT = 256
+
+
+class Optimizer:
+	"""파싱 직후 AST 최적화 (level 0: 끔, level 1: 모든 최적화)
+
+	- var chg / list map 식의 상수 부분 계산
+	- 리터럴끼리의 조건, -and/-or의 상수 항 정리
+	- 결과가 정해진 -if 분기 제거, 거짓으로 정해진 -while 제거 (-each는 본문만 최적화)
+	- 반복문 안에서 바뀌지 않는 변수만 쓰는 부분식은 첫 조건 검사를 통과한 뒤 한 번만
+	  계산하고 (hoist), 조건의 그런 부분은 반복 시작 시 값으로 바꿈 (enter_loop)
+	"""
+
+	LEVELS = (0, 1)
+	level = 1
+
+	@staticmethod
+	def set_level(level):
+		if level not in Optimizer.LEVELS:
+			raise ValueError(f"Unknown optimization level: {level}")
+		Optimizer.level = level
+
+	@staticmethod
+	def optimize(ast):
+		"""최상위 문장 AST 최적화 (새 AST를 반환하거나 그대로 반환)"""
+		if ast is None or not Optimizer.level:
+			return ast
+		counter = [0]
+		statements = _optimize_statement(ast, counter)
+		if len(statements) == 1:
+			# 안쪽 문장의 line은 최상위 문장 기준이므로 그대로 최상위에 올려도 됨
+			return statements[0]
+		# 분기가 정해진 최상위 -if / 없어진 -while: 남은 문장들을 항상 참인 조건문으로 묶음
+		return {
+			"type": "condition",
+			"condition": ast.get("condition", []),
+			"predicate": Constant(True),
+			"if_block": statements,
+			"else_block": None,
+			"line": ast.get("line", 0),
+		}
+
+	@staticmethod
+	def enter_loop(ast, variables):
+		"""반복 시작 시 호출: 바뀌지 않는 변수를 현재 값으로 넣은 조건 반환"""
+		return _specialize(ast["predicate"], ast["invariant"], variables)
+
+	@staticmethod
+	def hoist(ast, variables):
+		"""첫 조건 검사를 통과한 뒤 호출: (본문, 숨은 변수 이름들) 반환
+
+		끌어올린 부분식을 숨은 변수(%로 시작해 스크립트에서는 쓸 수 없는 이름)에 계산해
+		둔다. var chg는 대상 변수의 지금 선언 타입에 맞는 식 변형만 끌어올린다.
+		계산에 실패하면 원래 본문을 그대로 실행해 에러 보고 시점도 원래와 같게 한다.
+		"""
+		hoisting = ast.get("hoisting")
+		if not hoisting:
+			return ast["block"], ()
+		variants = tuple(None if target is None else Numeric.variant(_kind(variables, target.slot))
+			for _, target in hoisting)
+		# 선언 타입 조합마다 한 번만 만듦 (파싱 캐시의 AST는 공유하므로 AST 밖에 캐시)
+		hoisted, block = _cached_form(_Identity(ast), variants, Numeric.precision)
+		if not hoisted:
+			return ast["block"], ()
+		names = [name for name, _ in hoisted]
+		try:
+			for name, expression in hoisted:
+				variables[name] = expression.evaluate(variables)
+		except (ExpressionError, ArithmeticError, ValueError):
+			for name in names:
+				variables.pop(name, None)
+			return ast["block"], ()
+		return block, names
+
+	@staticmethod
+	def dump(ast, indent=""):
+		"""최적화된 AST를 사람이 읽을 수 있는 문장 형태로"""
+		if ast is None:
+			return []
+		kind = ast.get("type")
+		if kind == "condition":
+			lines = [f"{indent}{format_predicate(ast['predicate'])} -if {{"]
+			lines += _dump_block(ast["if_block"], indent)
+			if ast.get("else_block") is not None:
+				lines.append(f"{indent}}} -else {{")
+				lines += _dump_block(ast["else_block"], indent)
+			lines.append(f"{indent}}}")
+			return lines
+		if kind == "while":
+			# 끌어올린 부분식은 대상 변수에 선언 타입이 없을 때의 형태로 보여 줌
+			hoisted, block = _hoist_form(ast, (None,) * len(ast.get("hoisting", ())))
+			lines = [f"{indent}// hoist {name} = {expression!r}" for name, expression in hoisted]
+			invariant = sorted(ast.get("invariant", ()))
+			if invariant:
+				lines.append(f"{indent}// invariant in condition: {' '.join('$' + name for name in invariant)}")
+			lines.append(f"{indent}{format_predicate(ast['predicate'])} -while {{")
+			lines += _dump_block(block, indent)
+			lines.append(f"{indent}}}")
+			return lines
+		if kind == "each":
+			words = [ast["name"], "-each"] + ast["source"]
+			if ast.get("parallel") is not None:
+				words += ["-parallel", ast["parallel"]]
+			for reduction, name in ast["reductions"]:
+				words += ["-" + reduction, name]
+			lines = [f"{indent}{' '.join(words)} {{"]
+			lines += _dump_block(ast["block"], indent)
+			lines.append(f"{indent}}}")
+			return lines
+		head = ast["noun"] + "".join(":" + adjective for adjective in ast.get("adjectives", []))
+		args = [str(arg) for arg in ast.get("raw_args", [])]
+		if "expression" in ast:
+			args = args[:2] + [_format_expression(ast["expression"])]
+		return [f"{indent}{head} {ast['verb']} {' '.join(args)}".rstrip()]
+
+
+def _dump_block(block, indent):
+	lines = []
+	for statement in block:
+		lines += Optimizer.dump(statement, indent + "    ")
+	return lines
+
+
+def _format_expression(node):
+	text = repr(node)
+	# 바깥 괄호는 생략
+	if isinstance(node, BinOp):
+		return text[1:-1]
+	return text
+
+
+def format_predicate(predicate):
+	"""조건 트리를 조건식 문자열로"""
+	if isinstance(predicate, Constant):
+		return format_value(predicate.value)
+	if isinstance(predicate, CompareVarConst):
+		value = predicate.value
+		text = f'"{value}"' if isinstance(value, str) else format_value(value)
+		return f"${predicate.name} {predicate.op} {text}"
+	if isinstance(predicate, CompareVarVar):
+		return f"${predicate.left} {predicate.op} ${predicate.right}"
+	if isinstance(predicate, And):
+		return f"{format_predicate(predicate.left)} -and {format_predicate(predicate.right)}"
+	if isinstance(predicate, Or):
+		return f"{format_predicate(predicate.left)} -or {format_predicate(predicate.right)}"
+	return repr(predicate)
+
+
+def _canonical(ast):
+	noun = CommandList.noun_aliases.get(ast["noun"], ast["noun"])
+	verb = CommandList.verb_aliases.get(ast["verb"], ast["verb"])
+	return noun, verb
+
+
+# 상수 계산
+
+def fold_expression(node):
+	"""숫자끼리의 연산을 미리 계산 (에러가 나는 연산은 실행 시점에 보고되도록 그대로 둠)"""
+	if isinstance(node, BinOp):
+		left = fold_expression(node.left)
+		right = fold_expression(node.right)
+		if isinstance(left, Num) and isinstance(right, Num) and _foldable(node.op, right.value):
+			try:
+				return Num(node.func(left.value, right.value))
+			except (ExpressionError, ArithmeticError):
+				pass
+		if left is node.left and right is node.right:
+			return node
+		return BinOp(node.op, left, right, node.variant)
+	if isinstance(node, Neg):
+		operand = fold_expression(node.operand)
+		if isinstance(operand, Num):
+			return Num(-operand.value)
+		return node if operand is node.operand else Neg(operand)
+	return node
+
+
+def _foldable(op, right):
+	return op != "**" or not isinstance(right, int) or abs(right) <= _MAX_FOLDED_EXPONENT
+
+
+def fold_predicate(predicate):
+	"""-and/-or의 상수 항 정리 (조건을 평가하지 않게 되는 쪽만 제거해 에러 출력은 그대로)"""
+	if isinstance(predicate, (And, Or)):
+		left = fold_predicate(predicate.left)
+		right = fold_predicate(predicate.right)
+		return _combine(type(predicate), left, right)
+	return predicate
+
+
+def _combine(node_type, left, right):
+	# And(False, x) → False, And(True, x) → x, And(x, True) → x (Or는 반대)
+	absorbing = node_type is Or
+	if isinstance(left, Constant):
+		return left if bool(left.value) == absorbing else right
+	if isinstance(right, Constant) and bool(right.value) != absorbing:
+		return left
+	return node_type(left, right)
+
+
+def _optimize_statement(ast, counter):
+	"""문장 하나를 최적화해 그 자리에 들어갈 문장 리스트로 반환"""
+	kind = ast.get("type")
+	if kind == "condition":
+		predicate = fold_predicate(ast["predicate"])
+		if_block = _optimize_block(ast["if_block"], counter)
+		else_block = ast.get("else_block")
+		if else_block is not None:
+			else_block = _optimize_block(else_block, counter)
+		if isinstance(predicate, Constant):
+			return if_block if predicate.value else list(else_block or ())
+		optimized = dict(ast, predicate=predicate, if_block=if_block, else_block=else_block)
+		return [optimized]
+	if kind == "while":
+		predicate = fold_predicate(ast["predicate"])
+		if isinstance(predicate, Constant) and not predicate.value:
+			return []
+		optimized = dict(ast, predicate=predicate, block=_optimize_block(ast["block"], counter))
+		_hoist_loop(optimized, counter)
+		return [optimized]
+	if kind == "each":
+		# 반복마다 변수 복사본에서 실행하므로 본문을 -while처럼 끌어올리지 않음
+		return [dict(ast, block=_optimize_block(ast["block"], counter))]
+	if _canonical(ast) in EXPRESSION_COMMANDS:
+		return [_fold_command(ast)]
+	return [ast]
+
+
+def _optimize_block(block, counter):
+	optimized = []
+	for statement in block:
+		optimized += _optimize_statement(statement, counter)
+	return optimized
+
+
+def _fold_command(ast):
+	raw_args = ast.get("raw_args", [])
+	if len(raw_args) < 3 or raw_args[1] != "-in":
+		return ast
+	source = " ".join(str(v) for v in raw_args[2:]).strip('"')
+	try:
+		expression = compile_expression(source)
+	except ExpressionError:
+		# 에러는 실행할 때 보고
+		return ast
+	return dict(ast, expression=fold_expression(expression))
+
+
+# 반복문 불변식
+
+def _modified(block):
+	"""블록 안에서 값이 바뀔 수 있는 변수 이름 집합 (알 수 없는 명령어가 있으면 None)"""
+	names = set()
+	for statement in block:
+		kind = statement.get("type")
+		if kind == "condition":
+			for inner in (statement["if_block"], statement.get("else_block") or ()):
+				inner_names = _modified(inner)
+				if inner_names is None:
+					return None
+				names |= inner_names
+			continue
+		if kind == "while":
+			inner_names = _modified(statement["block"])
+			if inner_names is None:
+				return None
+			names |= inner_names
+			continue
+		if kind == "each":
+			# 본문의 변경은 복사본에서 일어나고 리덕션 대상만 바뀜
+			names.update(name for _, name in statement["reductions"])
+			continue
+		noun, verb = _canonical(statement)
+		if noun in PURE_NOUNS or (noun, verb) == ("var", "get"):
+			continue
+		if (noun, verb) == ("list", "add"):
+			# 제자리에서 바뀌므로 같은 리스트를 가리키는 다른 변수도 바뀔 수 있음
+			return None
+		if noun not in ASSIGNING_COMMANDS:
+			return None
+		verbs = ASSIGNING_COMMANDS[noun]
+		if verbs is not None and verb not in verbs:
+			return None
+		raw_args = statement.get("raw_args", [])
+		if raw_args:
+			names.add(str(raw_args[0]))
+	return names
+
+
+def _declared(block):
+	"""블록 안에서 다시 선언될 수 있는 (선언 타입이 바뀔 수 있는) 변수 이름 집합"""
+	names = set()
+	for statement in block:
+		kind = statement.get("type")
+		if kind == "condition":
+			names |= _declared(statement["if_block"]) | _declared(statement.get("else_block") or ())
+		elif kind == "while":
+			names |= _declared(statement["block"])
+		elif kind == "each":
+			names.update(name for reduction, name in statement["reductions"] if reduction == "collect")
+		else:
+			noun, verb = _canonical(statement)
+			raw_args = statement.get("raw_args", [])
+			if raw_args and ((noun, verb) == ("var", "crt") or noun == "list"):
+				names.add(str(raw_args[0]))
+	return names
+
+
+def _may_stop(statement):
+	"""문장이 (안쪽 블록까지 포함해) sys stop으로 실행을 끝낼 수 있는지"""
+	kind = statement.get("type")
+	if kind == "condition":
+		return any(_may_stop(s) for s in list(statement["if_block"]) + list(statement.get("else_block") or ()))
+	if kind in ("while", "each"):
+		return any(_may_stop(s) for s in statement["block"])
+	return _canonical(statement) == ("sys", "stop")
+
+
+def _hoist_loop(ast, counter):
+	modified = _modified(ast["block"])
+	if modified is None:
+		return
+	ast["invariant"] = frozenset(set(predicate_names(ast["predicate"])) - modified)
+	declared = _declared(ast["block"])
+	hoisting = []
+	# 반복마다 실행되는 문장(본문 바로 아래, sys stop이 있을 수 있는 문장까지)에서만 끌어올림
+	for index, statement in enumerate(ast["block"]):
+		if "expression" in statement and _hoistable(statement["expression"], modified):
+			if _canonical(statement) != ("var", "chg"):
+				hoisting.append((index, None))
+			elif str(statement["raw_args"][0]) not in declared:
+				# 대상의 선언 타입으로 식 변형을 고르므로 반복 중에 다시 선언되는 변수는 제외
+				hoisting.append((index, SYMBOLS.intern(str(statement["raw_args"][0]))))
+		if _may_stop(statement):
+			break
+	if hoisting:
+		ast["hoisting"] = hoisting
+		# 숨은 변수 이름은 반복문마다 달라야 안쪽 반복문이 끝날 때 바깥 것을 지우지 않음
+		ast["hoist_id"] = counter[0]
+		counter[0] += 1
+
+
+def _hoistable(node, modified):
+	if not isinstance(node, (BinOp, Neg)):
+		return False
+	names = expression_names(node)
+	if names and modified.isdisjoint(names):
+		return True
+	if isinstance(node, Neg):
+		return _hoistable(node.operand, modified)
+	return _hoistable(node.left, modified) or _hoistable(node.right, modified)
+
+
+def _kind(variables, slot):
+	try:
+		return variables.kinds[slot]
+	except IndexError:
+		return None
+
+
+class _Identity:
+	"""AST(dict)를 객체 자체로 비교하는 캐시 키 (캐시가 AST를 붙잡아 두므로 id가 다시 쓰이지 않음)"""
+
+	__slots__ = ("ast",)
+
+	def __init__(self, ast):
+		self.ast = ast
+
+	def __hash__(self):
+		return id(self.ast)
+
+	def __eq__(self, other):
+		return self.ast is other.ast
+
+
+@lru_cache(maxsize=1024)
+def _cached_form(key, variants, precision):
+	# decimal 변형의 상수 계산은 정밀도에 따라 다르므로 정밀도도 키에 포함
+	return _hoist_form(key.ast, variants)
+
+
+def _hoist_form(ast, variants):
+	"""대상 변수 선언 타입 조합 하나의 (끌어올린 (이름, 식) 목록, 본문)
+
+	variants: ast["hoisting"]의 문장마다 쓸 식 변형 (None이면 산술 모드의 식)
+	"""
+	modified = _modified(ast["block"])
+	block = list(ast["block"])
+	hoisted = []
+	shared = {}
+	prefix = f"%h{ast.get('hoist_id', 0)}_"
+	for (index, _), variant in zip(ast.get("hoisting", ()), variants):
+		statement = block[index]
+		if variant is None:
+			expression = _hoist_expression(statement["expression"], modified, hoisted, prefix, shared)
+			if expression is not statement["expression"]:
+				block[index] = dict(statement, expression=expression)
+			continue
+		# 타입이 있는 대상 변수용 식 변형 (PreProcessing._variant가 ast["variants"]에서 먼저 찾음)
+		source = " ".join(str(v) for v in statement["raw_args"][2:]).strip('"')
+		try:
+			expression = fold_expression(compile_expression(source, variant))
+		except ExpressionError:
+			continue
+		hoisted_expression = _hoist_expression(expression, modified, hoisted, prefix, shared)
+		if hoisted_expression is not expression:
+			block[index] = dict(statement, variants={variant: hoisted_expression})
+	return hoisted, block
+
+
+def _hoist_expression(node, modified, hoisted, prefix, shared):
+	if not isinstance(node, (BinOp, Neg)):
+		return node
+	names = expression_names(node)
+	if names and modified.isdisjoint(names):
+		# 같은 부분식은 반복문 전체에서 숨은 변수 하나를 같이 씀
+		# (exact와 int 변형에서 같은 연산만 쓰는 식은 변형과 관계없이)
+		key = (repr(node), None if _neutral(node) else _variant_of(node))
+		name = shared.get(key)
+		if name is None:
+			name = shared[key] = f"{prefix}{len(hoisted)}"
+			hoisted.append((name, node))
+		return VarRef(name)
+	if isinstance(node, Neg):
+		operand = _hoist_expression(node.operand, modified, hoisted, prefix, shared)
+		return node if operand is node.operand else Neg(operand)
+	left = _hoist_expression(node.left, modified, hoisted, prefix, shared)
+	right = _hoist_expression(node.right, modified, hoisted, prefix, shared)
+	if left is node.left and right is node.right:
+		return node
+	return BinOp(node.op, left, right, node.variant)
+
+
+def _variant_of(node):
+	while isinstance(node, Neg):
+		node = node.operand
+	return node.variant if isinstance(node, BinOp) else None
+
+
+def _neutral(node):
+	"""exact와 int 변형에서 같은 연산만 쓰는 식인지 (나눗셈/거듭제곱 없음)"""
+	if isinstance(node, BinOp):
+		return (node.variant in ("exact", "int") and node.op not in ("/", "**")
+			and _neutral(node.left) and _neutral(node.right))
+	if isinstance(node, Neg):
+		return _neutral(node.operand)
+	return True
+
+
+def _specialize(predicate, invariant, variables):
+	"""바뀌지 않는 변수를 현재 값으로 바꾼 조건 (변수가 없으면 원래대로 두어 에러도 원래대로)"""
+	if not invariant:
+		return predicate
+	if isinstance(predicate, CompareVarConst):
+		if predicate.name in invariant and variables.load(predicate.slot) is not UNSET:
+			return Constant(predicate(variables))
+		return predicate
+	if isinstance(predicate, CompareVarVar):
+		left = variables.load(predicate.left_slot) if predicate.left in invariant else UNSET
+		right = variables.load(predicate.right_slot) if predicate.right in invariant else UNSET
+		if left is not UNSET and right is not UNSET:
+			return Constant(_compare(predicate.func, left, right))
+		if right is not UNSET:
+			return CompareVarConst(predicate.left, predicate.op, right)
+		if left is not UNSET:
+			return CompareVarConst(predicate.right, _MIRRORED[predicate.op], left)
+		return predicate
+	if isinstance(predicate, (And, Or)):
+		return _combine(type(predicate),
+			_specialize(predicate.left, invariant, variables),
+			_specialize(predicate.right, invariant, variables))
+	return predicate
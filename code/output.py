@@ -0,0 +1,119 @@
+import io
+import sys
+import contextlib
+import contextvars
+from diagnostics import FailFast, format_message
+
+
+BUFFER_SIZE = 64 * 1024
+
+
+class OutputSink:
+	"""블록 단위로 모아서 쓰는 출력 버퍼 (flush 할 때만 실제 write)"""
+
+	def __init__(self, stream=None, buffer_size=BUFFER_SIZE, quiet=False):
+		# stream이 None이면 flush 시점의 sys.stdout 사용
+		self.stream = stream
+		self.buffer_size = buffer_size
+		self.quiet = quiet
+		self._chunks = []
+		self._size = 0
+
+	@staticmethod
+	def to_file(filename, buffer_size=BUFFER_SIZE, quiet=False):
+		return OutputSink(open(filename, "w", encoding="utf-8"), buffer_size, quiet)
+
+	@staticmethod
+	def to_memory(quiet=False):
+		return OutputSink(io.StringIO(), BUFFER_SIZE, quiet)
+
+	def write(self, text):
+		self._chunks.append(text)
+		self._size += len(text)
+		if self._size >= self.buffer_size:
+			self.flush()
+
+	def message(self, text):
+		"""'Variable ... created.' 같은 확인 메시지 (quiet 모드에서는 생략)"""
+		if not self.quiet:
+			self.write(text)
+
+	def flush(self):
+		if self._chunks:
+			stream = self.stream or sys.stdout
+			stream.write("".join(self._chunks))
+			self._chunks.clear()
+			self._size = 0
+		(self.stream or sys.stdout).flush()
+
+	def getvalue(self):
+		"""메모리 버퍼에 쓴 내용 반환"""
+		self.flush()
+		return self.stream.getvalue()
+
+	def close(self):
+		self.flush()
+		if self.stream not in (None, sys.stdout, sys.stderr):
+			self.stream.close()
+
+
+# 기본 출력 (표준 출력)
+STDOUT = OutputSink()
+
+
+class ErrorStream:
+	"""에러 메시지 출력 (기본은 sys.stderr, 세션마다 다른 스트림으로 바꿀 수 있음)
+
+	쓰기 전에 해당 세션의 출력 버퍼를 먼저 비워 출력 순서를 유지한다.
+	대상은 contextvars로 관리하므로 스레드/asyncio 작업마다 따로 지정된다.
+	"""
+
+	def __init__(self):
+		self._target = contextvars.ContextVar("error_target", default=None)
+
+	def write(self, text):
+		target = self._target.get()
+		if target is None:
+			STDOUT.flush()
+			sys.stderr.write(text)
+			return
+		out, stream, _ = target
+		if out is not None:
+			out.flush()
+		(stream or sys.stderr).write(text)
+
+	def report(self, message, code=None, severity="error", label=None, detail=None):
+		"""에러/경고 하나 출력 (세션에 Diagnostics가 있으면 거기서 줄 번호/중복/개수 처리)
+
+		detail: 메시지 뒤에 붙는, 발생할 때마다 달라지는 부분 (중복 판단에서 제외)
+		"""
+		if label is None:
+			label = "Warning" if severity == "warning" else "Error"
+		target = self._target.get()
+		diagnostics = target[2] if target is not None else None
+		if diagnostics is None:
+			self.write(format_message(label, code, f"{message}; {detail}" if detail else message) + "\n")
+			return
+		text = diagnostics.record(severity, message, code, label, detail)
+		if text:
+			self.write(text)
+		if diagnostics.fail_fast and severity == "error":
+			raise FailFast(message)
+
+	def diagnostics(self):
+		"""현재 세션의 Diagnostics (없으면 None)"""
+		target = self._target.get()
+		return target[2] if target is not None else None
+
+	@contextlib.contextmanager
+	def redirect(self, stream, out=None, diagnostics=None):
+		"""with 블록 안에서 에러를 stream으로 (out: 먼저 비울 출력 버퍼, diagnostics: 수집기)"""
+		token = self._target.set((out, stream, diagnostics))
+		try:
+			yield
+		finally:
+			self._target.reset(token)
+
+
+# 기본 에러 출력 (표준 에러)
+STDERR = ErrorStream()
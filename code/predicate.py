@@ -0,0 +1,202 @@
+import operator
+from decimal import Decimal
+from constants import ErrorCode
+from numeric import to_decimal
+from store import SYMBOLS, UNSET, parse_value, format_value
+
+
+COMPARISONS = {
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# 좌우를 바꿨을 때의 연산자 (5 > $i  →  $i < 5)
+_MIRRORED = {"<": ">", ">": "<", "<=": ">=", ">=": "<=", "==": "==", "!=": "!="}
+
+_NUMBER_TYPES = (int, float, Decimal)
+
+
+def _compare(func, left, right):
+    # 숫자끼리는 네이티브 값으로, 그 외에는 문자열로 비교
+    if isinstance(left, _NUMBER_TYPES) and isinstance(right, _NUMBER_TYPES):
+        if left.__class__ is Decimal and right.__class__ is float:
+            right = to_decimal(right)
+        elif right.__class__ is Decimal and left.__class__ is float:
+            left = to_decimal(left)
+        return func(left, right)
+    return func(format_value(left), format_value(right))
+
+
+class Predicate:
+    """조건식 트리 노드 (호출하면 bool 반환)"""
+
+    __slots__ = ()
+    _fields = ()
+
+    def _key(self):
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
+    def __reduce__(self):
+        # 슬롯 번호 같은 파생 속성은 저장하지 않고 생성자로 다시 계산
+        return (type(self), self._key())
+
+    def __repr__(self):
+        return f"{type(self).__name__}{self._key()!r}"
+
+
+class Constant(Predicate):
+    """리터럴끼리의 비교 (컴파일 시점에 결과 확정)"""
+
+    __slots__ = ("value",)
+    _fields = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, variables):
+        return self.value
+
+
+class CompareVarConst(Predicate):
+    """$var op 리터럴"""
+
+    __slots__ = ("name", "op", "value", "slot", "func", "numeric", "exact", "text")
+    _fields = ("name", "op", "value")
+
+    def __init__(self, name, op, value):
+        self.name = name
+        self.slot = SYMBOLS.intern(name).slot
+        self.op = op
+        self.value = value
+        self.func = COMPARISONS[op]
+        self.numeric = isinstance(value, _NUMBER_TYPES)
+        # Decimal 변수와 비교할 때 쓰는 값 (0.1 → Decimal('0.1'), float의 이진 근삿값이 아님)
+        self.exact = to_decimal(value) if value.__class__ is float else value
+        self.text = format_value(value)
+
+    def __call__(self, variables):
+        try:
+            left = variables.frame[self.slot]
+        except IndexError:
+            left = UNSET
+        if left is UNSET:
+            ErrorCode.VARIABLE_NOT_FOUND.print_error(self.name)
+            return False
+        if self.numeric and isinstance(left, _NUMBER_TYPES):
+            if left.__class__ is Decimal:
+                return self.func(left, self.exact)
+            return self.func(left, self.value)
+        return self.func(format_value(left), self.text)
+
+
+class CompareVarVar(Predicate):
+    """$var op $var"""
+
+    __slots__ = ("left", "op", "right", "left_slot", "right_slot", "func")
+    _fields = ("left", "op", "right")
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+        self.left_slot = SYMBOLS.intern(left).slot
+        self.right_slot = SYMBOLS.intern(right).slot
+        self.func = COMPARISONS[op]
+
+    def __call__(self, variables):
+        left = variables.load(self.left_slot)
+        if left is UNSET:
+            ErrorCode.VARIABLE_NOT_FOUND.print_error(self.left)
+            return False
+        right = variables.load(self.right_slot)
+        if right is UNSET:
+            ErrorCode.VARIABLE_NOT_FOUND.print_error(self.right)
+            return False
+        return _compare(self.func, left, right)
+
+
+class And(Predicate):
+    __slots__ = ("left", "right")
+    _fields = ("left", "right")
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def __call__(self, variables):
+        return self.left(variables) and self.right(variables)
+
+
+class Or(Predicate):
+    __slots__ = ("left", "right")
+    _fields = ("left", "right")
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def __call__(self, variables):
+        return self.left(variables) or self.right(variables)
+
+
+def _compile_comparison(tokens):
+    if len(tokens) != 3 or tokens[1] not in COMPARISONS:
+        return Constant(False)
+    left, op, right = (str(token) for token in tokens)
+    left_is_var = left.startswith("$")
+    right_is_var = right.startswith("$")
+
+    if left_is_var and right_is_var:
+        return CompareVarVar(left[1:], op, right[1:])
+    if left_is_var:
+        return CompareVarConst(left[1:], op, parse_value(right))
+    if right_is_var:
+        return CompareVarConst(right[1:], _MIRRORED[op], parse_value(left))
+    return Constant(_compare(COMPARISONS[op], parse_value(left), parse_value(right)))
+
+
+def _split(tokens, separator):
+    groups = [[]]
+    for token in tokens:
+        if token == separator:
+            groups.append([])
+        else:
+            groups[-1].append(token)
+    return groups
+
+
+def compile_condition(tokens):
+    """평평한 조건 토큰 리스트를 단락 평가하는 조건 트리로 컴파일
+
+    우선순위: -and가 -or보다 먼저 묶인다 (a -or b -and c == a -or (b -and c))
+    """
+    tokens = [str(token) for token in tokens]
+    predicate = None
+    for or_group in _split(tokens, "-or"):
+        term = None
+        for comparison in _split(or_group, "-and"):
+            node = _compile_comparison(comparison)
+            term = node if term is None else And(term, node)
+        predicate = term if predicate is None else Or(predicate, term)
+    return predicate
+
+
+def predicate_names(predicate):
+    """조건 트리가 읽는 변수 이름 리스트 (나온 순서대로)"""
+    if isinstance(predicate, CompareVarConst):
+        return [predicate.name]
+    if isinstance(predicate, CompareVarVar):
+        return [predicate.left, predicate.right]
+    if isinstance(predicate, (And, Or)):
+        return predicate_names(predicate.left) + predicate_names(predicate.right)
+    return []
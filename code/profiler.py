@@ -0,0 +1,94 @@
+import time
+from logic import Loop
+
+
+class Profiler:
+	"""문장 단위 프로파일러 (켜져 있을 때만 실행 경로에 들어감)
+
+	- 줄 번호별 / (noun, verb)별 호출 횟수, 누적 시간, 자기 시간
+	- 조건식(-if / -while) 평가 시간은 따로 기록
+	"""
+
+	def __init__(self, command_execute):
+		self.command_execute = command_execute
+		self.active = True
+		self.lines = {}
+		self.commands = {}
+		self.conditions = {}
+		self._stack = []
+
+	def execute(self, ast, variables):
+		if ast is None:
+			return None
+		line = variables.line + ast.get("line", 0)
+		kind = ast.get("type")
+		start = time.perf_counter()
+		self._stack.append(0.0)
+		try:
+			if kind == "condition":
+				variables.offset = ast.get("line", 0)
+				if self._test(ast["predicate"], variables, line, "-if"):
+					block = ast["if_block"]
+				else:
+					block = ast.get("else_block") or ()
+				for statement in block:
+					if self.execute(statement, variables) == "exit":
+						return "exit"
+				return None
+			if kind == "while":
+				# 반복 한도/시간 예산/에러 처리는 Loop와 같은 실행기로, 본문과 조건만 측정
+				return Loop.execute_while(ast, variables, self.execute, None,
+					lambda predicate, variables: self._test(predicate, variables, line, "-while"))
+			return self.command_execute(ast, variables)
+		finally:
+			child = self._stack.pop()
+			elapsed = time.perf_counter() - start
+			if kind is None:
+				label = f"{ast['noun']} {ast['verb']}"
+				self._record(self.commands, (ast["noun"], ast["verb"]), elapsed, elapsed - child)
+			elif kind == "each":
+				label = f"{ast['name']} -each " + " ".join(ast["source"])
+			else:
+				label = ("-if " if kind == "condition" else "-while ") + " ".join(ast["condition"])
+			self._record(self.lines, (line, label), elapsed, elapsed - child)
+			if self._stack:
+				self._stack[-1] += elapsed
+
+	def _test(self, predicate, variables, line, keyword):
+		start = time.perf_counter()
+		result = predicate(variables)
+		self._record(self.conditions, (line, keyword), time.perf_counter() - start, 0.0)
+		return result
+
+	@staticmethod
+	def _record(table, key, elapsed, self_time):
+		entry = table.get(key)
+		if entry is None:
+			table[key] = [1, elapsed, self_time]
+		else:
+			entry[0] += 1
+			entry[1] += elapsed
+			entry[2] += self_time
+
+	def report(self):
+		"""누적 시간 순으로 정렬한 보고서 문자열"""
+		out = ["Profile by line (sorted by total time)",
+			f"{'line':>6} {'calls':>10} {'total(s)':>12} {'self(s)':>12}  statement"]
+		for (line, label), (calls, total, self_time) in sorted(
+				self.lines.items(), key=lambda item: item[1][1], reverse=True):
+			out.append(f"{line:>6} {calls:>10} {total:>12.6f} {self_time:>12.6f}  {label}")
+
+		out.append("")
+		out.append("Profile by command")
+		out.append(f"{'noun verb':<20} {'calls':>10} {'total(s)':>12} {'self(s)':>12}")
+		for (noun, verb), (calls, total, self_time) in sorted(
+				self.commands.items(), key=lambda item: item[1][1], reverse=True):
+			out.append(f"{noun + ' ' + verb:<20} {calls:>10} {total:>12.6f} {self_time:>12.6f}")
+
+		out.append("")
+		out.append("Condition evaluation")
+		out.append(f"{'line':>6} {'kind':<8} {'calls':>10} {'total(s)':>12}")
+		for (line, keyword), (calls, total, _) in sorted(
+				self.conditions.items(), key=lambda item: item[1][1], reverse=True):
+			out.append(f"{line:>6} {keyword:<8} {calls:>10} {total:>12.6f}")
+		return "\n".join(out) + "\n"
@@ -0,0 +1,32 @@
+from constants import CommandList
+
+
+class CommandRegistry:
+	"""(noun, verb) → 처리 함수 테이블 (별칭 포함, 시작 시 한 번만 구성)"""
+
+	def __init__(self):
+		self.handlers = {}
+		self.nouns = set()
+
+	def register(self, noun, command_class, aliases=()):
+		"""command_class의 _verb 메서드를 noun(과 별칭)의 동사로 등록"""
+		nouns = (noun,) + tuple(aliases)
+		for name in dir(command_class):
+			if not name.startswith("_") or name.startswith("__"):
+				continue
+			handler = getattr(command_class, name)
+			if not callable(handler):
+				continue
+			verb = name[1:]
+			for each_noun in nouns:
+				self.handlers[(each_noun, verb)] = handler
+				for alias, canonical in CommandList.verb_aliases.items():
+					if canonical == verb:
+						self.handlers.setdefault((each_noun, alias), handler)
+		self.nouns.update(nouns)
+
+	def lookup(self, noun, verb):
+		return self.handlers.get((noun, verb))
+
+
+REGISTRY = CommandRegistry()
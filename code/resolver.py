@@ -0,0 +1,150 @@
+import re
+from constants import CommandList
+from expression import ExpressionError, compile_expression, expression_names
+from predicate import predicate_names
+from store import SYMBOLS, UNSET
+from output import STDERR
+
+_NAME_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*$')
+
+# 실행 전에 찾은, 아직 없는 변수를 읽는 곳 (실행되지 않는 분기일 수도 있으므로 경고)
+UNRESOLVED_WARNING = "W002"
+UNRESOLVED_MESSAGE = "Variable '{}' may be read before it is created"
+
+# 첫 인자(대상 변수)를 없으면 만드는 명령어 / 이미 있어야 하는 명령어
+_CREATING = {("var", "crt")} | {("list", verb) for verb in (
+	"crt", "rng", "get", "len", "slc", "map", "sum", "min", "max", "mean")}
+_UPDATING = {("var", "chg"), ("list", "add")}
+# 값 부분을 산술식으로 컴파일하는 명령어
+_EXPRESSIONS = {("var", "chg"), ("list", "map")}
+
+
+class Resolver:
+	"""파싱/최적화 직후의 이름 해석: 변수 이름을 인턴해 프레임 슬롯(Symbol)으로 AST에 보관
+
+	- var/list 명령의 대상 변수: ast["target"]
+	- tmp echo의 단어: ast["words"] ((Symbol 또는 None, 단어) 목록)
+	- var chg / list map의 식: ast["expression"] (VarRef가 슬롯을 가짐)과
+	  그 식 문자열 ast["expression_source"] (선언 타입별 식 변형을 만들 때 씀)
+	- 조건의 변수는 조건 트리를 만들 때 이미 슬롯을 찾아 둠
+	- 최상위 문장: ast["unresolved"] (문장 안에서 만들지 않고 읽기만 하는 변수와 그 줄)
+
+	실행할 때는 이름으로 찾지 않고 슬롯 번호로 프레임을 바로 읽는다. AST에 쓰는 것은
+	파싱할 때뿐이다 (파싱 캐시의 AST는 여러 Interpreter가 공유하므로 실행 중에는 읽기만 함).
+	"""
+
+	@staticmethod
+	def resolve(ast):
+		if ast is None:
+			return None
+		reads = {}
+		writes = set()
+		Resolver._statement(ast, reads, writes)
+		ast["unresolved"] = tuple(
+			(SYMBOLS.intern(name), line) for name, line in reads.items() if name not in writes)
+		return ast
+
+	@staticmethod
+	def check(ast, variables, reported):
+		"""최상위 문장 실행 전: 아직 없는 변수를 읽는 곳을 스크립트에서 이름마다 한 번 경고
+
+		그 곳이 실제로 실행될 때 나는 에러(E001)는 실행 중에 따로 보고된다.
+		"""
+		if ast is None:
+			return
+		for symbol, line in ast.get("unresolved", ()):
+			if symbol.name in reported or variables.load(symbol.slot) is not UNSET:
+				continue
+			reported.add(symbol.name)
+			variables.offset = line
+			STDERR.report(UNRESOLVED_MESSAGE.format(symbol.name), UNRESOLVED_WARNING, "warning")
+
+	@staticmethod
+	def target(ast):
+		"""명령어 대상 변수의 Symbol (해석되지 않은 AST면 지금 찾음)"""
+		symbol = ast.get("target")
+		if symbol is None:
+			raw_args = ast.get("raw_args") or ast.get("val")
+			symbol = SYMBOLS.intern(str(raw_args[0]))
+		return symbol
+
+	@staticmethod
+	def words(ast):
+		"""tmp echo 단어마다 (변수면 Symbol, 아니면 None, 원래 단어)"""
+		words = ast.get("words")
+		if words is None:
+			words = tuple((Resolver._word_symbol(str(word)), str(word)) for word in ast["val"])
+		return words
+
+	@staticmethod
+	def _word_symbol(word):
+		# 같은 이름의 변수가 있으면 그 값, $이름은 변수가 없으면 단어 그대로 출력
+		name = word[1:] if word.startswith("$") else word
+		return SYMBOLS.intern(name) if _NAME_RE.match(name) else None
+
+	@staticmethod
+	def _statement(ast, reads, writes):
+		line = ast.get("line", 0)
+		kind = ast.get("type")
+		if kind in ("condition", "while"):
+			for name in predicate_names(ast["predicate"]):
+				reads.setdefault(name, line)
+			if kind == "condition":
+				blocks = (ast["if_block"], ast.get("else_block") or ())
+			else:
+				blocks = (ast["block"],)
+			for block in blocks:
+				for statement in block:
+					Resolver._statement(statement, reads, writes)
+			return
+		if kind == "each":
+			# 범위/리스트, 작업자 수, -sum 대상은 읽고 반복 변수와 -collect 대상은 만듦
+			for token in ast["source"] + [ast.get("parallel") or ""]:
+				if token.startswith("$"):
+					reads.setdefault(token[1:], line)
+			for reduction, name in ast["reductions"]:
+				if reduction == "sum":
+					reads.setdefault(name, line)
+				else:
+					writes.add(name)
+			writes.add(ast["name"])
+			for statement in ast["block"]:
+				Resolver._statement(statement, reads, writes)
+			return
+
+		noun = CommandList.noun_aliases.get(ast["noun"], ast["noun"])
+		verb = CommandList.verb_aliases.get(ast["verb"], ast["verb"])
+		if (noun, verb) == ("tmp", "echo"):
+			ast["words"] = Resolver.words(ast)
+			return
+		if (noun, verb) == ("var", "get"):
+			if ast["val"]:
+				ast["target"] = Resolver.target(ast)
+				reads.setdefault(ast["target"].name, line)
+			return
+		raw_args = ast.get("raw_args")
+		if not raw_args or (noun, verb) not in _CREATING | _UPDATING:
+			return
+
+		ast["target"] = Resolver.target(ast)
+		name = ast["target"].name
+		if (noun, verb) in _CREATING:
+			writes.add(name)
+		else:
+			reads.setdefault(name, line)
+		if len(raw_args) < 3 or raw_args[1] != "-in":
+			return
+		if (noun, verb) in _EXPRESSIONS:
+			source = ast["expression_source"] = " ".join(str(v) for v in raw_args[2:]).strip('"')
+			expression = ast.get("expression")
+			if expression is None:
+				try:
+					expression = ast["expression"] = compile_expression(source)
+				except ExpressionError:
+					# 에러는 실행할 때 보고
+					return
+			names = expression_names(expression)
+		else:
+			names = [str(token).strip('"')[1:] for token in raw_args[2:] if str(token).strip('"').startswith("$")]
+		for read in names:
+			reads.setdefault(read, line)
@@ -0,0 +1,169 @@
+import os
+import sys
+import pickle
+import hashlib
+import threading
+from constants import VERSION
+from optimizer import Optimizer
+from numeric import Numeric
+
+
+CACHE_DIRNAME = "__nscache__"
+CACHE_FORMAT = 6
+_MAGIC = b"NSCC"
+_DIGEST_SIZE = hashlib.sha256().digest_size
+_CHUNK_SIZE = 64 * 1024
+
+
+class ScriptCache:
+	"""파싱/컴파일된 문장 스트림을 디스크에 저장하는 캐시 (__pycache__와 비슷)
+
+	파일 구성: 헤더 → (줄 번호, AST) 레코드들 → 종료 표시(None) → 앞부분 전체의 sha256
+	헤더의 스크립트 해시/버전이 다르거나 파일이 손상되었으면 사용하지 않는다.
+	"""
+
+	enabled = True
+	# None이면 스크립트 옆의 __nscache__ 디렉터리
+	directory = None
+
+	def __init__(self, filename):
+		self.filename = filename
+		self.source_hash = ScriptCache.hash_source(filename)
+		base = os.path.basename(filename)
+		directory = ScriptCache.directory or os.path.join(
+			os.path.dirname(os.path.abspath(filename)), CACHE_DIRNAME
+		)
+		# 최적화 수준/산술 모드마다 AST가 다르므로 파일을 따로 둠 (.pyc의 opt-N과 비슷)
+		# decimal 모드는 상수 계산 결과가 정밀도에 따라 다르므로 정밀도도 구분
+		mode = "" if Numeric.mode == "exact" else f".{Numeric.mode}"
+		if Numeric.mode == "decimal":
+			mode += str(Numeric.precision)
+		self.path = os.path.join(directory, f"{base}.nsc-{VERSION}.O{Optimizer.level}{mode}.nscc")
+
+	@staticmethod
+	def hash_source(filename):
+		digest = hashlib.sha256()
+		digest.update(f"{VERSION}:{CACHE_FORMAT}:".encode())
+		with open(filename, "rb") as f:
+			for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+				digest.update(chunk)
+		return digest.hexdigest()
+
+	def _header(self):
+		return {
+			"magic": _MAGIC,
+			"format": CACHE_FORMAT,
+			"version": VERSION,
+			"optimize": Optimizer.level,
+			"numeric": Numeric.mode,
+			"precision": Numeric.precision if Numeric.mode == "decimal" else None,
+			"python": sys.implementation.cache_tag,
+			"source_hash": self.source_hash,
+		}
+
+	def _verify_digest(self):
+		size = os.path.getsize(self.path)
+		if size <= _DIGEST_SIZE:
+			return False
+		digest = hashlib.sha256()
+		remaining = size - _DIGEST_SIZE
+		with open(self.path, "rb") as f:
+			while remaining:
+				chunk = f.read(min(_CHUNK_SIZE, remaining))
+				if not chunk:
+					return False
+				digest.update(chunk)
+				remaining -= len(chunk)
+			return f.read() == digest.digest()
+
+	def load(self):
+		"""유효한 캐시면 (줄 번호, AST) 생성기, 없거나 오래되었거나 손상되었으면 None"""
+		try:
+			if not self._verify_digest():
+				return None
+			f = open(self.path, "rb")
+		except OSError:
+			return None
+
+		try:
+			if pickle.load(f) != self._header():
+				f.close()
+				return None
+		except Exception:
+			f.close()
+			return None
+		return self._records(f)
+
+	@staticmethod
+	def _records(f):
+		# 레코드마다 따로 언피클 (하나의 Unpickler는 memo로 읽은 AST를 모두 붙잡고 있음)
+		with f:
+			while True:
+				record = pickle.load(f)
+				if record is None:
+					return
+				yield record
+
+	def writer(self):
+		return CacheWriter(self)
+
+
+class CacheWriter:
+	"""문장을 실행하면서 레코드를 하나씩 임시 파일에 기록, commit 시 교체"""
+
+	def __init__(self, cache):
+		self.cache = cache
+		self.file = None
+		self.digest = hashlib.sha256()
+		try:
+			os.makedirs(os.path.dirname(cache.path), exist_ok=True)
+			self.temp_path = f"{cache.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+			self.file = open(self.temp_path, "wb")
+		except OSError:
+			self.file = None
+			return
+		self._dump(cache._header())
+
+	def _dump(self, record):
+		# 레코드마다 따로 피클 (Pickler를 계속 쓰면 memo가 기록한 AST를 모두 붙잡고 있어
+		# 긴 스크립트에서 메모리가 계속 늘어남, 레코드 안의 공유 객체는 그대로 한 번만 저장)
+		pickle.dump(record, self, protocol=pickle.HIGHEST_PROTOCOL)
+
+	def write(self, data):
+		# Pickler가 쓰는 바이트를 파일과 해시에 동시에 반영
+		self.digest.update(data)
+		self.file.write(data)
+
+	def add(self, line_no, ast):
+		if self.file is None:
+			return
+		if ast is None:
+			# 파싱 에러가 있는 스크립트는 캐시하지 않음 (다음 실행에서도 에러를 보여야 함)
+			self.discard()
+			return
+		try:
+			self._dump((line_no, ast))
+		except Exception:
+			self.discard()
+
+	def commit(self):
+		if self.file is None:
+			return
+		try:
+			self._dump(None)
+			self.file.write(self.digest.digest())
+			self.file.close()
+			os.replace(self.temp_path, self.cache.path)
+		except Exception:
+			self.discard()
+		self.file = None
+
+	def discard(self):
+		if self.file is None:
+			return
+		try:
+			self.file.close()
+			os.remove(self.temp_path)
+		except OSError:
+			pass
+		self.file = None
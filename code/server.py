@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from interpreter import Interpreter
+from output import OutputSink
+from store import LoopLimits
+
+# 실행 중인 스크립트의 출력을 이 크기마다 클라이언트로 전송
+STREAM_BUFFER_SIZE = 4 * 1024
+# 시간 예산을 넘겨 중단된 요청의 종료 상태 (timeout 명령과 같은 값)
+TIMEOUT_STATUS = 124
+
+
+class _QueueStream:
+	"""작업 스레드에서 쓴 텍스트를 이벤트 루프의 큐로 넘기는 스트림"""
+
+	def __init__(self, loop, queue, name):
+		self.loop = loop
+		self.queue = queue
+		self.name = name
+
+	def write(self, text):
+		if text:
+			self.loop.call_soon_threadsafe(self.queue.put_nowait, {self.name: text})
+
+	def flush(self):
+		pass
+
+	def close(self):
+		pass
+
+
+class ScriptServer:
+	"""Unix 도메인 소켓으로 스크립트 실행 요청을 받는 서버
+
+	요청: JSON 한 줄 ({"source": 스크립트 문자열} 또는 {"path": 파일 경로}, "quiet" 선택)
+	응답: {"stdout": ...} / {"stderr": ...}를 실행 중에 계속 보내고 마지막에 {"status": N}
+
+	파싱 캐시와 스크립트 캐시는 프로세스에 계속 남아 있고, 연결마다 새 Interpreter
+	(독립된 변수 저장소)를 만든다. 동시에 실행하는 요청 수는 concurrency로 제한하고,
+	time_budget(초)이 있으면 요청마다 그 시간이 지나면 실행을 중단한다.
+	"""
+
+	def __init__(self, socket_path, concurrency=4, time_budget=0.0, limits=None, quiet=False):
+		self.socket_path = socket_path
+		self.concurrency = max(concurrency, 1)
+		self.time_budget = time_budget
+		self.limits = limits if limits is not None else LoopLimits()
+		self.quiet = quiet
+		self.executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="nsh")
+		self.semaphore = None
+
+	async def serve_forever(self):
+		self.semaphore = asyncio.Semaphore(self.concurrency)
+		if os.path.exists(self.socket_path):
+			# 이전 서버가 남긴 소켓 파일
+			os.remove(self.socket_path)
+		server = await asyncio.start_unix_server(self.handle, path=self.socket_path)
+		# SIGTERM에도 소켓 파일을 지우고 종료
+		asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+		sys.stderr.write(f"Nature Shell server listening on {self.socket_path}\n")
+		try:
+			async with server:
+				await server.serve_forever()
+		finally:
+			self.executor.shutdown(wait=False, cancel_futures=True)
+			if os.path.exists(self.socket_path):
+				os.remove(self.socket_path)
+
+	async def handle(self, reader, writer):
+		try:
+			try:
+				request = json.loads(await reader.readline())
+				if not isinstance(request, dict) or not ("source" in request or "path" in request):
+					raise ValueError("expected 'source' or 'path'")
+			except ValueError as e:
+				await self._send(writer, {"stderr": f"Error: Invalid request ({e})\n"})
+				await self._send(writer, {"status": 2})
+				return
+
+			async with self.semaphore:
+				status = await self._run(request, writer)
+			await self._send(writer, {"status": status})
+		except ConnectionError:
+			pass
+		finally:
+			writer.close()
+
+	async def _run(self, request, writer):
+		loop = asyncio.get_running_loop()
+		queue = asyncio.Queue()
+		quiet = bool(request.get("quiet", self.quiet))
+		interpreter = Interpreter(
+			OutputSink(_QueueStream(loop, queue, "stdout"), STREAM_BUFFER_SIZE, quiet),
+			_QueueStream(loop, queue, "stderr"),
+			self.limits.copy(),
+		)
+
+		future = loop.run_in_executor(self.executor, self._execute, interpreter, request)
+		# 작업이 끝나면 (그 전에 보낸 출력 뒤에) 종료 표시
+		future.add_done_callback(lambda _: queue.put_nowait(None))
+		try:
+			while True:
+				message = await queue.get()
+				if message is None:
+					break
+				await self._send(writer, message)
+		except ConnectionError:
+			# 클라이언트가 끊었으면 다음 검사 시점에 실행을 멈추도록
+			interpreter.limits.deadline = 0.0
+			await asyncio.gather(future, return_exceptions=True)
+			raise
+		try:
+			return await future
+		except Exception as e:
+			await self._send(writer, {"stderr": f"Error: {e}\n"})
+			return 1
+
+	def _execute(self, interpreter, request):
+		if self.time_budget:
+			interpreter.limits.deadline = time.perf_counter() + self.time_budget
+		if "path" in request:
+			interpreter.diagnostics.source = request["path"]
+			status = interpreter.run_file(request["path"])
+		else:
+			status = interpreter.execute(request["source"])
+		interpreter.summarize()
+		if self.time_budget and interpreter.limits.expired():
+			return TIMEOUT_STATUS
+		return status
+
+	@staticmethod
+	async def _send(writer, message):
+		writer.write(json.dumps(message).encode("utf-8") + b"\n")
+		await writer.drain()
+
+
+def serve(socket_path, concurrency=4, time_budget=0.0, limits=None, quiet=False):
+	server = ScriptServer(socket_path, concurrency, time_budget, limits, quiet)
+	try:
+		asyncio.run(server.serve_forever())
+	except (KeyboardInterrupt, asyncio.CancelledError):
+		pass
+	return 0
@@ -1,260 +1,290 @@
+import io
+import os
 import sys
-from logic import Parser, Condition, Loop
-from constants import ErrorCode, CommandList
+from functools import lru_cache
+from decimal import DecimalException, Overflow as DecimalOverflow
+from logic import Parser, Loop
+from each import Each
+from resolver import Resolver
+from constants import ErrorCode
+from registry import REGISTRY
+from profiler import Profiler
+from optimizer import Optimizer, fold_expression
+from numeric import Numeric
+from script_cache import ScriptCache
+from loader import iter_statements, StatementAssembler
+from output import STDERR
+from diagnostics import FailFast
+from store import VariableStore, ConversionError, UNSET, format_value, parse_value, is_numeric
+from lists import ListValue, ListError, merge_signs
+from expression import compile_expression, evaluate, ExpressionError, UndefinedVariable
 
 
-variable = {}
+variable = VariableStore()
 
 class Command: 
 	@staticmethod
 	def execute(ast, variables):
 		if ast is None:
 			return
+		# 에러 메시지의 줄 번호용 (최상위 문장 기준 오프셋)
+		variables.offset = ast.get("line", 0)
 
 		# 조건문 처리
 		if ast.get("type") == "condition":
-			result = Condition.evaluate_condition(ast["condition"], variables)
+			result = ast["predicate"](variables)
 			
 			if result:
-				if_block = ast["if_block"]
-				block_str = " ".join(str(t) for t in if_block)
-				parsed = Parser.parse_command(block_str)
-				if parsed:
-					block_ast = Parser.to_ast(parsed, variables)
-					if block_ast:
-						Command.execute(block_ast, variables)
+				block = ast["if_block"]
 			else:
-				if ast.get("else_block"):
-					else_block = ast["else_block"]
-					block_str = " ".join(str(t) for t in else_block)
-					parsed = Parser.parse_command(block_str)
-					if parsed:
-						block_ast = Parser.to_ast(parsed, variables)
-						if block_ast:
-							Command.execute(block_ast, variables)
+				block = ast.get("else_block") or ()
+			
+			for statement in block:
+				if Command.execute(statement, variables) == "exit":
+					return "exit"
 			return
 		
 		# while 문 처리
 		elif ast.get("type") == "while":
-			Loop.execute_while(ast, variables, Command.execute)
-			return
-
-		# 일반 명령어 처리
-		noun = ast["noun"]
-		verb = ast["verb"]
+			return Loop.execute_while(ast, variables, Command.execute, Command.resolve)
 
-		class_name = noun.capitalize()
-		method_name = "_" + verb
+		# each 문 처리
+		elif ast.get("type") == "each":
+			items = PreProcessing._each_items(ast, variables)
+			workers = PreProcessing._each_workers(ast, variables)
+			if items is None or workers is None:
+				return None
+			return Each.execute(ast, variables, Command.execute, items, workers)
 
-		if noun not in CommandList.noun_list:
-			ErrorCode.UNKNOWN_COMMAND.print_error(noun)
+		# 일반 명령어 처리 (반복문 본문은 Loop._body가 반복 시작 시 한 번만 찾음)
+		handler = Command.resolve(ast)
+		if handler is None:
+			noun = ast["noun"]
+			if noun not in REGISTRY.nouns:
+				ErrorCode.UNKNOWN_COMMAND.print_error(noun)
+			else:
+				ErrorCode.UNKNOWN_COMMAND.print_error(f"{noun} {ast['verb']}")
 			return None
 		
-		if noun == "temp":
-			class_name = "Tmp"
-		elif noun == "variable":
-			class_name = "Var"
-		elif noun == "system":
-			class_name = "Sys"
-		
 		try:
-			CommandClass = globals()[class_name]
-			CommandMethod = getattr(CommandClass, method_name)
-			result = CommandMethod(ast, variables) 
-			return result
-		except KeyError:
-			ErrorCode.UNKNOWN_COMMAND.print_error(f"Class for '{noun}' not found.")
-			return None
-		except AttributeError:
-			ErrorCode.UNKNOWN_COMMAND.print_error(f"{noun} {verb}")
-			return None
+			return handler(ast, variables)
 		except Exception as e:
-			sys.stderr.write(f"Runtime Error during execution: {e}\n")
+			variables.out.flush()
+			STDERR.report(str(e), label="Runtime Error during execution")
+			return None
+
+	@staticmethod
+	def resolve(ast):
+		"""일반 명령어의 처리 함수 (조건문/반복문이나 알 수 없는 명령어는 None)
+
+		파싱 캐시의 AST는 여러 Interpreter가 공유하므로 찾은 함수를 AST에 보관하지 않는다.
+		"""
+		if ast is None or "type" in ast:
 			return None
+		return REGISTRY.lookup(ast["noun"], ast["verb"])
 	
 
+@lru_cache(maxsize=1024)
+def _variant_expression(source, variant, level, precision):
+	# 상수 계산도 변형의 연산으로 다시 해야 하므로 원래 식 문자열에서 컴파일
+	# (decimal 상수 계산은 정밀도에 따라 다르므로 정밀도도 키에 포함)
+	expression = compile_expression(source, variant)
+	if level:
+		expression = fold_expression(expression)
+	return expression
+
+
 class PreProcessing:
 	@staticmethod
-	def _add_space(string):
-		string = " ".join(string.split())
-		
-		string = string.replace("**", " TMP ")
-		string = string.replace("+", " + ")
-		string = string.replace("-", " - ")
-		string = string.replace("*", " * ")
-		string = string.replace("/", " / ")
-		string = string.replace("%", " % ")
-		string = string.replace(" TMP ", " ** ")
-		
-		string = " ".join(string.split())
-		return string
-
-	@staticmethod
-	def _evaluate_expression(*values, variables):
-		evaluated = []
-		for val in values:
-			if val.startswith("$"):
-				var_name = val[1:]
-				if var_name in variables:
-					evaluated.append(variables[var_name])
-				else:
-					ErrorCode.VARIABLE_NOT_FOUND.print_error(var_name)
-					evaluated.append(None)
-			else:
-				evaluated.append(val)
-		expression_string = " ".join(evaluated)
-		return expression_string
+	def _expression_source(ast):
+		var_value_tokens = ast.get("raw_args", [])[2:]
+		return " ".join(str(v) for v in var_value_tokens).strip('"')
 
 	@staticmethod
-	def _calc(expression):
-		expression_list = expression.split(" ")
-		result = None
-  
-		i = 0
+	def _compile(ast, variant=None):
+		"""var chg의 값 부분을 컴파일한 식 (보통은 Resolver가 파싱할 때 AST에 넣어 둔 식)
+
+		variant: 대입 대상의 선언 타입에 맞춘 식 (Numeric.variant, 변형마다 따로 캐시)
+		"""
+		if variant is not None:
+			return PreProcessing._variant(ast, variant)
+		expression = ast.get("expression")
+		if expression is None:
+			expression = compile_expression(PreProcessing._expression_source(ast))
+		return expression
+
+	@staticmethod
+	def _variant(ast, variant):
+		# 끌어올린 본문의 문장은 변형을 미리 가지고 있음 (Optimizer.hoist)
+		variants = ast.get("variants")
+		if variants is not None and variant in variants:
+			return variants[variant]
+		source = ast.get("expression_source")
+		if source is None:
+			source = PreProcessing._expression_source(ast)
+		return _variant_expression(source, variant, Optimizer.level, Numeric.precision)
+
+	@staticmethod
+	def _calc(expression, variables):
+		"""컴파일된 식(또는 식 문자열)을 평가, 실패 시 None"""
 		try:
-			# 음수 처리
-			if expression_list[0] == "-":
-				if len(expression_list) > 1:
-					try:
-						float_val = float(expression_list[1]) 
-						expression_list[0] = str(-float_val)
-						del expression_list[1]
-					except ValueError:
-						pass
-			
-			# 거듭제곱 처리
-			i = 1
-			while i < len(expression_list) - 1:
-				op = expression_list[i]
-				if op == "**":
-					try:
-						val1 = float(expression_list[i-1])
-						val2 = float(expression_list[i+1])
-						result = val1 ** val2
-						
-						expression_list[i-1] = str(result)
-						del expression_list[i+1]
-						del expression_list[i]
-					except ValueError:
-						i += 1
-				else:
-					i += 1
-			
-			# 곱셈, 나눗셈, 나머지 처리
-			i = 1
-			while i < len(expression_list) - 1: 
-				op = expression_list[i]
-				
-				if op in ["*", "/", "%"]:
-					# 음수 처리
-					if len(expression_list) > i + 3:
-						if expression_list[i+1] == "-" and expression_list[i+2] == "-":
-							try:
-								float_val = float(expression_list[i+3]) 
-								expression_list[i+1] = str(float_val)
-								del expression_list[i+2]
-								del expression_list[i+2]
-							except ValueError:
-								pass
-						
-					if len(expression_list) > i + 2:
-						if expression_list[i+1] == "-":
-							try:
-								float_val = float(expression_list[i+2]) 
-								expression_list[i+1] = str(-float_val)
-								del expression_list[i+2]
-							except ValueError:
-								pass
-	
-					try:
-						val1 = float(expression_list[i-1])
-						val2 = float(expression_list[i+1])
-						
-						if op == "*":
-							result = val1 * val2
-						elif op == "/": 
-							if val2 == 0:
-								sys.stderr.write("Error: Division by zero.\n")
-								return None
-							result = val1 / val2
-						elif op == "%":
-							if val2 == 0:
-								sys.stderr.write("Error: Modulo by zero.\n")
-								return None
-							result = val1 % val2
-						
-						expression_list[i-1] = str(result)
-						del expression_list[i+1]
-						del expression_list[i] 
-					except ValueError:
-						i += 1
-				else:
-					i += 1
-   
-			# 덧셈, 뺄셈 처리
-			i = 1
-			while i < len(expression_list) - 1:
-				op = expression_list[i]
-				
-				if op == "+" or op == "-":
-					try:
-						val1 = float(expression_list[i-1])
-						val2 = float(expression_list[i+1])
-						
-						if op == "+":
-							result = val1 + val2
-						else: 
-							result = val1 - val2
-						
-						expression_list[i-1] = str(result)
-						del expression_list[i+1]
-						del expression_list[i] 
-					except ValueError:
-						i += 1
-				else:
-					i += 1
-	 
-			if len(expression_list) == 1:
-				final_result = float(expression_list[0])
-
-				if final_result.is_integer():
-					return int(final_result)
-				else:
-					return final_result
-			else:
-				sys.stderr.write("Error: Invalid expression format (did not resolve to single value).\n")
-				return None
- 
-		except ValueError:	
-			sys.stderr.write("Error: Non-numeric value in expression.\n")
+			if isinstance(expression, str):
+				expression = compile_expression(expression)
+			return evaluate(expression, variables)
+		except UndefinedVariable as e:
+			ErrorCode.VARIABLE_NOT_FOUND.print_error(e.name)
+		except (OverflowError, DecimalOverflow):
+			STDERR.report("Numeric overflow in expression.")
+		except DecimalException:
+			STDERR.report("Invalid decimal operation.")
+		except (ExpressionError, ListError) as e:
+			STDERR.report(str(e))
+		return None
+
+	@staticmethod
+	def _target_args(ast, usage):
+		"""'이름 -in 값...' 형식의 인자를 (이름, 값 토큰들)로, 형식이 틀리면 None"""
+		raw_args = ast.get("raw_args", [])
+		if len(raw_args) < 3 or raw_args[1] != "-in":
+			ErrorCode.MISSING_ARGUMENT.print_error(usage)
+			return None
+		return raw_args[0], [str(arg) for arg in raw_args[2:]]
+
+	@staticmethod
+	def _operand(token, variables):
+		"""리터럴 또는 $변수 값, 없는 변수면 UndefinedVariable"""
+		token = token.strip('"')
+		if token.startswith("$"):
+			try:
+				return variables[token[1:]]
+			except KeyError:
+				raise UndefinedVariable(token[1:])
+		return parse_value(token)
+
+	@staticmethod
+	def _list_reduce(ast, variables, name, func=None):
+		"""list sum/min/max/mean/len: 리스트 하나를 값 하나로"""
+		args = PreProcessing._target_args(ast, f"list {name}: Expected 'name -in $list'")
+		if args is None:
 			return None
-		except ZeroDivisionError:
-			sys.stderr.write("Error: Division by zero.\n")
+		target, tokens = args
+		source, rest = PreProcessing._list_source(tokens, variables)
+		if source is None:
 			return None
+		return PreProcessing._save(variables, target, lambda: func(source) if func else source.reduce(name))
+
+	@staticmethod
+	def _list_source(tokens, variables):
+		"""첫 토큰($이름)이 가리키는 리스트와 나머지 토큰"""
+		if not tokens:
+			ErrorCode.MISSING_ARGUMENT.print_error("list: Expected a $list operand")
+			return None, []
+		name = tokens[0].lstrip("$")
+		value = variables.get(name)
+		if not isinstance(value, ListValue):
+			PreProcessing._not_a_list(name, variables)
+			return None, []
+		return value, merge_signs(tokens[1:])
+
+	@staticmethod
+	def _list_numbers(tokens, variables, command, minimum, maximum):
+		if not minimum <= len(tokens) <= maximum:
+			ErrorCode.MISSING_ARGUMENT.print_error(f"{command}: Expected {minimum} to {maximum} numbers")
+			return None
+		try:
+			numbers = [PreProcessing._operand(token, variables) for token in tokens]
+		except UndefinedVariable as e:
+			ErrorCode.VARIABLE_NOT_FOUND.print_error(e.name)
+			return None
+		if not all(is_numeric(number) for number in numbers):
+			STDERR.report(f"{command}: Expected numeric arguments")
+			return None
+		return numbers
+
+	@staticmethod
+	def _each_items(ast, variables):
+		"""-each의 반복 대상: $리스트의 원소 또는 'stop' / 'start stop [step]' 범위"""
+		tokens = ast["source"]
+		if len(tokens) == 1 and tokens[0].startswith("$"):
+			value = variables.get(tokens[0][1:])
+			if isinstance(value, ListValue):
+				return value.data
+		bounds = PreProcessing._list_numbers(merge_signs(tokens), variables, "-each", 1, 3)
+		if bounds is None:
+			return None
+		if len(bounds) == 1:
+			bounds.insert(0, 0)
+		try:
+			if all(isinstance(bound, int) for bound in bounds):
+				if len(bounds) == 3 and bounds[2] == 0:
+					raise ListError("Range step must not be zero")
+				return range(*bounds)
+			return ListValue.from_range(*bounds).data
+		except ListError as e:
+			STDERR.report(str(e))
+			return None
+
+	@staticmethod
+	def _each_workers(ast, variables):
+		"""-parallel N의 작업자 수 (없으면 1, 0이면 CPU 수)"""
+		token = ast.get("parallel")
+		if token is None:
+			return 1
+		workers = PreProcessing._list_numbers([token], variables, "-parallel", 1, 1)
+		if workers is None:
+			return None
+		workers = workers[0]
+		if not isinstance(workers, int) or workers < 0:
+			STDERR.report(f"-parallel: Expected a worker count, got '{format_value(workers)}'")
+			return None
+		return workers or os.cpu_count() or 1
+
+	@staticmethod
+	def _not_a_list(name, variables):
+		if name in variables:
+			STDERR.report(f"Variable '{name}' is not a list")
+		else:
+			ErrorCode.VARIABLE_NOT_FOUND.print_error(name)
+
+	@staticmethod
+	def _save(variables, name, compute):
+		try:
+			PreProcessing._store(variables, name, compute())
+		except (ListError, ConversionError) as e:
+			STDERR.report(str(e))
+		return None
+
+	@staticmethod
+	def _store(variables, name, value):
+		"""결과를 변수에 저장 (이미 있으면 변경, 없으면 생성)"""
+		if name in variables:
+			variables.assign(name, value)
+			variables.out.message(f"Variable '{name}' changed.\n")
+		else:
+			variables.declare(name, value, "list" if isinstance(value, ListValue) else None)
+			variables.out.message(f"Variable '{name}' created.\n")
 
 
 class Tmp:
 	@staticmethod
 	def _echo(ast, variables):
+		# 단어마다 미리 찾아 둔 슬롯으로 변수 값을 확인 (변수가 아니면 단어 그대로)
+		frame = variables.frame
+		size = len(frame)
 		output = []
-		for word in ast["val"]:
-			# 변수 참조 처리
-			if word in variables:
-				output.append(str(variables[word]))
-			elif word.startswith("$"):
-				var_name = word[1:]
-				if var_name in variables:
-					output.append(str(variables[var_name]))
-				else:
-					output.append(word)
-			else:
-				output.append(str(word))
+		for symbol, word in ast.get("words") or Resolver.words(ast):
+			if symbol is not None and symbol.slot < size:
+				value = frame[symbol.slot]
+				if value is not UNSET:
+					output.append(format_value(value))
+					continue
+			output.append(word)
 
 		result = " ".join(output)
 		if result.startswith('"') and result.endswith('"'):
 			result = result[1:-1]
 
-		sys.stdout.write(result + "\n")
+		variables.out.write(result + "\n")
 
 
 class Var:
@@ -271,31 +301,15 @@ class Var:
 		var_value = " ".join(str(v) for v in var_value_tokens).strip('"')
 	
 		adjectives = ast.get("adjectives", [])
-		if adjectives:
-			var_type = adjectives[0]
-			
-			if var_type == "int":
-				try:
-					var_value = str(int(float(var_value)))
-				except ValueError:
-					sys.stderr.write(f"Error: Cannot convert '{var_value}' to int\n")
-					return None
-			elif var_type == "float":
-				try:
-					var_value = str(float(var_value))
-				except ValueError:
-					sys.stderr.write(f"Error: Cannot convert '{var_value}' to float\n")
-					return None
-			elif var_type == "str":
-				var_value = str(var_value)
+		var_type = adjectives[0] if adjectives else None
+		try:
+			variables.declare_slot(Resolver.target(ast).slot, var_value, var_type)
+		except ConversionError as e:
+			STDERR.report(str(e))
+			return None
 		
-		variables[var_name] = var_value
-		sys.stdout.write(f"Variable '{var_name}' created.\n")
+		variables.out.message(f"Variable '{var_name}' created.\n")
 	
-	@staticmethod
-	def _create(ast, variables):
-		Var._crt(ast, variables)
-
 	@staticmethod
 	def _chg(ast, variables):
 		raw_args = ast.get("raw_args", [])
@@ -304,8 +318,9 @@ class Var:
 			return None
 		
 		var_name = raw_args[0]
+		slot = Resolver.target(ast).slot
 
-		if var_name not in variables:
+		if variables.load(slot) is UNSET:
 			ErrorCode.VARIABLE_NOT_FOUND.print_error(var_name)
 			return None
 		
@@ -313,33 +328,158 @@ class Var:
 			ErrorCode.MISSING_ARGUMENT.print_error("var chg: Missing or misplaced mandatory flag '-in'. Expected 'name -in value'")
 			return None
 		
-		var_value_tokens = raw_args[2:]
-		var_value = " ".join(str(v) for v in var_value_tokens).strip('"')
+		try:
+			expression = PreProcessing._compile(ast, Numeric.variant(variables.kinds[slot]))
+		except ExpressionError as e:
+			STDERR.report(str(e))
+			return None
 		
-		var_value = PreProcessing._add_space(var_value)
-		var_tokens = var_value.split(" ")
-		var_value = PreProcessing._evaluate_expression(*var_tokens, variables=variables)
-		var_value = PreProcessing._calc(var_value)
-		var_value = str(var_value)
-  
-		variables[var_name] = var_value
-		sys.stdout.write(f"Variable '{var_name}' changed.\n")
+		var_value = PreProcessing._calc(expression, variables)
+		if var_value is None:
+			return None
+		
+		try:
+			variables.assign_slot(slot, var_value)
+		except ConversionError as e:
+			STDERR.report(str(e))
+			return None
+		variables.out.message(f"Variable '{var_name}' changed.\n")
 	
-	@staticmethod
-	def _change(ast, variables):
-		Var._chg(ast, variables)
-
 	@staticmethod
 	def _get(ast, variables):
 		if len(ast["val"]) < 1:
 			ErrorCode.MISSING_ARGUMENT.print_error("var get")
 			return None
 		
-		var_name = ast["val"][0]
-		if var_name in variables:
-			sys.stdout.write(str(variables[var_name]) + "\n")
+		value = variables.load(Resolver.target(ast).slot)
+		if value is not UNSET:
+			variables.out.write(format_value(value) + "\n")
 		else:
-			ErrorCode.VARIABLE_NOT_FOUND.print_error(var_name)
+			ErrorCode.VARIABLE_NOT_FOUND.print_error(ast["val"][0])
+
+
+class List:
+	"""array 기반 리스트 명령
+
+	list crt xs -in 1 2 3          (list:int / list:float / list:decimal / list:str로 원소 타입 지정)
+	list rng xs -in 0 1000000 [2]  (범위로 생성)
+	list add xs -in 4 5            (뒤에 추가)
+	list get v -in $xs 3           (인덱스, 음수는 뒤에서부터)
+	list len n -in $xs
+	list slc ys -in $xs 10 20 [2]
+	list map ys -in $xs * 2 + 1    (원소별 산술, 같은 길이의 리스트끼리도 가능)
+	list sum s -in $xs             (min / max / mean도 같은 형식)
+	"""
+
+	@staticmethod
+	def _crt(ast, variables):
+		args = PreProcessing._target_args(ast, "list crt: Expected 'name -in values...'")
+		if args is None:
+			return None
+		name, tokens = args
+		adjectives = ast.get("adjectives", [])
+		kind = adjectives[0] if adjectives else None
+		# $변수 원소는 값으로 바꿔서 생성
+		values = []
+		for token in merge_signs(tokens):
+			try:
+				values.append(PreProcessing._operand(token, variables))
+			except UndefinedVariable as e:
+				ErrorCode.VARIABLE_NOT_FOUND.print_error(e.name)
+				return None
+		return PreProcessing._save(variables, name, lambda: ListValue.from_values(values, kind))
+
+	@staticmethod
+	def _rng(ast, variables):
+		args = PreProcessing._target_args(ast, "list rng: Expected 'name -in start stop [step]'")
+		if args is None:
+			return None
+		name, tokens = args
+		bounds = PreProcessing._list_numbers(merge_signs(tokens), variables, "list rng", 2, 3)
+		if bounds is None:
+			return None
+		return PreProcessing._save(variables, name, lambda: ListValue.from_range(*bounds))
+
+	@staticmethod
+	def _add(ast, variables):
+		args = PreProcessing._target_args(ast, "list add: Expected 'name -in values...'")
+		if args is None:
+			return None
+		name, tokens = args
+		target = variables.get(name)
+		if not isinstance(target, ListValue):
+			PreProcessing._not_a_list(name, variables)
+			return None
+		try:
+			values = [PreProcessing._operand(token, variables) for token in merge_signs(tokens)]
+			target.append(values)
+		except UndefinedVariable as e:
+			ErrorCode.VARIABLE_NOT_FOUND.print_error(e.name)
+			return None
+		except ListError as e:
+			STDERR.report(str(e))
+			return None
+		variables.out.message(f"Variable '{name}' changed.\n")
+
+	@staticmethod
+	def _get(ast, variables):
+		args = PreProcessing._target_args(ast, "list get: Expected 'name -in $list index'")
+		if args is None:
+			return None
+		name, tokens = args
+		source, rest = PreProcessing._list_source(tokens, variables)
+		index = PreProcessing._list_numbers(rest, variables, "list get", 1, 1)
+		if source is None or index is None:
+			return None
+		return PreProcessing._save(variables, name, lambda: source.get(int(index[0])))
+
+	@staticmethod
+	def _len(ast, variables):
+		return PreProcessing._list_reduce(ast, variables, "len", len)
+
+	@staticmethod
+	def _slc(ast, variables):
+		args = PreProcessing._target_args(ast, "list slc: Expected 'name -in $list start stop [step]'")
+		if args is None:
+			return None
+		name, tokens = args
+		source, rest = PreProcessing._list_source(tokens, variables)
+		bounds = PreProcessing._list_numbers(rest, variables, "list slc", 1, 3)
+		if source is None or bounds is None:
+			return None
+		return PreProcessing._save(variables, name, lambda: source.slice(*(int(b) for b in bounds)))
+
+	@staticmethod
+	def _map(ast, variables):
+		args = PreProcessing._target_args(ast, "list map: Expected 'name -in expression'")
+		if args is None:
+			return None
+		name = args[0]
+		try:
+			expression = PreProcessing._compile(ast)
+		except ExpressionError as e:
+			STDERR.report(str(e))
+			return None
+		value = PreProcessing._calc(expression, variables)
+		if value is None:
+			return None
+		return PreProcessing._save(variables, name, lambda: value)
+
+	@staticmethod
+	def _sum(ast, variables):
+		return PreProcessing._list_reduce(ast, variables, "sum")
+
+	@staticmethod
+	def _min(ast, variables):
+		return PreProcessing._list_reduce(ast, variables, "min")
+
+	@staticmethod
+	def _max(ast, variables):
+		return PreProcessing._list_reduce(ast, variables, "max")
+
+	@staticmethod
+	def _mean(ast, variables):
+		return PreProcessing._list_reduce(ast, variables, "mean")
 
 
 class Sys:
@@ -347,49 +487,253 @@ class Sys:
 	def _stop(ast, variables):
 		return "exit"
 
+	@staticmethod
+	def _profile(ast, variables):
+		"""sys profile on / off / report"""
+		values = ast.get("val", [])
+		action = values[0] if values else "report"
+		profiler = variables.profiler
+		if action == "on":
+			if profiler is None:
+				variables.profiler = Profiler(Command.execute)
+			else:
+				profiler.active = True
+		elif action == "off":
+			if profiler is not None:
+				profiler.active = False
+		elif action == "report":
+			if profiler is None:
+				STDERR.report("Profiling has not been turned on")
+				return None
+			variables.out.write(profiler.report())
+		else:
+			ErrorCode.UNKNOWN_COMMAND.print_error(f"sys profile {action}")
+
+	@staticmethod
+	def _limit(ast, variables):
+		"""sys limit iterations -in N / sys limit time -in SECONDS (0 = 제한 없음)"""
+		raw_args = ast.get("raw_args", [])
+		if len(raw_args) < 3 or raw_args[1] != "-in":
+			ErrorCode.MISSING_ARGUMENT.print_error("sys limit: Expected 'iterations|time -in value'")
+			return None
+		
+		setting = raw_args[0]
+		try:
+			if setting == "iterations":
+				variables.limits.max_iterations = max(int(str(raw_args[2])), 0)
+			elif setting == "time":
+				variables.limits.time_limit = max(float(str(raw_args[2])), 0.0)
+			else:
+				ErrorCode.UNKNOWN_COMMAND.print_error(f"sys limit {setting}")
+				return None
+		except ValueError:
+			STDERR.report(f"Invalid limit value '{raw_args[2]}'")
+			return None
+		variables.out.message(f"Limit '{setting}' set.\n")
+
+
+# 기본 명령어 등록 (외부 명령어 클래스도 REGISTRY.register로 같은 테이블에 추가)
+REGISTRY.register("tmp", Tmp, aliases=("temp",))
+REGISTRY.register("list", List)
+REGISTRY.register("var", Var, aliases=("variable",))
+REGISTRY.register("sys", Sys, aliases=("system",))
+
 
 class Run:
+	@staticmethod
+	def execute(ast, variables):
+		"""최상위 문장 실행 (프로파일러가 켜져 있을 때만 프로파일러 경유)"""
+		if variables.limits.deadline is not None and variables.limits.expired():
+			STDERR.report("Time budget exceeded")
+			return "exit"
+		profiler = variables.profiler
+		if profiler is not None and profiler.active:
+			return profiler.execute(ast, variables)
+		return Command.execute(ast, variables)
+
 	@staticmethod
 	def start():
-		while True:
-			global variable
-			sys.stdout.write("\n>>> ")
-			cmd = sys.stdin.readline().strip()
+		"""대화형 REPL (표준 입력이 터미널이 아니면 프롬프트 없이 파이프 모드로 실행)"""
+		global variable
+		if not sys.stdin.isatty():
+			return Run.run_stream(sys.stdin)
 
-			# pyparsing으로 파싱
-			parsed = Parser.parse_command(cmd)
-			ast = Parser.to_ast(parsed, variable)
+		out = variable.out
+		# 새 줄만 스캔해 { } 깊이와 따옴표 상태를 이어 가고, 문장이 완성될 때만 파싱
+		# (다시 입력한 문장은 Parser.parse의 캐시에서 AST를 그대로 가져옴)
+		assembler = StatementAssembler(multiline_strings=True)
+		line_no = 0
+		while True:
+			out.write("\n... " if assembler.lines else "\n>>> ")
+			out.flush()
+			try:
+				line = sys.stdin.readline()
+			except KeyboardInterrupt:
+				# Ctrl-C: 입력 중인 문장 버림
+				assembler.reset()
+				out.write("\nKeyboardInterrupt")
+				continue
+			if not line:
+				# EOF (Ctrl-D): 보류 중인 문장이 있으면 실행 후 종료
+				statement = assembler.flush()
+				result = Run._execute_statements([statement] if statement else [], variable)
+				out.write("\n")
+				out.flush()
+				return 1 if result == "fail" else 0
+			line_no += 1
 
-			result = Command.execute(ast, variable)
+			if assembler.held and not line.strip():
+				# 보류 중인 -if 문장 뒤의 빈 줄: -else 없이 문장 완성
+				statements = [assembler.flush()]
+			else:
+				statements = assembler.feed(line, line_no)
 
+			result = Run._execute_statements(statements, variable)
+			if result == "fail":
+				out.flush()
+				return 1
 			if result == "exit":
-				sys.stdout.write("Exiting My Shell. Goodbye!\n")
-				break
+				out.write("Exiting My Shell. Goodbye!\n")
+				out.flush()
+				return 0
 
 	@staticmethod
-	def run_file(filename):
+	def _execute_statements(statements, variables):
+		"""조립된 (시작 줄 번호, 문장)들을 차례로 실행 ("exit" / --fail-fast면 "fail" / None)"""
+		for start, statement in statements:
+			variables.line = start
+			variables.offset = 0
+			try:
+				if Run.execute(Parser.parse(statement), variables) == "exit":
+					return "exit"
+			except FailFast:
+				return "fail"
+		return None
+
+	@staticmethod
+	def run_stream(stream, variables=None):
+		"""스트림(파이프 등)을 도착하는 대로 읽어 파일 모드와 같은 규칙으로 문장을 조립해 실행"""
+		if variables is None:
+			variables = variable
+		# 만들기 전에 읽는 변수는 이름마다 한 번만 경고
+		reported = set()
 		try:
-			with open(filename, 'r', encoding='utf-8') as f:
-				lines = f.readlines()
+			# 입력을 기다리기 전에 그때까지의 출력을 내보냄 (천천히 쓰는 파이프와 번갈아 실행)
+			for line_no, ast in Run._parse_stream(stream, None, variables, variables.out.flush):
+				variables.line = line_no
+				Resolver.check(ast, variables, reported)
+				if Run.execute(ast, variables) == "exit":
+					break
+		except FailFast:
+			return 1
+		except Exception as e:
+			STDERR.report(str(e))
+			return 1
+		finally:
+			variables.out.flush()
+		return 0
+
+	@staticmethod
+	def run_file(filename, variables=None):
+		"""스크립트 파일 실행, 종료 상태 반환 (0: 정상, 1: 파일 없음/실행 중단)"""
+		if variables is None:
+			variables = variable
+		writer = None
+		status = 0
+		reported = set()
+		try:
+			cache = ScriptCache(filename) if ScriptCache.enabled else None
+			statements = cache.load() if cache is not None else None
+			if statements is None:
+				if cache is not None:
+					writer = cache.writer()
+				statements = Run._parse_file(filename, writer, variables)
 			
-			for line in lines:
-				line = line.strip()
-				
-				if not line or line.startswith(('//', '##', 'cmt')):
-					continue
-				
-				# pyparsing으로 파싱
-				parsed = Parser.parse_command(line)
-				ast = Parser.to_ast(parsed, variable)
-				result = Command.execute(ast, variable)
+			for line_no, ast in statements:
+				variables.line = line_no
+				Resolver.check(ast, variables, reported)
+				result = Run.execute(ast, variables)
 				
 				if result == "exit":
 					break
+			
+			if writer is not None:
+				# 중간에 종료했어도 나머지 문장을 파싱해 캐시를 완성 (실행하지 않는 문장의 파싱
+				# 에러는 보고하지 않고, 에러가 있으면 writer가 캐시를 버림)
+				with STDERR.redirect(io.StringIO()):
+					for _ in statements:
+						pass
+				writer.commit()
 		
 		except FileNotFoundError:
-			sys.stderr.write(f"Error: File '{filename}' not found\n")
+			STDERR.report(f"File '{filename}' not found")
+			status = 1
+		except FailFast:
+			status = 1
 		except Exception as e:
-			sys.stderr.write(f"Error: {e}\n")
+			STDERR.report(str(e))
+			status = 1
+		finally:
+			if writer is not None:
+				writer.discard()
+			variables.out.flush()
+		return status
+
+	@staticmethod
+	def _parse_file(filename, writer=None, variables=None):
+		with open(filename, 'r', encoding='utf-8') as f:
+			yield from Run._parse_stream(f, writer, variables)
+
+	@staticmethod
+	def _parse_stream(stream, writer=None, variables=None, waiting=None):
+		"""문장 단위로 읽으면서 바로 파싱해 (줄 번호, AST) 생성 (writer가 있으면 캐시에 기록)
+
+		variables가 있으면 파싱 에러가 그 문장의 줄 번호로 보고되도록 미리 설정한다.
+		waiting: 입력을 더 읽기 전에 호출 (iter_lines)
+		"""
+		for line_no, statement in iter_statements(stream, waiting=waiting):
+			if variables is not None:
+				variables.line = line_no
+				variables.offset = 0
+			ast = Parser.parse(statement)
+			if writer is not None:
+				writer.add(line_no, ast)
+			yield line_no, ast
+
+	@staticmethod
+	def dump(filename):
+		"""파일의 모든 문장을 (현재 최적화 수준으로) 파싱해 최적화된 형태로 출력"""
+		try:
+			with open(filename, 'r', encoding='utf-8') as f:
+				for line_no, statement in iter_statements(f):
+					ast = Parser.parse(statement)
+					if ast is None:
+						continue
+					sys.stdout.write(f"// line {line_no}\n")
+					sys.stdout.write("\n".join(Optimizer.dump(ast)) + "\n")
+		except FileNotFoundError:
+			STDERR.report(f"File '{filename}' not found")
+			return 1
+		return 0
+
+	@staticmethod
+	def check_parser(filename):
+		"""파일의 모든 문장을 두 파서 엔진으로 파싱해 AST 차이를 보고"""
+		mismatches = 0
+		try:
+			with open(filename, 'r', encoding='utf-8') as f:
+				for line_no, statement in iter_statements(f):
+					same, fast_ast, pyparsing_ast = Parser.compare_engines(statement)
+					if not same:
+						mismatches += 1
+						sys.stdout.write(f"{filename}:{line_no}: {statement}\n")
+						sys.stdout.write(f"  fast:      {fast_ast}\n")
+						sys.stdout.write(f"  pyparsing: {pyparsing_ast}\n")
+		except FileNotFoundError:
+			STDERR.report(f"File '{filename}' not found")
+			return 1
+		sys.stdout.write(f"{mismatches} mismatch(es)\n")
+		return 1 if mismatches else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,329 @@
+import re
+import sys
+import time
+import threading
+from collections.abc import MutableMapping
+from decimal import Decimal
+from functools import lru_cache
+from output import STDOUT
+from numeric import Numeric, to_decimal
+
+
+class ConversionError(ValueError):
+	pass
+
+
+_NUMBER_RE = re.compile(r'[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?$')
+_TRUE_WORDS = ("true", "yes", "on", "1")
+_FALSE_WORDS = ("false", "no", "off", "0")
+
+
+def _to_int(value):
+	if isinstance(value, (bool, int)):
+		return int(value)
+	if isinstance(value, (float, Decimal)):
+		return int(value)
+	try:
+		return int(value)
+	except ValueError:
+		return int(float(value))
+
+
+def _to_float(value):
+	return float(value)
+
+
+def _to_bool(value):
+	if isinstance(value, (bool, int, float, Decimal)):
+		return bool(value)
+	word = value.strip().lower()
+	if word in _TRUE_WORDS:
+		return True
+	if word in _FALSE_WORDS:
+		return False
+	raise ValueError(value)
+
+
+def _to_str(value):
+	return value if isinstance(value, str) else format_value(value)
+
+
+def _to_list(value):
+	# lists가 store를 import하므로 여기서는 사용할 때 import
+	from lists import ListValue
+	if isinstance(value, ListValue):
+		return value
+	if isinstance(value, str):
+		return ListValue.from_tokens(value.split())
+	raise ValueError(value)
+
+
+# 형용사(adj_list) → 네이티브 타입 변환 함수
+CONVERTERS = {
+	"int": _to_int,
+	"float": _to_float,
+	"bool": _to_bool,
+	"str": _to_str,
+	"list": _to_list,
+	"decimal": to_decimal,
+}
+
+
+def convert(value, var_type):
+	"""값을 선언된 타입으로 변환 (타입이 없으면 그대로)"""
+	converter = CONVERTERS.get(var_type)
+	if converter is None:
+		return value
+	try:
+		return converter(value)
+	except (TypeError, ValueError, ArithmeticError):
+		raise ConversionError(f"Cannot convert '{format_value(value)}' to {var_type}")
+
+
+@lru_cache(maxsize=4096)
+def parse_literal(text):
+	"""타입 선언이 없는 리터럴: 정수 → 실수 → 문자열 순으로 해석"""
+	if not _NUMBER_RE.match(text):
+		return text
+	if "." in text or "e" in text or "E" in text:
+		return float(text)
+	return int(text)
+
+
+def parse_value(text):
+	"""parse_literal + 산술 모드 (decimal 모드에서는 소수 리터럴을 적힌 그대로 Decimal로)"""
+	value = parse_literal(text)
+	if value.__class__ is float and Numeric.mode == "decimal":
+		return Decimal(text)
+	return value
+
+
+def is_numeric(value):
+	return isinstance(value, (int, float, Decimal))
+
+
+def format_value(value):
+	"""출력할 때만 문자열로 변환"""
+	if value is True:
+		return "true"
+	if value is False:
+		return "false"
+	return str(value)
+
+
+class LoopLimits:
+	"""-while 실행 한도 (0이면 제한 없음)"""
+
+	def __init__(self, max_iterations=1000, time_limit=0.0, check_interval=1024, deadline=None):
+		self.max_iterations = max_iterations
+		self.time_limit = time_limit
+		# 시간 검사는 check_interval 반복마다 한 번만
+		self.check_interval = check_interval
+		# 세션 전체의 실행 마감 시각 (time.perf_counter 기준, None이면 없음)
+		self.deadline = deadline
+
+	def copy(self):
+		return LoopLimits(self.max_iterations, self.time_limit, self.check_interval, self.deadline)
+
+	def expired(self):
+		return self.deadline is not None and time.perf_counter() > self.deadline
+
+
+class _Unset:
+	"""프레임에서 값이 없는 슬롯 표시"""
+
+	__slots__ = ()
+
+	def __repr__(self):
+		return "UNSET"
+
+	def __reduce__(self):
+		return "UNSET"
+
+
+UNSET = _Unset()
+
+
+class Symbol:
+	"""인턴된 변수 이름과 프레임 슬롯 번호
+
+	슬롯 번호는 프로세스마다 다르므로 피클할 때는 이름만 저장하고 읽을 때 다시 인턴한다
+	(스크립트 캐시에 저장된 AST도 그대로 쓸 수 있음).
+	"""
+
+	__slots__ = ("name", "slot")
+
+	def __init__(self, name, slot):
+		self.name = name
+		self.slot = slot
+
+	def __reduce__(self):
+		return (intern, (self.name,))
+
+	def __repr__(self):
+		return f"Symbol({self.name!r}, {self.slot})"
+
+
+class SymbolTable:
+	"""변수 이름 → Symbol (프로세스 전역, 모든 세션의 프레임이 같은 슬롯 번호를 씀)
+
+	한 번 붙인 슬롯 번호는 바뀌지 않으므로 AST에 보관한 슬롯은 계속 유효하다.
+	"""
+
+	def __init__(self):
+		self.symbols = {}
+		self.names = []
+		self._lock = threading.Lock()
+
+	def intern(self, name):
+		symbol = self.symbols.get(name)
+		if symbol is None:
+			with self._lock:
+				symbol = self.symbols.get(name)
+				if symbol is None:
+					name = sys.intern(name)
+					symbol = Symbol(name, len(self.names))
+					self.names.append(name)
+					self.symbols[name] = symbol
+		return symbol
+
+	def find(self, name):
+		"""이미 있는 이름의 슬롯 (없으면 None, 새로 만들지 않음)"""
+		symbol = self.symbols.get(name)
+		return None if symbol is None else symbol.slot
+
+	def __len__(self):
+		return len(self.names)
+
+
+SYMBOLS = SymbolTable()
+
+
+def intern(name):
+	return SYMBOLS.intern(name)
+
+
+class VariableStore(MutableMapping):
+	"""변수 값을 슬롯 번호로 찾는 리스트 기반 프레임 (int/float/bool/str/ListValue)
+
+	frame[slot]: 변수 값 (없으면 UNSET), kinds[slot]: 선언 타입 (없으면 None)
+	슬롯 번호는 SYMBOLS가 붙이며, 컴파일된 식/조건과 명령어 AST는 슬롯을 미리 찾아 두고
+	frame을 직접 읽는다. 이름으로 접근하는 매핑 인터페이스도 그대로 지원한다.
+
+	out: 이 저장소를 사용하는 세션의 출력 (OutputSink)
+	limits: -while 실행 한도 (LoopLimits)
+	line: 실행 중인 최상위 문장의 시작 줄 번호
+	offset: 실행 중인 안쪽 문장의 줄 (line 기준 오프셋, 에러 메시지용)
+	profiler: sys profile로 켠 Profiler (꺼져 있으면 None 또는 active=False)
+	"""
+
+	def __init__(self, values=(), out=None, limits=None):
+		self.frame = []
+		self.kinds = []
+		self.out = out if out is not None else STDOUT
+		self.limits = limits if limits is not None else LoopLimits()
+		self.line = 0
+		self.offset = 0
+		self.profiler = None
+		self.update(values)
+
+	# 슬롯 접근
+
+	def load(self, slot):
+		"""슬롯의 값 (없으면 UNSET)"""
+		try:
+			return self.frame[slot]
+		except IndexError:
+			return UNSET
+
+	def store(self, slot, value):
+		try:
+			self.frame[slot] = value
+		except IndexError:
+			self._grow(slot)
+			self.frame[slot] = value
+
+	def _grow(self, slot):
+		missing = slot + 1 - len(self.frame)
+		self.frame.extend([UNSET] * missing)
+		self.kinds.extend([None] * missing)
+
+	def declare_slot(self, slot, value, var_type=None):
+		"""var crt: 타입에 맞게 변환해 생성 (타입이 없으면 리터럴 추론)"""
+		if var_type in CONVERTERS:
+			value = convert(value, var_type)
+		else:
+			var_type = None
+			if isinstance(value, str):
+				value = parse_value(value)
+		self.store(slot, value)
+		self.kinds[slot] = var_type
+		return value
+
+	def assign_slot(self, slot, value):
+		"""var chg: 선언 타입이 있으면 그 타입으로 유지"""
+		try:
+			var_type = self.kinds[slot]
+		except IndexError:
+			var_type = None
+		if var_type is not None:
+			value = convert(value, var_type)
+		self.store(slot, value)
+		return value
+
+	def copy(self, out=None, limits=None):
+		"""같은 값과 타입을 가진 새 프레임 (-each 반복마다의 변수 복사본, 값 자체는 공유)"""
+		variables = VariableStore(out=out if out is not None else self.out,
+			limits=limits if limits is not None else self.limits)
+		variables.frame = self.frame[:]
+		variables.kinds = self.kinds[:]
+		variables.line = self.line
+		variables.offset = self.offset
+		return variables
+
+	def declare(self, name, value, var_type=None):
+		return self.declare_slot(SYMBOLS.intern(name).slot, value, var_type)
+
+	def assign(self, name, value):
+		return self.assign_slot(SYMBOLS.intern(name).slot, value)
+
+	# 이름으로 접근하는 매핑 인터페이스
+
+	def __getitem__(self, name):
+		slot = SYMBOLS.find(name)
+		if slot is not None:
+			value = self.load(slot)
+			if value is not UNSET:
+				return value
+		raise KeyError(name)
+
+	def __setitem__(self, name, value):
+		self.store(SYMBOLS.intern(name).slot, value)
+
+	def __delitem__(self, name):
+		slot = SYMBOLS.find(name)
+		if slot is None or self.load(slot) is UNSET:
+			raise KeyError(name)
+		self.frame[slot] = UNSET
+		self.kinds[slot] = None
+
+	def __contains__(self, name):
+		slot = SYMBOLS.find(name)
+		return slot is not None and self.load(slot) is not UNSET
+
+	def get(self, name, default=None):
+		slot = SYMBOLS.find(name)
+		if slot is None:
+			return default
+		value = self.load(slot)
+		return default if value is UNSET else value
+
+	def __iter__(self):
+		names = SYMBOLS.names
+		return (names[slot] for slot, value in enumerate(self.frame) if value is not UNSET)
+
+	def __len__(self):
+		return sum(value is not UNSET for value in self.frame)
+
+	def __repr__(self):
+		return f"VariableStore({dict(self.items())!r})"
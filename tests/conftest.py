@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# 인터프리터 모듈은 code/ 안에서 서로를 최상위 모듈로 import
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code"))
+
+from numeric import Numeric
+
+
+@pytest.fixture
+def numeric_mode():
+	# 산술 모드/정밀도는 프로세스 전역이므로 테스트가 끝나면 되돌림
+	mode, precision = Numeric.mode, Numeric.precision
+	yield
+	Numeric.set_mode(mode)
+	Numeric.set_precision(precision)
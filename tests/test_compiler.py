@@ -0,0 +1,125 @@
+"""AOT 컴파일러: 컴파일한 모듈과 인터프리터의 출력/에러/종료 상태가 같은지 (차등 테스트)"""
+import io
+import os
+import re
+import sys
+
+import pytest
+
+from compiler import Compiler, CompileError
+from diagnostics import Diagnostics
+from interpreter import Interpreter
+from loader import iter_statements
+from logic import Parser
+from numeric import Numeric
+from optimizer import Optimizer
+from store import LoopLimits
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"))
+
+from workloads import WORKLOADS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPILED_WORKLOADS = ["while_counter", "arithmetic", "branches", "echo_heavy", "flat_long", "big_ints"]
+UNSUPPORTED_WORKLOADS = ["list_bulk", "decimal_money", "each_items"]
+
+SCRIPTS = {
+	"errors": ("var crt a -in 7\n"
+		"var:int crt n -in 9\n"
+		"var chg n -in $n / 2 + $zz\n"
+		"var chg a -in $a / 0\n"
+		"var get missing\n"
+		"$a > 3 -if { tmp echo big $a } -else { tmp echo small }\n"
+		"var chg a -in $a / 2\n"
+		"tmp echo $a $n\n"),
+	"loop_limit": ("var crt i -in 0\n"
+		"$i >= 0 -while {\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+		"tmp echo $i\n"),
+	"stop": ("var:float crt x -in 1\n"
+		"$x < 100 -while {\n"
+		"\tvar chg x -in $x * 1.5\n"
+		"\t$x > 20 -if { sys stop }\n"
+		"}\n"
+		"tmp echo never\n"),
+}
+
+
+def _sources():
+	with open(os.path.join(ROOT, "example.nsc"), encoding="utf-8") as f:
+		yield "example", f.read()
+	for name in COMPILED_WORKLOADS:
+		yield name, WORKLOADS[name][0](300)[0]
+	yield from SCRIPTS.items()
+
+
+SOURCES = dict(_sources())
+
+
+def _compile(path):
+	with open(path, encoding="utf-8") as f:
+		statements = [(line_no, Parser.parse(statement)) for line_no, statement in iter_statements(f)]
+	return Compiler(str(path)).compile(statements)
+
+
+def _timeless(status, output, errors):
+	# W001의 실행 시간은 실행마다 다름
+	return status, output, re.sub(r"in \d+\.\d+s", "in _s", errors)
+
+
+def _compiled(path):
+	namespace = {"__name__": "compiled_script"}
+	exec(compile(_compile(path), str(path) + ".py", "exec"), namespace)
+	out, err = io.StringIO(), io.StringIO()
+	status = namespace["main"](out=out, err=err, quiet=True)
+	return _timeless(status, out.getvalue(), err.getvalue())
+
+
+def _interpreted(path):
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True, diagnostics=Diagnostics(source=str(path)))
+	status = interpreter.run_file(str(path))
+	return _timeless(status, interpreter.output(), interpreter.errors())
+
+
+@pytest.mark.parametrize("level", [0, 1])
+@pytest.mark.parametrize("name", SOURCES)
+def test_compiled_matches_interpreted(tmp_path, monkeypatch, numeric_mode, level, name):
+	Numeric.set_mode("exact")
+	monkeypatch.setattr(Optimizer, "level", level)
+	path = tmp_path / f"{name}.nsc"
+	path.write_text(SOURCES[name], encoding="utf-8")
+	assert _compiled(path) == _interpreted(path)
+
+
+@pytest.mark.parametrize("name", UNSUPPORTED_WORKLOADS)
+def test_unsupported_workloads_are_rejected(tmp_path, name):
+	path = tmp_path / f"{name}.nsc"
+	path.write_text(WORKLOADS[name][0](10)[0], encoding="utf-8")
+	with pytest.raises(CompileError):
+		_compile(path)
+
+
+@pytest.mark.parametrize("source, message", [
+	("i -each 3 { tmp echo $i }\n", "-each loops"),
+	("list crt xs -in 1 2\n", "'list crt'"),
+	("var:decimal crt d -in 0.5\n", "decimal variables"),
+	("sys profile\n", "'sys profile'"),
+])
+def test_unsupported_constructs_raise_compile_error(tmp_path, source, message):
+	path = tmp_path / "unsupported.nsc"
+	path.write_text(source, encoding="utf-8")
+	with pytest.raises(CompileError, match=message):
+		_compile(path)
+
+
+@pytest.mark.parametrize("mode", ["float", "decimal"])
+def test_only_exact_mode_compiles(tmp_path, numeric_mode, mode):
+	# 컴파일된 모듈은 exact 모드의 연산만 쓰므로 다른 모드는 거부
+	Numeric.set_mode(mode)
+	path = tmp_path / "example.nsc"
+	path.write_text("var crt a -in 1\ntmp echo $a\n", encoding="utf-8")
+	with pytest.raises(CompileError, match=f"--numeric {mode}"):
+		_compile(path)
+	status = Compiler.compile_file(str(path), str(tmp_path / "example.py"))
+	assert status == 1 and not (tmp_path / "example.py").exists()
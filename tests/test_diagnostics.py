@@ -0,0 +1,54 @@
+"""에러/경고 수집 (Diagnostics, Resolver.check)"""
+from diagnostics import Diagnostics
+from interpreter import Interpreter
+from store import LoopLimits
+
+
+def _run(path, fail_fast=False):
+	diagnostics = Diagnostics(fail_fast=fail_fast)
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True, diagnostics=diagnostics)
+	status = interpreter.run_file(str(path))
+	return status, interpreter.output(), interpreter.errors(), diagnostics
+
+
+def test_unresolved_read_in_skipped_branch_is_a_warning(tmp_path):
+	script = tmp_path / "ahead.nsc"
+	script.write_text("var crt mode -in 0\n"
+		"$mode == 1 -if { var chg total -in $total + 1 } -else { tmp echo skipped }\n"
+		"tmp echo end\n")
+	status, output, errors, diagnostics = _run(script, fail_fast=True)
+	assert (status, output) == (0, "skipped\nend\n")
+	assert "Warning [W002]: Variable 'total'" in errors
+	assert "E001" not in errors
+	assert diagnostics.counts == {"error": 0, "warning": 1}
+
+
+def test_unresolved_read_that_runs_is_also_an_error(tmp_path):
+	script = tmp_path / "missing.nsc"
+	script.write_text("var get zz\ntmp echo after\n")
+	_, output, errors, diagnostics = _run(script)
+	assert output == "after\n"
+	assert "Warning [W002]: Variable 'zz'" in errors
+	assert "Error [E001]: Variable 'zz' not found" in errors
+	assert diagnostics.counts == {"error": 1, "warning": 1}
+
+
+def test_missing_variables_in_one_condition_are_reported_separately(tmp_path):
+	script = tmp_path / "either.nsc"
+	script.write_text("$p == 1 -or $q == 1 -if {\n\ttmp echo yes\n}\ntmp echo end\n")
+	_, output, errors, diagnostics = _run(script)
+	assert output == "end\n"
+	assert "Error [E001]: Variable 'p' not found" in errors
+	assert "Error [E001]: Variable 'q' not found" in errors
+	assert "repeated" not in errors
+	assert diagnostics.counts == {"error": 2, "warning": 2}
+
+
+def test_detail_is_shown_but_not_compared():
+	diagnostics = Diagnostics()
+	first = diagnostics.record("warning", "Loop exceeded maximum iterations (5)", "W001", "Warning",
+		"stopped after 5 iterations in 0.001s")
+	assert first == "Warning [W001]: Loop exceeded maximum iterations (5); stopped after 5 iterations in 0.001s\n"
+	assert diagnostics.record("warning", "Loop exceeded maximum iterations (5)", "W001", "Warning",
+		"stopped after 5 iterations in 0.002s") is None
+	assert "(repeated 2 times)" in diagnostics.summary()
@@ -0,0 +1,79 @@
+"""-each 반복문: 순서대로/-parallel 실행이 같은 결과, 리덕션 값, 출력 순서, 작업자 풀 백엔드"""
+import pytest
+
+from each import Each
+from interpreter import Interpreter
+from store import LoopLimits
+
+BODY = ("var crt total -in 100\n"
+	"list rng xs -in 0 40\n"
+	"x -each $xs{parallel} -sum total -collect ys {{\n"
+	"\tvar chg total -in $x\n"
+	"\tvar crt ys -in 0\n"
+	"\tvar chg ys -in $x * $x\n"
+	"\ttmp echo item $x\n"
+	"}}\n"
+	"tmp echo $total\n"
+	"var get ys\n")
+
+
+@pytest.fixture(params=Each.BACKENDS)
+def backend(request):
+	backend = Each.backend
+	Each.set_backend(request.param)
+	yield request.param
+	Each.shutdown()
+	Each.set_backend(backend)
+
+
+def _run(source):
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True)
+	status = interpreter.execute(source)
+	return status, interpreter.output(), interpreter.errors()
+
+
+def test_reductions_and_output_order():
+	_, output, errors = _run(BODY.format(parallel=""))
+	lines = output.splitlines()
+	assert lines[:40] == [f"item {x}" for x in range(40)]
+	assert lines[40:] == [str(100 + sum(range(40))), str([x * x for x in range(40)])]
+	assert errors == ""
+
+
+@pytest.mark.parametrize("workers", [2, 4, 0])
+def test_parallel_matches_serial(backend, workers):
+	serial = _run(BODY.format(parallel=""))
+	assert _run(BODY.format(parallel=f" -parallel {workers}")) == serial
+	# 순서대로 실행으로 빠지지 않고 선택한 백엔드의 풀을 씀 (0은 CPU 수라서 1일 수도 있음)
+	assert Each._pools or not workers
+
+
+def test_parallel_output_is_deterministic(backend):
+	source = "i -each 50 -parallel 4 { tmp echo i $i }\n"
+	first = _run(source)
+	assert first[1] == "".join(f"{i} {i}\n" for i in range(50))
+	assert all(_run(source) == first for _ in range(3))
+
+
+def test_error_in_one_item_does_not_stop_the_others(backend):
+	source = ("var crt total -in 0\n"
+		"x -each -2 3 -parallel 2 -sum total {\n"
+		"\tvar chg total -in 12 / $x\n"
+		"\ttmp echo done $x\n"
+		"}\n"
+		"tmp echo $total\n")
+	status, output, errors = _run(source)
+	assert output == "done -2\ndone -1\ndone 0\ndone 1\ndone 2\n0\n"
+	assert errors.count("Division by zero.") == 1
+	# 같은 풀을 다음 반복문에서도 그대로 씀
+	assert _run(source)[1:] == (output, errors)
+
+
+def test_stop_in_a_worker_ends_the_script(backend):
+	status, output, errors = _run("k -each 8 -parallel 2 {\n"
+		"\ttmp echo k $k\n"
+		"\t$k == 2 -if { sys stop }\n"
+		"}\n"
+		"tmp echo after\n")
+	assert output == "0 0\n1 1\n2 2\n"
+	assert errors == ""
@@ -0,0 +1,88 @@
+"""리스트 명령 (list crt/get/map/sum ...)의 원소 종류와 산술 모드별 결과"""
+from decimal import Decimal
+
+import pytest
+
+from interpreter import Interpreter
+from lists import ListValue, ListError
+from numeric import Numeric
+from store import LoopLimits
+
+MODES = ["exact", "float", "decimal"]
+
+
+def _run(source):
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True)
+	interpreter.execute(source)
+	return interpreter.output(), interpreter.errors()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_created_list_kind_follows_the_numeric_mode(numeric_mode, mode):
+	Numeric.set_mode(mode)
+	assert ListValue.from_values(["1", "2"]).kind == "int"
+	fractions = ListValue.from_values(["0.1", "2"])
+	if mode == "decimal":
+		assert (fractions.kind, fractions.data) == ("decimal", [Decimal("0.1"), 2])
+	else:
+		assert (fractions.kind, list(fractions.data)) == ("float", [0.1, 2.0])
+	assert ListValue.from_values(["a", "1"]).kind == "str"
+	assert ListValue.from_values([Decimal("0.5"), 1.5]).kind == "decimal"
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_get_and_bulk_arithmetic(numeric_mode, mode):
+	Numeric.set_mode(mode)
+	output, errors = _run("var crt a -in 0.1\n"
+		"list crt xs -in $a 0.2 0.3\n"
+		"list get v -in $xs -1\n"
+		"list map ys -in $xs * 10 + 1\n"
+		"list sum s -in $xs\n"
+		"list max m -in $ys\n"
+		"tmp echo $v $ys $s $m\n")
+	assert errors == ""
+	if mode == "decimal":
+		assert output == "0.3 [2.0, 3.0, 4.0] 0.6 4.0\n"
+	else:
+		assert output == f"0.3 [2.0, 3.0, 4.0] {0.1 + 0.2 + 0.3} 4.0\n"
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_decimal_lists_keep_decimal_arithmetic(numeric_mode, mode):
+	Numeric.set_mode(mode)
+	output, errors = _run("list:decimal crt xs -in 0.1 0.2\n"
+		"list crt fs -in 1 2\n"
+		"list map ys -in $xs + $fs / 4\n"
+		"list add xs -in 0.3\n"
+		"list sum s -in $xs\n"
+		"list mean mu -in $xs\n"
+		"tmp echo $ys $s $mu\n")
+	assert (output, errors) == ("[0.35, 0.7] 0.6 0.2\n", "")
+
+
+def test_int_list_division_follows_decimal_mode(numeric_mode):
+	Numeric.set_mode("decimal")
+	Numeric.set_precision(5)
+	value = ListValue.from_values([1, 2]) / 3
+	assert (value.kind, value.data) == ("decimal", [Decimal("0.33333"), Decimal("0.66667")])
+	assert (ListValue.from_values([3, 6]) / 3).data == [1, 2]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_list_errors(numeric_mode, mode):
+	Numeric.set_mode(mode)
+	output, errors = _run("list:decimal crt xs -in 0.5 1\n"
+		"list map ys -in $xs / 0\n"
+		"list add xs -in abc\n"
+		"list get v -in $xs 5\n"
+		"list crt ws -in a b\n"
+		"list map zs -in $ws * 2\n"
+		"list len n -in $xs\n"
+		"tmp echo $n\n")
+	assert output == "2\n"
+	assert "Division by zero." in errors
+	assert "Cannot convert list elements to decimal" in errors
+	assert "List index 5 out of range (length 2)" in errors
+	assert "Arithmetic on a list of strings" in errors
+	with pytest.raises(ListError):
+		ListValue.from_values(["1", "2"], "complex")
@@ -0,0 +1,47 @@
+"""문장 조립 (StatementAssembler, iter_statements)"""
+import io
+import os
+import select
+import subprocess
+import sys
+
+from loader import StatementAssembler, iter_statements
+
+
+def test_finished_while_is_released_at_once():
+	assembler = StatementAssembler(multiline_strings=True)
+	assert assembler.feed("$i < 3 -while {", 1) == []
+	assert assembler.feed("var chg i -in $i + 1", 2) == []
+	assert assembler.feed("}", 3) == [(1, "$i < 3 -while {\nvar chg i -in $i + 1\n}")]
+	assert not assembler.held
+
+
+def test_if_is_held_for_else_on_the_next_line():
+	assembler = StatementAssembler(multiline_strings=True)
+	assert assembler.feed("$x == 1 -if { tmp echo a }", 1) == []
+	assert assembler.held
+	assert assembler.feed("-else { tmp echo b }", 2) == [(1, "$x == 1 -if { tmp echo a }\n-else { tmp echo b }")]
+	assert assembler.feed('tmp echo "-if" { }', 3) == [(3, 'tmp echo "-if" { }')]
+
+
+def test_held_if_is_released_by_the_next_statement():
+	source = "$x == 1 -if {\n\ttmp echo a\n}\ntmp echo b\n"
+	assert list(iter_statements(io.StringIO(source))) == [(1, "$x == 1 -if {\ntmp echo a\n}"), (4, "tmp echo b")]
+
+
+def test_piped_statements_run_as_lines_arrive():
+	# 쓰는 쪽이 다음 줄을 보내기 전에 앞 문장의 출력이 나와야 함
+	main = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code", "main.py")
+	process = subprocess.Popen([sys.executable, main, "-q", "--no-cache"],
+		stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+	try:
+		for word in ("first", "second"):
+			process.stdin.write(f"tmp echo {word}\n".encode())
+			process.stdin.flush()
+			ready, _, _ = select.select([process.stdout], [], [], 10)
+			assert ready, f"no output for '{word}' while the pipe is still open"
+			assert process.stdout.readline() == f"{word}\n".encode()
+		process.stdin.close()
+		assert process.wait(10) == 0
+	finally:
+		process.kill()
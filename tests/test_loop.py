@@ -0,0 +1,16 @@
+"""-while 실행 (Loop._run_while)"""
+from interpreter import Interpreter
+from registry import REGISTRY
+from store import LoopLimits
+
+
+def _boom(ast, variables):
+	raise RuntimeError("boom")
+
+
+def test_error_in_loop_body_does_not_skip_later_statements(monkeypatch):
+	monkeypatch.setitem(REGISTRY.handlers, ("tmp", "stop"), _boom)
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True)
+	interpreter.execute("var crt i -in 0\n$i < 3 -while {\n\ttmp stop\n\tvar chg i -in $i + 1\n\ttmp echo $i\n}\n")
+	assert interpreter.output().split() == ["1", "2", "3"]
+	assert interpreter.errors().count("boom") == 1
@@ -0,0 +1,115 @@
+"""산술 모드 정확도: 2**53을 넘는 정수, int 변수의 버림 나눗셈, Decimal 합계/정밀도
+
+기대값은 파이썬으로 계산한다 (float 모드의 정밀도 손실도 기대값으로 기록).
+모드별 처리량 비교는 bench/numeric_check.py.
+"""
+import math
+from decimal import Decimal, localcontext
+
+import pytest
+
+from interpreter import Interpreter
+from numeric import Numeric
+from store import LoopLimits
+
+BIG = 2 ** 53 + 1
+
+
+def _factorial_script(n):
+	return (
+		"var crt f -in 1\n"
+		"var:int crt i -in 1\n"
+		f"$i <= {n} -while {{\n"
+		"\tvar chg f -in $f * $i\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+		"var get f\n"
+	)
+
+
+def _big_ints_script(n):
+	# bench/workloads.py의 big_ints와 같은 스크립트
+	return (
+		"var crt a -in 9007199254740993\n"
+		"var crt b -in 9007199254740997\n"
+		"var:int crt i -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg b -in ($a + $b) % 170141183460469231731687303715884105727\n"
+		"\tvar chg a -in $b * 3 / 3 - $a\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+		"tmp echo $a $b\n"
+	)
+
+
+def _big_ints_expected(n):
+	a, b = 9007199254740993, 9007199254740997
+	for _ in range(n):
+		b = (a + b) % (2 ** 127 - 1)
+		a = b - a
+	return f"{a} {b}"
+
+
+def _decimal_money_script(n):
+	# bench/workloads.py의 decimal_money와 같은 스크립트
+	return (
+		"var:decimal crt total -in 0\n"
+		"var:decimal crt price -in 19.99\n"
+		"var:int crt i -in 0\n"
+		f"$i < {n} -while {{\n"
+		"\tvar chg total -in $total + $price * 3 / 7\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\n"
+		"tmp echo $total\n"
+	)
+
+
+def _decimal_third(precision):
+	with localcontext() as context:
+		context.prec = precision
+		return str(Decimal(1) / Decimal(3))
+
+
+# (이름, 모드, decimal 정밀도, 스크립트, 기대 출력)
+CASES = (
+	("exact: 2**53 + 1 survives * / and +", "exact", 28,
+		f"var crt big -in {BIG}\nvar chg big -in $big * 3 / 3\nvar chg big -in $big + 1\nvar get big\n",
+		str(BIG + 1)),
+	("exact: 60!", "exact", 28, _factorial_script(60), str(math.factorial(60))),
+	("exact: big_ints workload", "exact", 28, _big_ints_script(2000), _big_ints_expected(2000)),
+	("exact: non-integral division is float", "exact", 28,
+		"var crt x -in 7\nvar chg x -in $x / 2\nvar get x\n", "3.5"),
+	("int: truncating division at 10**30", "exact", 28,
+		f"var:int crt h -in {10 ** 30 + 1}\nvar chg h -in -$h / 7\nvar get h\n", str(-((10 ** 30 + 1) // 7))),
+	("int: 7 / 2 * 2", "exact", 28, "var:int crt k -in 7\nvar chg k -in $k / 2 * 2\nvar get k\n", "6"),
+	("decimal: 0.1 + 0.2", "decimal", 28,
+		"var:decimal crt d -in 0.1\nvar chg d -in $d + 0.2\nvar get d\n", "0.3"),
+	("decimal: 1 / 3 at 50 digits", "decimal", 50,
+		"var:decimal crt d -in 1\nvar chg d -in $d / 3\nvar get d\n", _decimal_third(50)),
+	("decimal: cents add up", "decimal", 28, _decimal_money_script(1000),
+		str(sum((Decimal("19.99") * 3 / 7 for _ in range(1000)), Decimal(0)))),
+	("float: 2**53 + 1 rounds (old path)", "float", 28,
+		f"var crt big -in {BIG}\nvar chg big -in $big + 0\nvar get big\n", str(BIG - 1)),
+	("float: float variable in exact mode", "exact", 28,
+		"var:float crt f -in 0.1\nvar chg f -in $f + 0.2\nvar get f\n", str(0.1 + 0.2)),
+)
+
+
+@pytest.mark.parametrize("name, mode, precision, source, expected", CASES, ids=[case[0] for case in CASES])
+def test_numeric_mode(numeric_mode, name, mode, precision, source, expected):
+	Numeric.set_mode(mode)
+	Numeric.set_precision(precision)
+	interpreter = Interpreter.to_memory(LoopLimits(max_iterations=0), quiet=True)
+	interpreter.execute(source)
+	assert (interpreter.output().strip(), interpreter.errors().strip()) == (expected, "")
+
+
+def test_parse_cache_keeps_folded_constants_per_precision(numeric_mode):
+	Numeric.set_mode("decimal")
+	outputs = []
+	for precision in (28, 50):
+		Numeric.set_precision(precision)
+		interpreter = Interpreter.to_memory(LoopLimits(), quiet=True)
+		interpreter.execute("var:decimal crt d -in 0\nvar chg d -in 1 / 3\nvar get d\n")
+		outputs.append(interpreter.output().strip())
+	assert outputs == [_decimal_third(28), _decimal_third(50)]
@@ -0,0 +1,75 @@
+"""반복문 부분식 끌어올리기 (Optimizer.hoist)"""
+import pytest
+
+from interpreter import Interpreter
+from logic import Parser
+from optimizer import Optimizer
+from store import LoopLimits, VariableStore
+
+
+def _loop(source):
+	return Parser.parse(source)
+
+
+def _run(source):
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True)
+	interpreter.execute(source)
+	return interpreter.output(), interpreter.errors()
+
+
+def test_only_statements_run_every_iteration_are_hoisted():
+	ast = _loop("$i < 3 -while {\n"
+		"\tvar chg x -in $x + $a * 2\n"
+		"\t$i == 1 -if { var chg y -in $y + $a * 5 }\n"
+		"\tsys stop\n"
+		"\tvar chg z -in $z + $a * 7\n"
+		"}")
+	assert [index for index, _ in ast["hoisting"]] == [0]
+
+
+def test_identical_subexpressions_share_one_hidden_variable():
+	ast = _loop("$i < 3 -while {\n"
+		"\tvar chg x -in $x + $a / 2\n"
+		"\tvar chg y -in $y + $a / 2 + $a / 2\n"
+		"\tvar chg i -in $i + 1\n"
+		"}")
+	variables = VariableStore()
+	for name in ("a", "x", "y", "i"):
+		variables.declare(name, "1")
+	_, names = Optimizer.hoist(ast, variables)
+	assert len(names) == 1
+
+
+def test_only_the_declared_type_form_is_hoisted():
+	ast = _loop("$i < 3 -while {\n\tvar chg n -in $n + $a / 2\n\tvar chg i -in $i + 1\n}")
+	variables = VariableStore()
+	variables.declare("a", "7")
+	variables.declare("n", "0", "int")
+	block, names = Optimizer.hoist(ast, variables)
+	assert [variables[name] for name in names] == [3]
+	assert list(block[0]["variants"]) == ["int"]
+
+
+def test_false_loop_does_not_compute_hoisted_values(monkeypatch):
+	calls = []
+	hoist = Optimizer.hoist
+	monkeypatch.setattr(Optimizer, "hoist", lambda ast, variables: calls.append(ast) or hoist(ast, variables))
+	output, errors = _run("var crt a -in 7\nvar crt i -in 10\nvar crt r -in 0\n"
+		"$i < 5 -while {\n\tvar chg r -in $a ** 3\n\tvar chg i -in $i + 1\n}\ntmp echo done\n")
+	assert (output.split()[-1], errors) == ("done", "")
+	assert not calls
+
+
+@pytest.mark.parametrize("level", [0, 1])
+def test_hoisted_loop_matches_unoptimized(monkeypatch, level):
+	monkeypatch.setattr(Optimizer, "level", level)
+	output, errors = _run("var crt a -in 9\nvar:int crt n -in 0\nvar:float crt f -in 0\n"
+		"var crt x -in 0\nvar crt i -in 0\n"
+		"$i < 3 -while {\n"
+		"\tvar chg n -in $n + $a / 2\n"
+		"\tvar chg f -in $f + $a / 2\n"
+		"\tvar chg x -in $x + $a / 2 + $a * 3\n"
+		"\t$i == 1 -if { var chg x -in $x + $a * 3 }\n"
+		"\tvar chg i -in $i + 1\n"
+		"}\ntmp echo $n $f $x\n")
+	assert (output.split()[-3:], errors) == (["12", "13.5", "121.5"], "")
@@ -0,0 +1,63 @@
+"""파싱 캐시의 AST는 여러 Interpreter가 공유하므로 실행해도 바뀌지 않아야 함"""
+import io
+import pickle
+
+from interpreter import Interpreter
+from loader import iter_statements
+from logic import Parser
+from numeric import Numeric
+from optimizer import Optimizer
+from store import LoopLimits
+
+SCRIPT = ("var:int crt n -in 0\n"
+	"var:decimal crt d -in 0\n"
+	"var:float crt f -in 0\n"
+	"var crt a -in 7\n"
+	"var crt i -in 0\n"
+	"$i < 4 -while {\n"
+	"\tvar chg n -in $n + $a / 2\n"
+	"\tvar chg d -in $d + $a / 3\n"
+	"\tvar chg f -in $f + $a / 4\n"
+	"\tvar chg i -in $i + 1\n"
+	"}\n"
+	"var chg n -in $n / 3\n"
+	"tmp echo $n $d $f\n")
+
+SETTINGS = [("exact", 1), ("decimal", 0), ("float", 1), ("decimal", 1)]
+
+
+def _settings(mode, level, monkeypatch):
+	Numeric.set_mode(mode)
+	monkeypatch.setattr(Optimizer, "level", level)
+
+
+def _run(mode, level, monkeypatch):
+	_settings(mode, level, monkeypatch)
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True)
+	interpreter.execute(SCRIPT)
+	return interpreter.output(), interpreter.errors()
+
+
+def _snapshot():
+	return {key: pickle.dumps(ast) for key, ast in Parser.cache._entries.items()}
+
+
+def test_runs_do_not_change_shared_asts(numeric_mode, monkeypatch):
+	# 처음 실행한 결과를 기대값으로 (각 설정마다 빈 캐시에서)
+	expected = {}
+	for mode, level in SETTINGS:
+		Parser.cache.clear()
+		expected[mode, level] = _run(mode, level, monkeypatch)
+	output, errors = expected["exact", 1]
+	assert (output.split()[::2], errors) == (["4", "7.0"], "")
+
+	Parser.cache.clear()
+	for mode, level in SETTINGS:
+		_settings(mode, level, monkeypatch)
+		for _, statement in iter_statements(io.StringIO(SCRIPT)):
+			Parser.parse(statement)
+	parsed = _snapshot()
+	# 같은 캐시를 쓰며 설정을 번갈아 실행해도 결과와 캐시의 AST가 그대로
+	for mode, level in SETTINGS + SETTINGS[::-1]:
+		assert _run(mode, level, monkeypatch) == expected[mode, level]
+	assert _snapshot() == parsed
@@ -0,0 +1,65 @@
+"""FastParser와 pyparsing 문법이 같은 문장에서 같은 AST를 만드는지 비교"""
+import pytest
+
+from logic import Parser
+
+STATEMENTS = [
+	# 명령어
+	"var crt x -in 1",
+	"var:int crt x -in 42",
+	"var:decimal crt price -in 19.99",
+	"tmp echo hello world",
+	"list crt xs -in 1 2 3",
+	"list rng r -in 0 10 2",
+	"var get x",
+	# 문자열과 이스케이프
+	'tmp echo "hello world"',
+	'tmp echo "tab\\there"',
+	'tmp echo "quote \\" inside"',
+	'tmp echo "back\\\\slash"',
+	# 단항 연산자와 거듭제곱
+	"var chg x -in -$x",
+	"var chg x -in - $x + 1",
+	"var chg x -in 2 ** 3 ** 2",
+	"var chg x -in -2 ** 2",
+	"var chg x -in ($a + $b) * -($c - 1) % 7",
+	"var chg x -in 1.5e3 / .5 - 3.",
+	# 조건문
+	"$x == 1 -if { tmp echo one }",
+	"$x < 10 -and $y >= 2 -or $z != 0 -if { tmp echo yes }",
+	"$x == 1 -if { tmp echo one } -else { tmp echo other }",
+	"$x == 1 -if {\n\ttmp echo one\n}\n-else {\n\ttmp echo other\n}",
+	"$x == 1 -if { tmp echo a; tmp echo b } -else { }",
+	# 반복문과 중첩 블록
+	"$i < 10 -while { var chg i -in $i + 1 }",
+	"$i < 3 -while {\n\t$j < 3 -while {\n\t\t$j == 1 -if {\n\t\t\ttmp echo $i $j\n\t\t}\n"
+	"\t\tvar chg j -in $j + 1\n\t}\n\tvar chg i -in $i + 1\n}",
+	"$a == 1 -if {\n\t$b == 2 -if { tmp echo ab }\n\t-else {\n\t\ttmp echo a\n\t}\n}",
+	# -each와 옵션
+	"i -each 10 { tmp echo $i }",
+	"i -each 1 10 2 { tmp echo $i }",
+	"i -each -5 5 { tmp echo $i }",
+	"x -each $xs -parallel 4 { tmp echo $x }",
+	"x -each $xs -parallel $n -sum total -collect ys {\n\tvar crt ys -in 0\n\tvar chg total -in $x\n}",
+	"i -each 3 -collect a -collect b -parallel 0 { var crt a -in 1; var crt b -in 2 }",
+	"i -each 3 {\n\tj -each $i -sum s {\n\t\tvar chg s -in $j\n\t}\n}",
+]
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_engines_agree(statement):
+	same, fast_ast, pyparsing_ast = Parser.compare_engines(statement)
+	assert fast_ast is not None
+	assert same, f"fast: {fast_ast}\npyparsing: {pyparsing_ast}"
+
+
+@pytest.mark.parametrize("statement", [
+	"$x == -if { }",
+	"i -each { }",
+	"i -each 3 -parallel { }",
+	"i -each 3 -sum { }",
+	"var crt x -in 1 }",
+])
+def test_engines_reject(statement):
+	same, fast_ast, pyparsing_ast = Parser.compare_engines(statement)
+	assert fast_ast is None and pyparsing_ast is None
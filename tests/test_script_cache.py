@@ -0,0 +1,50 @@
+"""디스크 스크립트 캐시 (ScriptCache / CacheWriter)"""
+import pytest
+
+from diagnostics import Diagnostics
+from interpreter import Interpreter
+from numeric import Numeric
+from script_cache import ScriptCache
+from store import LoopLimits
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+	monkeypatch.setattr(ScriptCache, "enabled", True)
+	monkeypatch.setattr(ScriptCache, "directory", str(tmp_path / "cache"))
+	return tmp_path / "cache"
+
+
+def _run(path, fail_fast=False):
+	interpreter = Interpreter.to_memory(LoopLimits(), quiet=True, diagnostics=Diagnostics(fail_fast=fail_fast))
+	status = interpreter.run_file(str(path))
+	return status, interpreter.output(), interpreter.errors()
+
+
+def test_cached_run_matches_first_run(tmp_path, cache_dir):
+	script = tmp_path / "loop.nsc"
+	script.write_text("var crt i -in 0\n$i < 3 -while {\n\tvar chg i -in $i + 1\n\ttmp echo $i\n}\n"
+		+ "".join(f"var chg i -in $i + {n}\n" for n in range(200)) + "var get i\n")
+	first = _run(script)
+	assert list(cache_dir.iterdir())
+	assert _run(script) == first
+	assert first[1].split() == ["1", "2", "3", str(3 + sum(range(200)))]
+
+
+def test_parse_errors_after_sys_stop_are_not_reported(tmp_path, cache_dir):
+	script = tmp_path / "stop.nsc"
+	script.write_text("tmp echo before\nsys stop\nthis is { broken\ntmp echo after\n")
+	assert _run(script, fail_fast=True) == (0, "before\n", "")
+	# 파싱 에러가 있는 스크립트는 캐시하지 않음
+	assert not cache_dir.exists() or not list(cache_dir.iterdir())
+
+
+def test_decimal_precision_is_part_of_the_cache_key(tmp_path, cache_dir, numeric_mode):
+	script = tmp_path / "third.nsc"
+	script.write_text("var:decimal crt d -in 0\nvar chg d -in 1 / 3\nvar get d\n")
+	Numeric.set_mode("decimal")
+	outputs = []
+	for precision in (28, 50, 28):
+		Numeric.set_precision(precision)
+		outputs.append(_run(script)[1].strip())
+	assert [len(output) for output in outputs] == [30, 52, 30]
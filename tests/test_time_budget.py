@@ -0,0 +1,19 @@
+"""세션 시간 예산 (서버 --time-budget의 LoopLimits.deadline)"""
+import time
+
+import pytest
+
+from interpreter import Interpreter
+from store import LoopLimits
+
+ENDLESS = "var crt i -in 0\n$i >= 0 -while {\n\tvar chg i -in $i + 1\n}\ntmp echo after\n"
+
+
+@pytest.mark.parametrize("prefix", ["", "sys profile on\n"])
+def test_endless_loop_stops_at_session_deadline(prefix):
+	interpreter = Interpreter.to_memory(LoopLimits(max_iterations=0, deadline=time.perf_counter() + 0.2), quiet=True)
+	start = time.perf_counter()
+	interpreter.execute(prefix + ENDLESS)
+	assert time.perf_counter() - start < 5
+	assert "time budget (session)" in interpreter.errors()
+	assert "after" not in interpreter.output()